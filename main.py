@@ -4,9 +4,11 @@
 import logging
 import os
 import sys
+import time
 
 APP_NAME = "Open Razer macOS Control"
 LOG_FILE_BASENAME = "open_razer_macos_control_app.log"
+HID_TRACE_ENV = "RAZER_HID_TRACE"
 
 if getattr(sys, 'frozen', False):
     frameworks_dir = os.path.join(os.path.dirname(sys.executable), '..', 'Frameworks')
@@ -39,6 +41,11 @@ logging.info(f"Executable path: {sys.executable}")
 logging.info(f"Arguments: {sys.argv}")
 logging.info(f"Log path: {log_file}")
 
+import razer_tracing
+razer_tracing.configure_from_argv(sys.argv)
+if razer_tracing.is_enabled():
+    logging.info(f"Tracing enabled, writing Chrome trace to {os.environ[razer_tracing.TRACE_ENV]}")
+
 try:
     logging.info("Importing UI modules...")
     from PyQt5.QtWidgets import QApplication
@@ -50,15 +57,28 @@ try:
         app = QApplication(sys.argv)
         logging.info("QApplication created.")
 
+        recorder = None
+        trace_path = os.environ.get(HID_TRACE_ENV)
+        if trace_path:
+            from razer_recorder import enable_recording
+            recorder = enable_recording(os.path.expanduser(trace_path))
+            logging.info(f"Recording HID traffic to {trace_path}")
+
         logging.info("Creating MainWindow from razer_ui...")
+        started = time.perf_counter()
         window = MainWindow()
-        logging.info("MainWindow created.")
+        logging.info(f"MainWindow created in {(time.perf_counter() - started) * 1000:.1f} ms.")
 
         window.show()
         logging.info("Application window displayed.")
 
         logging.info("Starting QApplication event loop...")
-        exit_code = app.exec_()
+        try:
+            exit_code = app.exec_()
+        finally:
+            if recorder is not None:
+                recorder.close()
+                logging.info(f"HID trace closed after {recorder.writer.records} records.")
         logging.info(f"Application exited with code: {exit_code}")
         sys.exit(exit_code)
 
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import re
+import selectors
+import socket
+import stat
+import threading
+import time
+
+from razer_common import EFFECT_CODES, construct_effect_report, default_led, device_key
+from razer_state import STATE_DIR, StateJournal
+from razer_stream import DeviceSession
+
+ALERTS_PATH = os.path.join(STATE_DIR, "alerts.json")
+DEFAULT_SOCKET = os.path.join(STATE_DIR, "alerts.sock")
+SEVERITIES = {'info': 0, 'warning': 1, 'error': 2, 'critical': 3}
+DEFAULT_DURATION = 5.0
+FLASH_PERIOD = 0.5
+# device writes never happen more often than this, however fast events arrive
+MIN_WRITE_INTERVAL = 0.1
+MAX_LINE = 4096
+
+class AlertEvent:
+    def __init__(self, message: str, severity: str = 'info', source: str = None):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity: {severity}")
+        self.message = message
+        self.severity = severity
+        self.source = source
+
+    def text(self) -> str:
+        return f"{self.source}: {self.message}" if self.source else self.message
+
+def parse_event(line: str) -> AlertEvent:
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        data = json.loads(line)
+        return AlertEvent(str(data.get('message', '')), str(data.get('severity', 'info')).lower(),
+                          data.get('source'))
+    word, _, rest = line.partition(' ')
+    if word.lower() in SEVERITIES:
+        return AlertEvent(rest.strip(), word.lower())
+    return AlertEvent(line)
+
+class AlertRule:
+    def __init__(self, match: str = '', min_severity: str = 'info', severity: str = None,
+                 effect: str = 'static', color=(255, 0, 0), duration: float = DEFAULT_DURATION):
+        if min_severity not in SEVERITIES or (severity is not None and severity not in SEVERITIES):
+            raise ValueError(f"Unknown severity in rule: {min_severity}/{severity}")
+        if effect != 'flash' and effect not in EFFECT_CODES:
+            raise ValueError(f"Unknown alert effect: {effect}")
+        self.match = match
+        try:
+            self.pattern = re.compile(match, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid match pattern in rule {match!r}: {e}")
+        self.min_severity = min_severity
+        self.severity = severity
+        self.effect = effect
+        self.color = tuple(int(c) & 0xFF for c in color)
+        self.duration = float(duration)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data.get('match', ''), data.get('min_severity', 'info'), data.get('severity'),
+                   data.get('effect', 'static'), data.get('color', (255, 0, 0)),
+                   data.get('duration', DEFAULT_DURATION))
+
+    def matches(self, event: AlertEvent) -> bool:
+        return SEVERITIES[event.severity] >= SEVERITIES[self.min_severity] and bool(self.pattern.search(event.text()))
+
+DEFAULT_RULES = [
+    AlertRule(min_severity='critical', effect='flash', color=(255, 0, 0), duration=10.0),
+    AlertRule(min_severity='error', effect='static', color=(255, 0, 0)),
+    AlertRule(min_severity='warning', effect='static', color=(255, 160, 0)),
+    AlertRule(effect='static', color=(0, 120, 255), duration=3.0),
+]
+
+def load_rules(path: str = ALERTS_PATH) -> list:
+    if not os.path.exists(path):
+        return list(DEFAULT_RULES)
+    with open(path, 'r') as f:
+        data = json.load(f)
+    # user rules are tried first, the defaults catch everything they leave unmatched
+    return [AlertRule.from_dict(r) for r in data.get('rules', [])] + DEFAULT_RULES
+
+class Alert:
+    def __init__(self, rule: AlertRule, severity: str, now: float, generation: int):
+        self.rule = rule
+        self.severity = severity
+        self.count = 1
+        self.started = now
+        self.expires = now + rule.duration
+        self.generation = generation
+
+class AlertCoordinator:
+    def __init__(self, devices: list, journal: StateJournal = None, rules: list = None,
+                 min_interval: float = MIN_WRITE_INTERVAL, reload_journal: bool = True):
+        self.devices = devices
+        self.journal = journal or StateJournal()
+        self.reload_journal = reload_journal
+        self.rules = rules or list(DEFAULT_RULES)
+        self.min_interval = min_interval
+        self.sessions = {device_key(d): DeviceSession(d) for d in devices}
+        self.alert = None
+        self.metrics = {'events': 0, 'rejected': 0, 'coalesced': 0, 'suppressed': 0, 'alerts': 0,
+                        'writes': 0, 'restores': 0}
+        self._generation = 0
+        self._shown = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def rule_for(self, event: AlertEvent) -> AlertRule:
+        return next((r for r in self.rules if r.matches(event)), None)
+
+    def post(self, event: AlertEvent, now: float = None) -> str:
+        now = time.monotonic() if now is None else now
+        rule = self.rule_for(event)
+        with self._lock:
+            self.metrics['events'] += 1
+            if rule is None:
+                self.metrics['suppressed'] += 1
+                return 'ignored'
+            severity = rule.severity or event.severity
+            alert = self.alert
+            if alert is not None and SEVERITIES[severity] < SEVERITIES[alert.severity]:
+                self.metrics['suppressed'] += 1
+                return 'suppressed'
+            if alert is not None and SEVERITIES[severity] == SEVERITIES[alert.severity]:
+                # same severity: fold into the running alert and keep it up a little longer
+                alert.count += 1
+                alert.expires = max(alert.expires, now + rule.duration)
+                self.metrics['coalesced'] += 1
+                return 'coalesced'
+            self._generation += 1
+            self.alert = Alert(rule, severity, now, self._generation)
+            if alert is not None:
+                self.alert.count += alert.count
+            self.metrics['alerts'] += 1
+        self._wake.set()
+        return 'escalated' if alert is not None else 'started'
+
+    def post_line(self, line: str) -> str:
+        try:
+            event = parse_event(line)
+        except ValueError as e:
+            with self._lock:
+                self.metrics['rejected'] += 1
+            print(f"Rejected alert event: {e}")
+            return 'rejected'
+        return 'ignored' if event is None else self.post(event)
+
+    def _target(self, alert: Alert, now: float) -> tuple:
+        if alert.rule.effect != 'flash':
+            return alert.generation, 0
+        return alert.generation, int((now - alert.started) / FLASH_PERIOD) % 2
+
+    def _reports(self, device: dict, alert: Alert, phase: int) -> list:
+        rule = alert.rule
+        if rule.effect == 'flash':
+            color = list(rule.color) if phase == 0 else [0, 0, 0]
+            return [construct_effect_report(device, EFFECT_CODES['static'], color, default_led(device['pid']))]
+        params = list(rule.color)
+        if rule.effect == 'breathing':
+            params += [0, 0, 0, 128]
+        elif rule.effect == 'none':
+            params = []
+        return [construct_effect_report(device, EFFECT_CODES[rule.effect], params, default_led(device['pid']))]
+
+    def _write(self, alert: Alert, target: tuple):
+        for device in self.devices:
+            self.sessions[device_key(device)].send_many(self._reports(device, alert, target[1]))
+        self.metrics['writes'] += 1
+        self._shown = target
+
+    def _restore(self):
+        if self.reload_journal:
+            self.journal.load()
+        for device in self.devices:
+            reports = self.journal.reports_for(device)
+            if not reports:
+                reports = [construct_effect_report(device, EFFECT_CODES['none'], [], default_led(device['pid']))]
+            session = self.sessions[device_key(device)]
+            session.send_many(reports)
+            session.close()
+        self.metrics['restores'] += 1
+        self._shown = None
+
+    def step(self, now: float = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            alert = self.alert
+            if alert is not None and now >= alert.expires:
+                self.alert = alert = None
+        if alert is None:
+            if self._shown is not None:
+                self._restore()
+                self._last_write = now
+            return None
+        target = self._target(alert, now)
+        ready_at = self._last_write + self.min_interval
+        if target != self._shown:
+            if now < ready_at:
+                return ready_at - now
+            self._write(alert, target)
+            self._last_write = now
+        wake = alert.expires
+        if alert.rule.effect == 'flash':
+            wake = min(wake, alert.started + (int((now - alert.started) / FLASH_PERIOD) + 1) * FLASH_PERIOD)
+        return max(wake - now, 0.0)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="razer-alerts", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        with self._lock:
+            self.alert = None
+        if self._shown is not None:
+            self._restore()
+        for session in self.sessions.values():
+            session.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                delay = self.step()
+            except Exception as e:
+                print(f"Error updating alert lighting: {e}")
+                delay = self.min_interval
+            self._wake.wait(delay)
+            self._wake.clear()
+
+class EventListener:
+    def __init__(self, coordinator: AlertCoordinator, socket_path: str = None, fifo_path: str = None):
+        self.coordinator = coordinator
+        self.socket_path = socket_path
+        self.fifo_path = fifo_path
+        self._selector = selectors.DefaultSelector()
+        self._buffers = {}
+        self._server = None
+        self._fifo = None
+        self._fifo_keepalive = None
+        self._wakeup = os.pipe()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.socket_path:
+            if os.path.exists(self.socket_path) and stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                os.unlink(self.socket_path)
+            os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server.bind(self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            self._server.listen()
+            self._server.setblocking(False)
+            self._selector.register(self._server, selectors.EVENT_READ, self._accept)
+        if self.fifo_path:
+            if not os.path.exists(self.fifo_path):
+                os.mkfifo(self.fifo_path, 0o600)
+            self._fifo = os.open(self.fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+            # holding a writer open keeps the FIFO from reporting EOF between producers
+            self._fifo_keepalive = os.open(self.fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+            self._selector.register(self._fifo, selectors.EVENT_READ, self._read_fifo)
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._run, name="razer-alert-listener", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        os.write(self._wakeup[1], b'\x00')
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fileobj)
+            if isinstance(key.fileobj, socket.socket):
+                key.fileobj.close()
+        for fd in (self._fifo, self._fifo_keepalive) + self._wakeup:
+            if fd is not None:
+                os.close(fd)
+        self._selector.close()
+        if self._server is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _accept(self, server):
+        conn, _ = server.accept()
+        conn.setblocking(False)
+        self._selector.register(conn, selectors.EVENT_READ, self._read_conn)
+
+    def _read_conn(self, conn):
+        try:
+            data = conn.recv(MAX_LINE)
+        except OSError:
+            data = b''
+        if not data:
+            self._feed(conn, b'\n')
+            self._buffers.pop(conn, None)
+            self._selector.unregister(conn)
+            conn.close()
+            return
+        self._feed(conn, data)
+
+    def _read_fifo(self, fd):
+        try:
+            data = os.read(fd, MAX_LINE)
+        except BlockingIOError:
+            return
+        self._feed(fd, data)
+
+    def _feed(self, key, data: bytes):
+        buffer = self._buffers.get(key, b'') + data
+        *lines, buffer = buffer.split(b'\n')
+        if len(buffer) > MAX_LINE:
+            print("Dropping oversized alert line")
+            buffer = b''
+        self._buffers[key] = buffer
+        for line in lines:
+            self.coordinator.post_line(line.decode('utf-8', 'replace'))
+
+    def _run(self):
+        while not self._stop.is_set():
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    return
+                try:
+                    key.data(key.fileobj)
+                except Exception as e:
+                    print(f"Error reading alert events: {e}")
+
+def send_event(line: str, socket_path: str = DEFAULT_SOCKET):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(line.encode() + b'\n')
+
+def main():
+    parser = argparse.ArgumentParser(description="Flash Razer lighting on events from a socket or FIFO")
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve = sub.add_parser('serve')
+    serve.add_argument('--socket', default=DEFAULT_SOCKET)
+    serve.add_argument('--fifo', help="Also read events from this FIFO")
+    serve.add_argument('--rules', default=ALERTS_PATH)
+    serve.add_argument('--simulate', action='store_true', help="Use simulated HID devices")
+    send = sub.add_parser('send')
+    send.add_argument('line', help="'[severity] message' or a JSON object")
+    send.add_argument('--socket', default=DEFAULT_SOCKET)
+    storm = sub.add_parser('storm')
+    storm.add_argument('--events', type=int, default=1000)
+    storm.add_argument('--duration', type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.command == 'send':
+        send_event(args.line, args.socket)
+        return
+    from razer_common import scan_razer_devices, set_hid_backend
+    if args.command == 'storm' or args.simulate:
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend())
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    if args.command == 'storm':
+        import tempfile
+        coordinator = AlertCoordinator(devices, StateJournal(os.path.join(tempfile.mkdtemp(), "state.journal")))
+        coordinator.start()
+        severities = list(SEVERITIES)
+        start = time.monotonic()
+        for i in range(args.events):
+            coordinator.post_line(f"{severities[i % len(severities)]} storm event {i}")
+            time.sleep(args.duration / args.events)
+        elapsed = time.monotonic() - start
+        coordinator.stop()
+        m = coordinator.metrics
+        print(f"{m['events']} events in {elapsed:.2f}s -> {m['alerts']} alert states, {m['writes']} writes "
+              f"({m['writes'] / elapsed:.1f}/s), {m['coalesced']} coalesced, {m['suppressed']} suppressed")
+        return
+    try:
+        rules = load_rules(args.rules)
+    except (OSError, ValueError) as e:
+        print(f"Error loading alert rules from {args.rules}: {e}")
+        return
+    coordinator = AlertCoordinator(devices, rules=rules).start()
+    listener = EventListener(coordinator, args.socket, args.fifo).start()
+    print(f"Listening on {args.socket}" + (f" and {args.fifo}" if args.fifo else ""))
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.stop()
+        coordinator.stop()
+    print(", ".join(f"{k} {v}" for k, v in coordinator.metrics.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from razer_common import (
+    REPORT_LEN,
+    RESPONSE_DELAY,
+    STATUS_SUCCESS,
+    device_key,
+    get_matrix_dims,
+    notify_sent,
+    scan_razer_devices,
+)
+from razer_stream import SETTLE_DELAY, DeviceSession, FrameStreamer
+
+HID_WORKERS = 4
+QUEUE_LIMIT = 8
+
+def _read_response(session: DeviceSession, report: bytes):
+    for dev in session.handles:
+        try:
+            response = bytes(dev.get_feature_report(0x00, REPORT_LEN + 1))[1:]
+        except Exception as e:
+            print(f"Error reading from {session.device.get('name')}: {e}")
+            continue
+        if len(response) == REPORT_LEN and response[0] == STATUS_SUCCESS \
+                and response[6:8] == report[6:8]:
+            return response
+    return None
+
+class AsyncDevice:
+    def __init__(self, client, device: dict, queue_limit: int = QUEUE_LIMIT):
+        self.client = client
+        self.device = device
+        self.session = DeviceSession(device)
+        self.queue = asyncio.Queue(maxsize=queue_limit)
+        self._open_lock = asyncio.Lock()
+        self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+    async def open(self):
+        async with self._open_lock:
+            if len(self.session.handles) == len(self.device.get('interfaces', [])):
+                return
+            if await self.client.run(self.session.open_handles):
+                await asyncio.sleep(SETTLE_DELAY)
+
+    async def _drain(self):
+        while True:
+            job, args, future = await self.queue.get()
+            try:
+                if job is None:
+                    break
+                result = await job(*args)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    async def _submit(self, job, *args):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((job, args, future))
+        return await future
+
+    async def _send(self, reports: list, journal: bool) -> bool:
+        await self.open()
+        ok = await self.client.run(self.session.send_many, reports)
+        if ok and journal:
+            notify_sent(self.device, reports)
+        return ok
+
+    async def _transact(self, report: bytes):
+        await self.open()
+        if not await self.client.run(self.session.send, report):
+            return None
+        await asyncio.sleep(RESPONSE_DELAY)
+        return await self.client.run(_read_response, self.session, report)
+
+    async def send(self, reports: list, journal: bool = True) -> bool:
+        # streamed frames pass journal=False, like the synchronous FrameStreamer path
+        return await self._submit(self._send, [bytes(r) for r in reports], journal)
+
+    async def transact(self, report: bytes):
+        return await self._submit(self._transact, bytes(report))
+
+    async def close(self):
+        await self.queue.put((None, (), asyncio.get_running_loop().create_future()))
+        await self._worker
+        await self.client.run(self.session.close)
+
+class AsyncRazer:
+    def __init__(self, max_workers: int = HID_WORKERS, queue_limit: int = QUEUE_LIMIT):
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="razer-hid")
+        self._devices = {}
+
+    async def run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def scan(self) -> list:
+        return await self.run(scan_razer_devices)
+
+    def device(self, device: dict) -> AsyncDevice:
+        key = device_key(device)
+        if key not in self._devices:
+            self._devices[key] = AsyncDevice(self, device, self.queue_limit)
+        return self._devices[key]
+
+    async def send(self, device: dict, reports: list) -> bool:
+        return await self.device(device).send(reports)
+
+    async def transact(self, device: dict, report: bytes):
+        return await self.device(device).transact(report)
+
+    async def stream(self, device: dict, render, fps: float = 60.0, duration: float = None) -> int:
+        adev = self.device(device)
+        streamer = FrameStreamer(device, adev.session)
+        period = 1.0 / fps
+        start = time.monotonic()
+        next_tick = start
+        sent = 0
+        while True:
+            t = time.monotonic() - start
+            if duration is not None and t >= duration:
+                break
+            frame = render(t)
+            if asyncio.iscoroutine(frame):
+                frame = await frame
+            if await adev.send(streamer.prepare(frame), journal=False):
+                sent += 1
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+        return sent
+
+    async def close(self):
+        for adev in list(self._devices.values()):
+            await adev.close()
+        self._devices = {}
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+async def _demo(effect: str, fps: float, duration: float):
+    from razer_effects import make_renderer
+    async with AsyncRazer() as razer:
+        devices = await razer.scan()
+        if not devices:
+            print("No Razer devices found.")
+            return
+        tasks = [razer.stream(d, make_renderer(effect, *get_matrix_dims(d['pid'])), fps, duration) for d in devices]
+        for device, sent in zip(devices, await asyncio.gather(*tasks)):
+            print(f"{device['name']}: {sent} frames in {duration:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an effect to every device from one event loop")
+    parser.add_argument('effect', nargs='?', default='spectrum')
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--simulate', action='store_true', help="Use simulated HID devices")
+    args = parser.parse_args()
+
+    if args.simulate:
+        from razer_common import set_hid_backend
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend())
+    asyncio.run(_demo(args.effect, args.fps, args.duration))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+import time
+import wave
+import numpy as np
+
+from razer_effects import hsv_to_rgb, to_frame
+
+FFT_SIZE = 1024
+HOP_SIZE = 256
+MIN_FREQ = 40.0
+MAX_FREQ = 16000.0
+DB_RANGE = 48.0
+LATENCY_TARGET = 0.030
+PCM_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+SAMPLE_WIDTHS = (1, 2, 3, 4)
+
+def _decode_pcm(raw: bytes, sample_width: int) -> np.ndarray:
+    if sample_width in PCM_DTYPES:
+        return np.frombuffer(raw, dtype=PCM_DTYPES[sample_width])
+    if sample_width != 3:
+        raise ValueError(f"Unsupported PCM sample width: {sample_width} bytes")
+    # 24-bit samples go into the top of an int32 and shift back down to keep their sign
+    packed = np.frombuffer(raw, dtype=np.uint8)
+    packed = packed[:len(packed) - len(packed) % 3].reshape(-1, 3)
+    widened = np.zeros((len(packed), 4), dtype=np.uint8)
+    widened[:, 1:] = packed
+    return widened.view('<i4').ravel() >> 8
+
+def _to_mono_float(raw: bytes, sample_width: int, channels: int) -> np.ndarray:
+    samples = _decode_pcm(raw, sample_width)
+    if sample_width == 1:
+        samples = samples.astype(np.float32) - 128.0
+        scale = 128.0
+    else:
+        scale = float(2 ** (8 * sample_width - 1))
+    samples = samples[:len(samples) - len(samples) % channels].astype(np.float32)
+    return samples.reshape(-1, channels).mean(axis=1) / scale
+
+def wav_blocks(path: str, hop: int = HOP_SIZE):
+    with wave.open(path, 'rb') as wav:
+        rate = wav.getframerate()
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        while True:
+            raw = wav.readframes(hop)
+            if not raw:
+                break
+            yield rate, _to_mono_float(raw, width, channels)
+
+def pcm_blocks(stream, rate: int, channels: int = 2, sample_width: int = 2, hop: int = HOP_SIZE):
+    frame_bytes = channels * sample_width
+    while True:
+        raw = stream.read(hop * frame_bytes)
+        if not raw:
+            break
+        yield rate, _to_mono_float(raw, sample_width, channels)
+
+def tone_blocks(freqs, rate: int = 44100, duration: float = 5.0, hop: int = HOP_SIZE):
+    freqs = np.asarray(freqs, dtype=np.float64)
+    total = int(rate * duration)
+    for start in range(0, total, hop):
+        t = (np.arange(start, min(start + hop, total)) / rate)[:, None]
+        yield rate, (np.sin(2.0 * np.pi * freqs * t).mean(axis=1) * 0.5).astype(np.float32)
+
+class RingBuffer:
+    def __init__(self, size: int):
+        self.size = size
+        self.data = np.zeros(size, dtype=np.float32)
+        self.pos = 0
+
+    def write(self, samples: np.ndarray):
+        samples = samples[-self.size:]
+        count = len(samples)
+        end = self.pos + count
+        if end <= self.size:
+            self.data[self.pos:end] = samples
+        else:
+            split = self.size - self.pos
+            self.data[self.pos:] = samples[:split]
+            self.data[:count - split] = samples[split:]
+        self.pos = end % self.size
+
+    def read_into(self, out: np.ndarray) -> np.ndarray:
+        tail = self.size - self.pos
+        out[:tail] = self.data[self.pos:]
+        out[tail:] = self.data[:self.pos]
+        return out
+
+class SpectrumAnalyzer:
+    def __init__(self, bands: int, rate: int, fft_size: int = FFT_SIZE,
+                 attack: float = 0.7, decay: float = 0.15):
+        self.bands = bands
+        self.rate = rate
+        self.fft_size = fft_size
+        self.attack = attack
+        self.decay = decay
+        self.window = np.hanning(fft_size).astype(np.float32)
+        self.ring = RingBuffer(fft_size)
+        self._samples = np.zeros(fft_size, dtype=np.float32)
+        freqs = np.fft.rfftfreq(fft_size, 1.0 / rate)
+        edges = np.geomspace(MIN_FREQ, min(MAX_FREQ, rate / 2.0), bands + 1)
+        bins = np.clip(np.searchsorted(freqs, edges), 1, len(freqs) - 1)
+        # low bands are narrower than an FFT bin; push every edge at least one bin past the previous
+        steps = np.arange(len(bins))
+        bins = np.minimum(np.maximum.accumulate(bins - steps) + steps, len(freqs))
+        self._band_starts = np.minimum(bins[:-1], len(freqs) - 1)
+        self._band_end = max(int(bins[-1]), int(self._band_starts[-1]) + 1)
+        self._band_counts = np.maximum(bins[1:] - self._band_starts, 1)
+        self.levels = np.zeros(bands, dtype=np.float32)
+        self.peak = 1e-3
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        self.ring.write(samples)
+        windowed = self.ring.read_into(self._samples) * self.window
+        power = np.abs(np.fft.rfft(windowed)) ** 2
+        # the last band stops at its upper edge instead of summing everything up to Nyquist
+        energy = np.add.reduceat(power[:self._band_end], self._band_starts) / self._band_counts
+        db = 10.0 * np.log10(energy + 1e-12)
+        level = np.clip((db + DB_RANGE) / DB_RANGE, 0.0, None)
+        self.peak = max(float(level.max()), self.peak * 0.995, 1e-3)
+        level = np.minimum(level / self.peak, 1.0)
+        rate = np.where(level > self.levels, self.attack, self.decay)
+        self.levels += (level - self.levels) * rate
+        return self.levels
+
+def levels_to_frame(levels: np.ndarray, rows: int, cols: int, out: np.ndarray = None) -> np.ndarray:
+    column_levels = levels[(np.arange(cols) * len(levels)) // cols]
+    colors = hsv_to_rgb(np.linspace(0.0, 0.8, cols, dtype=np.float32), 1.0, 1.0)
+    if rows == 1:
+        rgb = (colors * column_levels[:, None])[None, :, :]
+    else:
+        height = (rows - np.arange(rows, dtype=np.float32))[:, None] / rows
+        lit = np.clip((column_levels[None, :] - height) * rows + 1.0, 0.0, 1.0)
+        rgb = lit[..., None] * colors[None, :, :]
+    frame = to_frame(rgb)
+    if out is not None:
+        np.copyto(out, frame)
+        return out
+    return frame
+
+class LatencyStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+def run_visualizer(streamer, blocks, fps: float = 60.0, realtime: bool = False) -> LatencyStats:
+    stats = LatencyStats()
+    analyzer = None
+    min_interval = 1.0 / fps
+    last_send = 0.0
+    pending_since = None
+    streamer.session.open()
+    start = time.monotonic()
+    played = 0.0
+    for rate, samples in blocks:
+        arrived = time.monotonic()
+        if analyzer is None:
+            analyzer = SpectrumAnalyzer(streamer.cols, rate)
+        levels = analyzer.process(samples)
+        played += len(samples) / rate
+        if pending_since is None:
+            # the newest sound already waited a hop to fill the block, and the window weights it from its centre
+            pending_since = arrived - (len(samples) + analyzer.fft_size / 2.0) / rate
+        if arrived - last_send >= min_interval:
+            levels_to_frame(levels, streamer.rows, streamer.cols, out=streamer.frame)
+            streamer.present()
+            last_send = arrived
+            stats.add(time.monotonic() - pending_since)
+            pending_since = None
+        if realtime:
+            delay = start + played - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio-reactive lighting visualizer")
+    parser.add_argument('source', nargs='?', default='-',
+                        help="WAV file, or '-' for raw PCM on stdin")
+    parser.add_argument('--rate', type=int, default=44100, help="Raw PCM sample rate")
+    parser.add_argument('--channels', type=int, default=2, help="Raw PCM channel count")
+    parser.add_argument('--sample-width', type=int, default=2, choices=SAMPLE_WIDTHS,
+                        help="Raw PCM bytes per sample")
+    parser.add_argument('--tone', type=float, action='append',
+                        help="Generate a test tone (Hz) instead of reading audio; may repeat")
+    parser.add_argument('--duration', type=float, default=5.0, help="Test tone duration")
+    parser.add_argument('--fps', type=float, default=60.0)
+    parser.add_argument('--simulate', action='store_true', help="Use a simulated HID device")
+    args = parser.parse_args()
+
+    from razer_common import scan_razer_devices, set_hid_backend
+    from razer_stream import FrameStreamer
+    if args.simulate:
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend())
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    if args.tone:
+        blocks, realtime = tone_blocks(args.tone, duration=args.duration), True
+    elif args.source == '-':
+        blocks, realtime = pcm_blocks(sys.stdin.buffer, args.rate, args.channels, args.sample_width), False
+    else:
+        blocks, realtime = wav_blocks(args.source), True
+    streamer = FrameStreamer(devices[0])
+    try:
+        stats = run_visualizer(streamer, blocks, args.fps, realtime)
+        print(f"Frames: {stats.count}, audio-to-light latency mean {stats.mean * 1000:.2f} ms, "
+              f"max {stats.max * 1000:.2f} ms (target {LATENCY_TARGET * 1000:.0f} ms)")
+        if stats.max > LATENCY_TARGET:
+            print("Latency target missed")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        streamer.close()
+
+if __name__ == "__main__":
+    main()
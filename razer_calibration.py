@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+from razer_common import device_key
+
+CALIBRATION_DIR = os.path.expanduser("~/Library/Application Support/Open Razer macOS Control")
+CALIBRATION_PATH = os.path.join(CALIBRATION_DIR, "calibration.json")
+_CHANNELS = np.arange(3)
+_cache = {'path': None, 'mtime': None, 'table': {}}
+
+class Calibration:
+    def __init__(self, gamma=(1.0, 1.0, 1.0), white=(1.0, 1.0, 1.0), lut=None):
+        self.gamma = tuple(float(g) for g in gamma)
+        self.white = tuple(float(w) for w in white)
+        self.custom_lut = lut is not None
+        if lut is not None:
+            self.table = np.asarray(lut, dtype=np.uint8).reshape(3, 256)
+        else:
+            x = np.arange(256, dtype=np.float64) / 255.0
+            curves = [255.0 * w * x ** g for g, w in zip(self.gamma, self.white)]
+            self.table = np.clip(np.rint(curves), 0, 255).astype(np.uint8)
+        self.identity = bool((self.table == np.arange(256, dtype=np.uint8)).all())
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data.get('gamma', (1.0, 1.0, 1.0)), data.get('white', (1.0, 1.0, 1.0)), data.get('lut'))
+
+    def to_dict(self) -> dict:
+        data = {'gamma': list(self.gamma), 'white': list(self.white)}
+        if self.custom_lut:
+            data['lut'] = self.table.tolist()
+        return data
+
+    def apply(self, frame, out=None) -> np.ndarray:
+        frame = np.asarray(frame, dtype=np.uint8)
+        if out is None:
+            return frame.copy() if self.identity else self.table[_CHANNELS, frame]
+        if self.identity:
+            np.copyto(out, frame)
+        else:
+            out[...] = self.table[_CHANNELS, frame]
+        return out
+
+    def apply_color(self, color) -> list:
+        if self.identity:
+            return list(color)
+        return self.apply(np.asarray(color, dtype=np.uint8).reshape(-1, 3)).ravel().tolist()
+
+def load_calibrations(path: str = CALIBRATION_PATH) -> dict:
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _cache['path'] != path or _cache['mtime'] != mtime:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            table = {key: Calibration.from_dict(value) for key, value in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            # a broken file must not keep the app from starting; devices run uncalibrated until it is fixed
+            print(f"Error loading calibration from {path}: {e}")
+            table = {}
+        _cache.update(path=path, mtime=mtime, table=table)
+    return _cache['table']
+
+def save_calibration(key: str, calibration: Calibration, path: str = CALIBRATION_PATH):
+    data = {}
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+    if calibration is None:
+        data.pop(key, None)
+    else:
+        data[key] = calibration.to_dict()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def calibration_for(device: dict, path: str = CALIBRATION_PATH):
+    table = load_calibrations(path)
+    calibration = table.get(device_key(device)) or table.get(f"{device['pid']:04x}")
+    if calibration is None or calibration.identity:
+        return None
+    return calibration
+
+def attach_calibrations(devices: list, path: str = CALIBRATION_PATH) -> list:
+    for device in devices:
+        device['calibration'] = calibration_for(device, path)
+    return devices
+
+def benchmark(calibration: Calibration, shape=(6, 22), iterations: int = 10000) -> float:
+    frame = np.random.randint(0, 256, shape + (3,), dtype=np.uint8)
+    out = np.empty_like(frame)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        calibration.apply(frame, out)
+    return (time.perf_counter() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage per-device color calibration")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list')
+    set_cmd = sub.add_parser('set')
+    set_cmd.add_argument('key', help="Device key (pid:serial) or model PID in hex, e.g. 024e")
+    set_cmd.add_argument('--gamma', type=float, nargs=3, default=(1.0, 1.0, 1.0), metavar=('R', 'G', 'B'))
+    set_cmd.add_argument('--white', type=float, nargs=3, default=(1.0, 1.0, 1.0), metavar=('R', 'G', 'B'))
+    clear = sub.add_parser('clear')
+    clear.add_argument('key')
+    bench = sub.add_parser('bench')
+    bench.add_argument('--gamma', type=float, default=2.2)
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for key, calibration in sorted(load_calibrations().items()):
+            print(f"{key}: gamma {calibration.gamma}, white {calibration.white}")
+    elif args.command == 'set':
+        save_calibration(args.key, Calibration(args.gamma, args.white))
+    elif args.command == 'clear':
+        save_calibration(args.key, None)
+    else:
+        per_frame = benchmark(Calibration((args.gamma,) * 3, (1.0, 0.9, 0.8)))
+        print(f"Calibration: {per_frame * 1e6:.1f} us per 6x22 frame")
+
+if __name__ == "__main__":
+    main()
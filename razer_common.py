@@ -1,7 +1,18 @@
 #!/usr/bin/env python3
 
+import os
+import sys
 import time
-import hid
+
+try:
+    import hid
+except ImportError:
+    hid = None
+
+from razer_health import get_health
+from razer_tracing import traced, trace_backend
+
+HID_BACKEND_ENV = "RAZER_HID_BACKEND"
 
 RAZER_VID = 0x1532
 
@@ -751,12 +762,208 @@ KBD_CMD_CLASS = 0x0F
 KBD_CMD_ID = 0x02
 KBD_DATA_SIZE = 9
 
+BRIGHTNESS_CMD_CLASS = 0x0F
+BRIGHTNESS_CMD_ID = 0x04
+BRIGHTNESS_GET_CMD_ID = 0x84
+BRIGHTNESS_DATA_SIZE = 3
+
+STATUS_SUCCESS = 0x02
+RESPONSE_DELAY = 0.01
+OPEN_SETTLE_DELAY = 0.05
+
+DPI_CMD_CLASS = 0x04
+DPI_CMD_ID = 0x05
+DPI_DATA_SIZE = 7
+DPI_GET_CMD_ID = 0x85
+DPI_STAGES_CMD_ID = 0x06
+DPI_STAGES_GET_CMD_ID = 0x86
+DPI_STAGES_DATA_SIZE = 0x26
+DPI_STAGE_LEN = 7
+MAX_DPI_STAGES = 5
+DPI_MIN = 100
+DPI_MAX = 35000
+
+INFO_CMD_CLASS = 0x00
+FIRMWARE_CMD_ID = 0x81
+FIRMWARE_DATA_SIZE = 0x02
+SERIAL_CMD_ID = 0x82
+SERIAL_DATA_SIZE = 0x16
+POLLING_RATE_CMD_ID = 0x05
+POLLING_RATE_GET_CMD_ID = 0x85
+POLLING_RATE_DATA_SIZE = 0x01
+HYPERPOLLING_CMD_ID = 0x40
+HYPERPOLLING_GET_CMD_ID = 0xC0
+HYPERPOLLING_DATA_SIZE = 0x02
+
+POWER_CMD_CLASS = 0x07
+BATTERY_LEVEL_CMD_ID = 0x80
+CHARGING_CMD_ID = 0x84
+POWER_DATA_SIZE = 0x02
+
+POLLING_RATE_CODES = {1000: 0x01, 500: 0x02, 125: 0x08}
+HYPERPOLLING_RATE_CODES = {8000: 0x01, 4000: 0x02, 2000: 0x04, 1000: 0x08, 500: 0x10, 250: 0x20, 125: 0x40}
+# devices that take the 8 kHz polling command, with the targets each rate change is written to
+HYPERPOLLING_TARGETS = {
+    0x0091: (0x00,),
+    0x00B3: (0x00, 0x01),
+    0x00B6: (0x00,),
+    0x00B7: (0x00,),
+    0x00C0: (0x00,),
+    0x00C1: (0x00,),
+    0x00C2: (0x00,),
+    0x00C3: (0x00,),
+}
+
+NOSTORE = 0x00
+ZERO_LED = 0x00
+SCROLL_WHEEL_LED = 0x01
+BATTERY_LED = 0x03
+LOGO_LED = 0x04
+BACKLIGHT_LED = 0x05
+MACRO_LED = 0x07
+GAME_LED = 0x08
+RIGHT_SIDE_LED = 0x10
+LEFT_SIDE_LED = 0x11
+
+EFFECT_CODES = {
+    'none': 0x00,
+    'static': MOUSE_EFFECT_STATIC,
+    'breathing': MOUSE_EFFECT_BREATHING,
+    'wave': MOUSE_EFFECT_WAVE,
+    'reactive': MOUSE_EFFECT_REACTIVE,
+}
+
+# offsets of RGB triples within the effect parameters
+COLOR_PARAM_OFFSETS = {
+    MOUSE_EFFECT_STATIC: (0,),
+    MOUSE_EFFECT_BREATHING: (0, 3),
+    MOUSE_EFFECT_REACTIVE: (0,),
+}
+LED_ZONES_BY_TYPE = {
+    'mouse': {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED},
+    'keyboard': {'backlight': BACKLIGHT_LED, 'logo': LOGO_LED},
+}
+LAPTOP_LED_ZONES = {'backlight': BACKLIGHT_LED, 'logo': LOGO_LED}
+ACCESSORY_LED_ZONES = {'backlight': ZERO_LED}
+RAZER_LED_ZONES = {
+    0x0046: {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED, 'left_side': LEFT_SIDE_LED, 'right_side': RIGHT_SIDE_LED},
+    0x006C: {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED, 'left_side': LEFT_SIDE_LED, 'right_side': RIGHT_SIDE_LED},
+    0x0059: {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED, 'left_side': LEFT_SIDE_LED, 'right_side': RIGHT_SIDE_LED},
+    0x005A: {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED, 'left_side': LEFT_SIDE_LED, 'right_side': RIGHT_SIDE_LED},
+    0x0060: {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED, 'left_side': LEFT_SIDE_LED, 'right_side': RIGHT_SIDE_LED},
+    0x0070: {'scroll_wheel': SCROLL_WHEEL_LED, 'logo': LOGO_LED, 'left_side': LEFT_SIDE_LED, 'right_side': RIGHT_SIDE_LED},
+    0x0078: {'logo': LOGO_LED},
+    0x008A: {'logo': LOGO_LED},
+    0x0068: ACCESSORY_LED_ZONES,
+    0x0C00: ACCESSORY_LED_ZONES,
+    0x0C01: ACCESSORY_LED_ZONES,
+    0x0C02: ACCESSORY_LED_ZONES,
+    0x0C04: ACCESSORY_LED_ZONES,
+    0x0C06: ACCESSORY_LED_ZONES,
+    0x0C08: ACCESSORY_LED_ZONES,
+    0x0F08: ACCESSORY_LED_ZONES,
+    0x0F0D: ACCESSORY_LED_ZONES,
+    0x0F1D: ACCESSORY_LED_ZONES,
+    0x0F2B: ACCESSORY_LED_ZONES,
+}
+KBD_EFFECT_CUSTOM = 0x08
+MATRIX_CMD_CLASS = 0x0F
+MATRIX_EFFECT_CMD_ID = 0x02
+MATRIX_EFFECT_DATA_SIZE = 0x0C
+MATRIX_FRAME_CMD_ID = 0x03
+MATRIX_FRAME_HEADER_SIZE = 5
+MATRIX_FRAME_OFFSET = 8 + MATRIX_FRAME_HEADER_SIZE
+MATRIX_MAX_COLS = 25
+
+MATRIX_DIMS_BY_TYPE = {
+    'keyboard': (6, 22),
+    'mouse': (1, 15),
+}
+LAPTOP_MATRIX_DIMS = (6, 16)
+RAZER_MATRIX_DIMS = {
+    0x0068: (1, 15),
+    0x0257: (5, 15),
+    0x0269: (5, 15),
+    0x0282: (5, 15),
+    0x0C00: (1, 15),
+    0x0C01: (1, 1),
+    0x0C02: (1, 1),
+    0x0C04: (1, 19),
+    0x0C08: (1, 19),
+    0x0F08: (1, 9),
+    0x0F0D: (1, 15),
+    0x0F1D: (1, 5),
+}
+
+def default_hid_backend():
+    choice = os.environ.get(HID_BACKEND_ENV, '')
+    if choice == 'hidraw' or (hid is None and sys.platform.startswith('linux')):
+        from razer_hidraw import HidrawBackend
+        return HidrawBackend()
+    if hid is None:
+        raise ImportError("hidapi is not installed (pip install hidapi)")
+    return hid
+
+_hid_backend = trace_backend(default_hid_backend())
+_send_listeners = []
+
+def set_hid_backend(backend):
+    global _hid_backend
+    _hid_backend = trace_backend(backend)
+
+def get_hid_backend():
+    return _hid_backend
+
+@traced('hid.settle', 'hid')
+def settle_after_open():
+    time.sleep(OPEN_SETTLE_DELAY)
+
+def add_send_listener(listener):
+    _send_listeners.append(listener)
+
+def remove_send_listener(listener):
+    if listener in _send_listeners:
+        _send_listeners.remove(listener)
+
+def notify_sent(device: dict, reports: list):
+    for listener in list(_send_listeners):
+        try:
+            listener(device, reports)
+        except Exception as e:
+            print(f"Error in send listener: {e}")
+
+def device_key(device: dict) -> str:
+    return f"{device['pid']:04x}:{device.get('serial') or 'N/A'}"
+
 def get_device_type(pid: int) -> str:
     return RAZER_DEVICE_TYPES.get(pid, 'unknown')
 
 def get_transaction_id(pid: int) -> int:
     return RAZER_TRANSACTION_IDS.get(pid, 0x00)
 
+def get_led_zones(pid: int) -> dict:
+    if pid in RAZER_LED_ZONES:
+        return RAZER_LED_ZONES[pid]
+    if 'Blade' in RAZER_DEVICES.get(pid, ''):
+        return LAPTOP_LED_ZONES
+    return LED_ZONES_BY_TYPE.get(get_device_type(pid), {})
+
+def resolve_led(pid: int, zone) -> int:
+    if isinstance(zone, int):
+        return zone
+    zones = get_led_zones(pid)
+    if zone not in zones:
+        raise ValueError(f"Unknown LED zone for PID 0x{pid:04X}: {zone}")
+    return zones[zone]
+
+def get_matrix_dims(pid: int) -> tuple:
+    if pid in RAZER_MATRIX_DIMS:
+        return RAZER_MATRIX_DIMS[pid]
+    if 'Blade' in RAZER_DEVICES.get(pid, ''):
+        return LAPTOP_MATRIX_DIMS
+    return MATRIX_DIMS_BY_TYPE.get(get_device_type(pid), (1, 1))
+
+@traced('razer.calculate_crc')
 def calculate_crc(report_data: bytes) -> int:
     crc = 0
     for i in range(2, 88):
@@ -764,6 +971,7 @@ def calculate_crc(report_data: bytes) -> int:
             crc ^= report_data[i]
     return crc
 
+@traced('razer.construct_razer_report')
 def construct_razer_report(transaction_id: int, command_class: int, command_id: int,
                            data_size: int, arguments: list) -> bytes:
     if len(arguments) > 80:
@@ -783,10 +991,121 @@ def construct_razer_report(transaction_id: int, command_class: int, command_id:
     report[89] = 0x00
     return bytes(report)
 
-def scan_razer_devices() -> list:
+def construct_frame_row_report(transaction_id: int, row: int, rgb: bytes) -> bytes:
+    cols = len(rgb) // 3
+    if cols < 1 or cols > MATRIX_MAX_COLS:
+        raise ValueError(f"Frame row must have 1-{MATRIX_MAX_COLS} columns")
+    args = [0x00, 0x00, row, 0x00, cols - 1] + list(rgb[:cols * 3])
+    return construct_razer_report(transaction_id, MATRIX_CMD_CLASS, MATRIX_FRAME_CMD_ID,
+                                  len(args), args)
+
+def construct_custom_effect_report(transaction_id: int) -> bytes:
+    return construct_razer_report(transaction_id, MATRIX_CMD_CLASS, MATRIX_EFFECT_CMD_ID,
+                                  MATRIX_EFFECT_DATA_SIZE, [NOSTORE, ZERO_LED, KBD_EFFECT_CUSTOM])
+
+def construct_effect_report(device: dict, effect_code: int, extra_params: list, led_id: int = None) -> bytes:
+    pid = device['pid']
+    if is_mouse_device(pid):
+        default_led_id, cmd_class, cmd_id, data_size = MOUSE_SCROLL_WHEEL_LED, MOUSE_CMD_CLASS, MOUSE_CMD_ID, MOUSE_DATA_SIZE
+    elif is_keyboard_device(pid):
+        default_led_id, cmd_class, cmd_id, data_size = KBD_BACKLIGHT_LED, KBD_CMD_CLASS, KBD_CMD_ID, KBD_DATA_SIZE
+    elif get_led_zones(pid):
+        default_led_id, cmd_class, cmd_id, data_size = next(iter(get_led_zones(pid).values())), KBD_CMD_CLASS, KBD_CMD_ID, KBD_DATA_SIZE
+    else:
+        raise ValueError(f"Device type not fully supported yet: {device.get('name')}")
+    led_id = default_led_id if led_id is None else led_id
+    args = build_arguments(effect_code, led_id, calibrate_params(device, effect_code, extra_params))
+    return construct_razer_report(device['transaction_id'], cmd_class, cmd_id, data_size, args)
+
+def construct_zone_reports(device: dict, zone_settings: dict) -> list:
+    reports = []
+    for zone, settings in zone_settings.items():
+        led_id = resolve_led(device['pid'], zone)
+        if 'brightness' in settings:
+            reports.append(construct_brightness_report(device['transaction_id'], led_id, int(settings['brightness'])))
+        if 'effect' in settings:
+            if settings['effect'] not in EFFECT_CODES:
+                raise ValueError(f"Unknown effect: {settings['effect']}")
+            reports.append(construct_effect_report(device, EFFECT_CODES[settings['effect']],
+                                                   settings.get('params', []), led_id))
+    return reports
+
+def construct_brightness_report(transaction_id: int, led_id: int, brightness: int) -> bytes:
+    return construct_razer_report(transaction_id, BRIGHTNESS_CMD_CLASS, BRIGHTNESS_CMD_ID,
+                                  BRIGHTNESS_DATA_SIZE, [VARSTORE, led_id, brightness & 0xFF])
+
+def construct_brightness_query(transaction_id: int, led_id: int) -> bytes:
+    return construct_razer_report(transaction_id, BRIGHTNESS_CMD_CLASS, BRIGHTNESS_GET_CMD_ID,
+                                  BRIGHTNESS_DATA_SIZE, [VARSTORE, led_id, 0x00])
+
+def construct_info_query(transaction_id: int, command_id: int, data_size: int) -> bytes:
+    return construct_razer_report(transaction_id, INFO_CMD_CLASS, command_id, data_size, [])
+
+def construct_dpi_report(transaction_id: int, dpi_x: int, dpi_y: int) -> bytes:
+    args = [VARSTORE, (dpi_x >> 8) & 0xFF, dpi_x & 0xFF, (dpi_y >> 8) & 0xFF, dpi_y & 0xFF, 0x00, 0x00]
+    return construct_razer_report(transaction_id, DPI_CMD_CLASS, DPI_CMD_ID, DPI_DATA_SIZE, args)
+
+def construct_power_query(transaction_id: int, command_id: int) -> bytes:
+    return construct_razer_report(transaction_id, POWER_CMD_CLASS, command_id, POWER_DATA_SIZE, [])
+
+def construct_dpi_query(transaction_id: int) -> bytes:
+    return construct_razer_report(transaction_id, DPI_CMD_CLASS, DPI_GET_CMD_ID, DPI_DATA_SIZE, [VARSTORE])
+
+def validate_dpi(dpi: int) -> int:
+    dpi = int(dpi)
+    if not DPI_MIN <= dpi <= DPI_MAX:
+        raise ValueError(f"DPI out of range ({DPI_MIN}-{DPI_MAX}): {dpi}")
+    return dpi
+
+def construct_dpi_stages_report(transaction_id: int, stages: list, active: int) -> bytes:
+    if not 1 <= len(stages) <= MAX_DPI_STAGES:
+        raise ValueError(f"Expected 1-{MAX_DPI_STAGES} DPI stages, got {len(stages)}")
+    if not 1 <= active <= len(stages):
+        raise ValueError(f"Active DPI stage out of range: {active}")
+    args = [VARSTORE, active, len(stages)]
+    for number, (dpi_x, dpi_y) in enumerate(stages, 1):
+        dpi_x, dpi_y = validate_dpi(dpi_x), validate_dpi(dpi_y)
+        args += [number, (dpi_x >> 8) & 0xFF, dpi_x & 0xFF, (dpi_y >> 8) & 0xFF, dpi_y & 0xFF, 0x00, 0x00]
+    return construct_razer_report(transaction_id, DPI_CMD_CLASS, DPI_STAGES_CMD_ID, DPI_STAGES_DATA_SIZE, args)
+
+def construct_dpi_stages_query(transaction_id: int) -> bytes:
+    return construct_razer_report(transaction_id, DPI_CMD_CLASS, DPI_STAGES_GET_CMD_ID,
+                                  DPI_STAGES_DATA_SIZE, [VARSTORE])
+
+def parse_dpi_stages(response: bytes) -> tuple:
+    active, count = response[9], min(response[10], MAX_DPI_STAGES)
+    stages = []
+    for i in range(count):
+        entry = response[11 + i * DPI_STAGE_LEN:11 + (i + 1) * DPI_STAGE_LEN]
+        stages.append(((entry[1] << 8) | entry[2], (entry[3] << 8) | entry[4]))
+    return stages, active
+
+def supported_polling_rates(pid: int) -> list:
+    codes = HYPERPOLLING_RATE_CODES if pid in HYPERPOLLING_TARGETS else POLLING_RATE_CODES
+    return sorted(codes)
+
+def construct_polling_rate_reports(device: dict, rate: int) -> list:
+    pid, transaction_id = device['pid'], device['transaction_id']
+    if rate not in supported_polling_rates(pid):
+        raise ValueError(f"Unsupported polling rate for PID 0x{pid:04X}: {rate} Hz")
+    if pid in HYPERPOLLING_TARGETS:
+        return [construct_razer_report(transaction_id, INFO_CMD_CLASS, HYPERPOLLING_CMD_ID, HYPERPOLLING_DATA_SIZE,
+                                       [target, HYPERPOLLING_RATE_CODES[rate]])
+                for target in HYPERPOLLING_TARGETS[pid]]
+    return [construct_razer_report(transaction_id, INFO_CMD_CLASS, POLLING_RATE_CMD_ID, POLLING_RATE_DATA_SIZE,
+                                   [POLLING_RATE_CODES[rate]])]
+
+def construct_polling_rate_query(device: dict) -> bytes:
+    if device['pid'] in HYPERPOLLING_TARGETS:
+        return construct_razer_report(device['transaction_id'], INFO_CMD_CLASS, HYPERPOLLING_GET_CMD_ID,
+                                      HYPERPOLLING_DATA_SIZE, [HYPERPOLLING_TARGETS[device['pid']][0]])
+    return construct_razer_report(device['transaction_id'], INFO_CMD_CLASS, POLLING_RATE_GET_CMD_ID,
+                                  POLLING_RATE_DATA_SIZE, [])
+
+def scan_razer_devices(probe: bool = False) -> list:
     devices_grouped = {}
     try:
-        all_devices = hid.enumerate(RAZER_VID, 0x0)
+        all_devices = _hid_backend.enumerate(RAZER_VID, 0x0)
         if not all_devices:
             return []
         parameterized_pids = set(RAZER_DEVICES.keys())
@@ -807,6 +1126,7 @@ def scan_razer_devices() -> list:
                 devices_grouped[key] = {
                     'name': name,
                     'pid': pid,
+                    'serial': serial,
                     'type': device_type,
                     'transaction_id': transaction_id,
                     'interfaces': []
@@ -818,8 +1138,22 @@ def scan_razer_devices() -> list:
     except Exception as e:
         print("Error scanning devices:", e)
         return []
+    if probe:
+        from razer_probe import probe_devices
+        return probe_devices(list(devices_grouped.values()))
     return list(devices_grouped.values())
 
+def calibrate_params(device: dict, effect_code: int, extra_params: list) -> list:
+    params = list(extra_params)
+    calibration = device.get('calibration')
+    if calibration is None:
+        return params
+    for offset in COLOR_PARAM_OFFSETS.get(effect_code, ()):
+        if len(params) >= offset + 3:
+            params[offset:offset + 3] = calibration.apply_color(params[offset:offset + 3])
+    return params
+
+@traced('razer.build_arguments')
 def build_arguments(effect_code: int, led_id: int, extra_params: list) -> list:
     return [VARSTORE, led_id, effect_code, 0x00, 0x00, 0x01] + extra_params
 
@@ -827,20 +1161,178 @@ def send_report_to_device(selected_device: dict, report: bytes, command_desc: st
 
     report_with_id = b'\x00' + report
     success = False
+    health = get_health()
     for iface in selected_device.get('interfaces', []):
         path = iface['path']
+        if not health.allow(path):
+            continue
         try:
-            dev = hid.device()
+            dev = _hid_backend.device()
             dev.open_path(path)
-            time.sleep(0.05)
+            settle_after_open()
             bytes_written = dev.send_feature_report(report_with_id)
+            dev.close()
             if bytes_written == len(report_with_id):
                 success = True
+                health.record_success(path)
+            else:
+                health.record_failure(path)
+        except Exception as e:
+            health.record_failure(path, e)
+            print(f"Error on interface {path}: {e}")
+    if success and _send_listeners:
+        notify_sent(selected_device, [report])
+    return success
+
+def send_reports_to_device(selected_device: dict, reports: list, command_desc: str) -> bool:
+    success = False
+    health = get_health()
+    for iface in selected_device.get('interfaces', []):
+        path = iface['path']
+        if not health.allow(path):
+            continue
+        try:
+            dev = _hid_backend.device()
+            dev.open_path(path)
+            settle_after_open()
+            sent = 0
+            for report in reports:
+                report_with_id = b'\x00' + report
+                if dev.send_feature_report(report_with_id) == len(report_with_id):
+                    sent += 1
             dev.close()
+            if sent == len(reports):
+                success = True
+                health.record_success(path)
+            else:
+                health.record_failure(path)
         except Exception as e:
+            health.record_failure(path, e)
             print(f"Error on interface {path}: {e}")
+    if success and _send_listeners:
+        notify_sent(selected_device, reports)
     return success
 
+def exchange_with_device(selected_device: dict, reports: list, command_desc: str) -> list:
+    # one open per interface: every report is written and its response read before the next
+    health = get_health()
+    for iface in selected_device.get('interfaces', []):
+        path = iface['path']
+        if not health.allow(path):
+            continue
+        try:
+            dev = _hid_backend.device()
+            dev.open_path(path)
+            responses = []
+            written = True
+            try:
+                settle_after_open()
+                for report in reports:
+                    report_with_id = b'\x00' + report
+                    if dev.send_feature_report(report_with_id) != len(report_with_id):
+                        written = False
+                        break
+                    time.sleep(RESPONSE_DELAY)
+                    response = bytes(dev.get_feature_report(0x00, REPORT_LEN + 1))[1:]
+                    if len(response) != REPORT_LEN or response[0] != STATUS_SUCCESS \
+                            or response[6:8] != report[6:8]:
+                        break
+                    responses.append(response)
+            finally:
+                dev.close()
+            if not written:
+                health.record_failure(path)
+                continue
+            health.record_success(path)
+            if len(responses) == len(reports):
+                return responses
+        except Exception as e:
+            health.record_failure(path, e)
+            print(f"Error on interface {path}: {e}")
+    return None
+
+def transact_with_device(selected_device: dict, report: bytes, command_desc: str) -> bytes:
+    responses = exchange_with_device(selected_device, [report], command_desc)
+    return None if responses is None else responses[0]
+
+def default_led(pid: int) -> int:
+    if is_mouse_device(pid):
+        return MOUSE_SCROLL_WHEEL_LED
+    if is_keyboard_device(pid):
+        return KBD_BACKLIGHT_LED
+    return next(iter(get_led_zones(pid).values()), ZERO_LED)
+
+def set_led_zones(selected_device: dict, zone_settings: dict) -> bool:
+    reports = construct_zone_reports(selected_device, zone_settings)
+    if not reports:
+        return False
+    return send_reports_to_device(selected_device, reports, "Set LED Zones")
+
+def get_brightness(selected_device: dict, led_id: int = None) -> int:
+    led_id = default_led(selected_device['pid']) if led_id is None else led_id
+    query = construct_brightness_query(selected_device['transaction_id'], led_id)
+    response = transact_with_device(selected_device, query, "Get Brightness")
+    return None if response is None else response[10]
+
+def set_brightness(selected_device: dict, brightness: int, led_id: int = None) -> bool:
+    led_id = default_led(selected_device['pid']) if led_id is None else led_id
+    report = construct_brightness_report(selected_device['transaction_id'], led_id, brightness)
+    return send_report_to_device(selected_device, report, "Set Brightness")
+
+def get_battery(selected_device: dict) -> tuple:
+    # (percent, charging) for devices with a battery, None when the device does not answer
+    tid = selected_device['transaction_id']
+    queries = [construct_power_query(tid, BATTERY_LEVEL_CMD_ID), construct_power_query(tid, CHARGING_CMD_ID)]
+    responses = exchange_with_device(selected_device, queries, "Get Battery")
+    if responses is None:
+        return None
+    return round(responses[0][9] * 100 / 255), bool(responses[1][9])
+
+def get_dpi(selected_device: dict) -> tuple:
+    query = construct_dpi_query(selected_device['transaction_id'])
+    response = transact_with_device(selected_device, query, "Get DPI")
+    if response is None:
+        return None
+    return (response[9] << 8) | response[10], (response[11] << 8) | response[12]
+
+def set_dpi(selected_device: dict, dpi_x: int, dpi_y: int = None) -> bool:
+    dpi_x = validate_dpi(dpi_x)
+    dpi_y = dpi_x if dpi_y is None else validate_dpi(dpi_y)
+    report = construct_dpi_report(selected_device['transaction_id'], dpi_x, dpi_y)
+    return send_report_to_device(selected_device, report, "Set DPI")
+
+def get_dpi_stages(selected_device: dict) -> tuple:
+    query = construct_dpi_stages_query(selected_device['transaction_id'])
+    response = transact_with_device(selected_device, query, "Get DPI Stages")
+    return None if response is None else parse_dpi_stages(response)
+
+def set_dpi_stages(selected_device: dict, stages: list, active: int = 1) -> bool:
+    stages = [(validate_dpi(x), validate_dpi(y)) for x, y in stages]
+    report = construct_dpi_stages_report(selected_device['transaction_id'], stages, active)
+    query = construct_dpi_stages_query(selected_device['transaction_id'])
+    # the whole table goes out as one report and is read back on the same open handle
+    responses = exchange_with_device(selected_device, [report, query], "Set DPI Stages")
+    if responses is None or parse_dpi_stages(responses[1]) != (stages, active):
+        return False
+    if _send_listeners:
+        notify_sent(selected_device, [report])
+    return True
+
+def get_polling_rate(selected_device: dict) -> int:
+    query = construct_polling_rate_query(selected_device)
+    response = transact_with_device(selected_device, query, "Get Polling Rate")
+    if response is None:
+        return None
+    if selected_device['pid'] in HYPERPOLLING_TARGETS:
+        codes, code = HYPERPOLLING_RATE_CODES, response[9]
+    else:
+        codes, code = POLLING_RATE_CODES, response[8]
+    return next((rate for rate, c in codes.items() if c == code), None)
+
+def set_polling_rate(selected_device: dict, rate: int) -> bool:
+    reports = construct_polling_rate_reports(selected_device, rate)
+    return send_reports_to_device(selected_device, reports, "Set Polling Rate")
+
 def is_mouse_device(pid: int) -> bool:
     return get_device_type(pid) == 'mouse'
 
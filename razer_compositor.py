@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import argparse
+import numpy as np
+
+from razer_effects import EFFECTS, hsv_to_rgb, to_frame
+
+BLEND_MODES = {
+    'normal': lambda base, top: top,
+    'add': lambda base, top: np.minimum(base + top, 1.0),
+    'multiply': lambda base, top: base * top,
+    'screen': lambda base, top: 1.0 - (1.0 - base) * (1.0 - top),
+}
+
+def solid(color):
+    def render(t, rows, cols):
+        return np.broadcast_to(np.asarray(color, dtype=np.uint8), (rows, cols, 3))
+    return render
+
+def breathing(color_a=(255, 255, 255), color_b=(0, 0, 0), speed: float = 0.5):
+    a = np.asarray(color_a, dtype=np.float32) / 255.0
+    b = np.asarray(color_b, dtype=np.float32) / 255.0
+    def render(t, rows, cols):
+        level = 0.5 - 0.5 * np.cos(2.0 * np.pi * speed * t)
+        return np.broadcast_to(to_frame(b + (a - b) * level), (rows, cols, 3))
+    return render
+
+def wave(speed: float = 0.25, direction: int = 0):
+    sign = 1.0 if direction == 0 else -1.0
+    def render(t, rows, cols):
+        hue = (np.arange(cols, dtype=np.float32) / cols - sign * speed * t) % 1.0
+        return np.broadcast_to(to_frame(hsv_to_rgb(hue, 1.0, 1.0)), (rows, cols, 3))
+    return render
+
+def flash(color=(255, 0, 0), start: float = 0.0, duration: float = 1.0, pulses: int = 3):
+    c = np.asarray(color, dtype=np.float32) / 255.0
+    def render(t, rows, cols):
+        elapsed = t - start
+        if elapsed < 0.0 or elapsed >= duration:
+            level = 0.0
+        else:
+            level = 0.5 - 0.5 * np.cos(2.0 * np.pi * pulses * elapsed / duration)
+        return np.broadcast_to(to_frame(c * level), (rows, cols, 3))
+    return render
+
+class Layer:
+    def __init__(self, source, blend: str = 'normal', opacity: float = 1.0, mask=None,
+                 animated: bool = None, name: str = None):
+        if blend not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode: {blend}")
+        self.source = source if callable(source) else solid(source)
+        self.blend = blend
+        self.name = name
+        # a constant color renders once; only callables are re-rendered every tick
+        self.animated = callable(source) if animated is None else animated
+        self._opacity = float(opacity)
+        self._mask = None
+        self._enabled = True
+        self._cache = None
+        self.version = 0
+        self.mask = mask
+
+    @property
+    def opacity(self) -> float:
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, value: float):
+        self._opacity = min(max(float(value), 0.0), 1.0)
+        self.version += 1
+
+    @property
+    def mask(self):
+        return self._mask
+
+    @mask.setter
+    def mask(self, value):
+        self._mask = None if value is None else np.asarray(value, dtype=np.float32)[..., None]
+        self.version += 1
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self._enabled = bool(value)
+        self.version += 1
+
+    def invalidate(self):
+        self._cache = None
+        self.version += 1
+
+    def render(self, t: float, rows: int, cols: int) -> np.ndarray:
+        if not self.animated and self._cache is not None and self._cache.shape[:2] == (rows, cols):
+            return self._cache
+        rgb = np.asarray(self.source(t, rows, cols), dtype=np.float32) * np.float32(1.0 / 255.0)
+        if not self.animated:
+            self._cache = rgb
+        return rgb
+
+    def composite(self, base: np.ndarray, t: float):
+        rows, cols = base.shape[:2]
+        top = BLEND_MODES[self.blend](base, self.render(t, rows, cols))
+        alpha = self._opacity if self._mask is None else self._opacity * self._mask
+        if self.blend == 'normal' and self._mask is None and alpha >= 1.0:
+            base[...] = top
+        else:
+            base += (top - base) * alpha
+
+class Compositor:
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.layers = []
+        self._base = np.zeros((rows, cols, 3), dtype=np.float32)
+        self._static_prefix = None
+        self._static_key = None
+
+    def add_layer(self, source, **kwargs) -> Layer:
+        layer = source if isinstance(source, Layer) else Layer(source, **kwargs)
+        self.layers.append(layer)
+        return layer
+
+    def remove_layer(self, layer: Layer):
+        self.layers.remove(layer)
+
+    def _prefix_length(self) -> int:
+        count = 0
+        for layer in self.layers:
+            if layer.animated and layer.enabled:
+                break
+            count += 1
+        return count
+
+    def render(self, t: float, out: np.ndarray = None) -> np.ndarray:
+        prefix = self._prefix_length()
+        key = tuple((id(layer), layer.version) for layer in self.layers[:prefix])
+        if key != self._static_key:
+            self._base.fill(0.0)
+            for layer in self.layers[:prefix]:
+                if layer.enabled:
+                    layer.composite(self._base, t)
+            self._static_prefix = self._base.copy()
+            self._static_key = key
+        else:
+            np.copyto(self._base, self._static_prefix)
+        for layer in self.layers[prefix:]:
+            if layer.enabled:
+                layer.composite(self._base, t)
+        if out is None:
+            out = np.empty((self.rows, self.cols, 3), dtype=np.uint8)
+        np.multiply(np.clip(self._base, 0.0, 1.0, out=self._base), 255.0, out=self._base)
+        np.add(self._base, 0.5, out=self._base)
+        np.copyto(out, self._base, casting='unsafe')
+        return out
+
+def run_compositor(streamer, compositor: Compositor, fps: float = 30.0, duration: float = None):
+    from razer_stream import run_at_fps
+    def tick(t):
+        compositor.render(t, out=streamer.frame)
+        streamer.present()
+    run_at_fps(tick, fps, duration)
+
+def parse_layer_spec(spec: str) -> Layer:
+    parts = spec.split(':')
+    name = parts[0]
+    blend = parts[1] if len(parts) > 1 and parts[1] else 'normal'
+    opacity = float(parts[2]) if len(parts) > 2 else 1.0
+    if name in EFFECTS:
+        return Layer(EFFECTS[name], blend=blend, opacity=opacity, name=name)
+    if name == 'breathing':
+        return Layer(breathing(), blend=blend, opacity=opacity, name=name)
+    if name == 'wave':
+        return Layer(wave(), blend=blend, opacity=opacity, name=name)
+    color = bytes.fromhex(name.lstrip('#'))
+    if len(color) != 3:
+        raise ValueError(f"Unknown layer: {spec}")
+    return Layer(tuple(color), blend=blend, opacity=opacity, animated=False, name=name)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless layered lighting compositor")
+    parser.add_argument('layers', nargs='+',
+                        help="Layers bottom to top as name[:blend[:opacity]], e.g. 202040 plasma:screen:0.5")
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--duration', type=float, default=None)
+    args = parser.parse_args()
+
+    from razer_common import scan_razer_devices
+    from razer_stream import FrameStreamer
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    streamer = FrameStreamer(devices[0])
+    compositor = Compositor(streamer.rows, streamer.cols)
+    for spec in args.layers:
+        compositor.add_layer(parse_layer_spec(spec))
+    try:
+        run_compositor(streamer, compositor, args.fps, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        streamer.close()
+
+if __name__ == "__main__":
+    main()
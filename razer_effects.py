@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import argparse
+import functools
+import time
+import numpy as np
+
+TWO_PI = np.float32(2.0 * np.pi)
+
+@functools.lru_cache(maxsize=None)
+def _grid(rows: int, cols: int) -> tuple:
+    y, x = np.mgrid[0:rows, 0:cols].astype(np.float32)
+    y.flags.writeable = False
+    x.flags.writeable = False
+    return y, x
+
+@functools.lru_cache(maxsize=None)
+def _random_field(rows: int, cols: int, seed: int) -> np.ndarray:
+    field = np.random.default_rng(seed).random((2, rows, cols), dtype=np.float32)
+    field.flags.writeable = False
+    return field
+
+@functools.lru_cache(maxsize=None)
+def _noise_lattice(size: int, seed: int) -> np.ndarray:
+    lattice = np.random.default_rng(seed).random((size, size), dtype=np.float32)
+    lattice.flags.writeable = False
+    return lattice
+
+def _color(rgb) -> np.ndarray:
+    return np.asarray(rgb, dtype=np.float32) / 255.0
+
+def to_frame(rgb: np.ndarray) -> np.ndarray:
+    return (np.clip(rgb, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+def hsv_to_rgb(h, s, v) -> np.ndarray:
+    h = np.asarray(h, dtype=np.float32)[..., None]
+    s = np.asarray(s, dtype=np.float32)[..., None]
+    v = np.asarray(v, dtype=np.float32)[..., None]
+    k = (np.array([5.0, 3.0, 1.0], dtype=np.float32) + h * 6.0) % 6.0
+    return v - v * s * np.clip(np.minimum(k, 4.0 - k), 0.0, 1.0)
+
+def _value_noise(x: np.ndarray, y: np.ndarray, seed: int) -> np.ndarray:
+    lattice = _noise_lattice(64, seed)
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = x - x0
+    fy = y - y0
+    fx = fx * fx * (3.0 - 2.0 * fx)
+    fy = fy * fy * (3.0 - 2.0 * fy)
+    xi = x0.astype(np.int64) & 63
+    yi = y0.astype(np.int64) & 63
+    xj = (xi + 1) & 63
+    yj = (yi + 1) & 63
+    top = lattice[yi, xi] + (lattice[yi, xj] - lattice[yi, xi]) * fx
+    bottom = lattice[yj, xi] + (lattice[yj, xj] - lattice[yj, xi]) * fx
+    return top + (bottom - top) * fy
+
+def spectrum_cycle(t: float, rows: int, cols: int, speed: float = 0.1) -> np.ndarray:
+    rgb = hsv_to_rgb((t * speed) % 1.0, 1.0, 1.0)
+    return np.broadcast_to(to_frame(rgb), (rows, cols, 3))
+
+def gradient_scroll(t: float, rows: int, cols: int, colors=((255, 0, 0), (0, 0, 255)),
+                    speed: float = 4.0, span: float = None) -> np.ndarray:
+    _, x = _grid(rows, cols)
+    palette = _color(colors)
+    span = span or float(cols)
+    pos = ((x - t * speed) / span) % 1.0 * len(palette)
+    idx = pos.astype(np.int64) % len(palette)
+    frac = (pos - np.floor(pos))[..., None]
+    rgb = palette[idx] + (palette[(idx + 1) % len(palette)] - palette[idx]) * frac
+    return to_frame(rgb)
+
+def ripple(t: float, rows: int, cols: int, color=(0, 255, 255), center=None,
+           speed: float = 8.0, period: float = 1.5, thickness: float = 1.5) -> np.ndarray:
+    y, x = _grid(rows, cols)
+    cy, cx = center if center is not None else ((rows - 1) / 2.0, (cols - 1) / 2.0)
+    dist = np.hypot(x - cx, (y - cy) * 1.5)
+    radius = (t % period) * speed
+    intensity = np.clip(1.0 - np.abs(dist - radius) / thickness, 0.0, 1.0)
+    return to_frame(intensity[..., None] * _color(color))
+
+def starlight(t: float, rows: int, cols: int, color=(255, 255, 255), density: float = 0.3,
+              rate: float = 0.5, seed: int = 0) -> np.ndarray:
+    phase, period = _random_field(rows, cols, seed)
+    cycle = t * rate * (0.5 + period) + phase
+    twinkle = np.maximum(np.sin(cycle * TWO_PI), 0.0) ** 4
+    lit = (np.floor(cycle) * 0.618034 + phase) % 1.0 < density
+    return to_frame((twinkle * lit)[..., None] * _color(color))
+
+def fire(t: float, rows: int, cols: int, speed: float = 3.0, scale: float = 0.45,
+         seed: int = 0) -> np.ndarray:
+    y, x = _grid(rows, cols)
+    height = (y + 1.0) / rows
+    rise = y * scale + t * speed
+    noise = 0.6 * _value_noise(x * scale, rise, seed) + 0.4 * _value_noise(x * scale * 2.0, rise * 2.0, seed + 1)
+    heat = np.clip(noise * 1.6 * height ** 1.5, 0.0, 1.0)[..., None]
+    rgb = np.clip(heat * np.array([3.0, 1.5, 0.6], dtype=np.float32)
+                  - np.array([0.0, 0.5, 0.4], dtype=np.float32), 0.0, 1.0)
+    return to_frame(rgb)
+
+def plasma(t: float, rows: int, cols: int, speed: float = 1.0, scale: float = 0.35) -> np.ndarray:
+    y, x = _grid(rows, cols)
+    xs = x * scale
+    ys = y * scale
+    ts = t * speed
+    v = (np.sin(xs + ts)
+         + np.sin((ys + ts) * 0.5)
+         + np.sin((xs + ys + ts) * 0.5)
+         + np.sin(np.sqrt((xs - cols * scale * 0.5) ** 2 + ys ** 2) + ts))
+    return to_frame(hsv_to_rgb(v * 0.125 + 0.5, 1.0, 1.0))
+
+EFFECTS = {
+    'spectrum': spectrum_cycle,
+    'gradient': gradient_scroll,
+    'ripple': ripple,
+    'starlight': starlight,
+    'fire': fire,
+    'plasma': plasma,
+}
+
+def make_renderer(name: str, rows: int, cols: int, **params):
+    effect = EFFECTS[name]
+    return lambda t: effect(t, rows, cols, **params)
+
+def benchmark(rows: int = 6, cols: int = 22, frames: int = 2000) -> dict:
+    results = {}
+    for name, effect in EFFECTS.items():
+        effect(0.0, rows, cols)
+        start = time.perf_counter()
+        for i in range(frames):
+            effect(i / 60.0, rows, cols)
+        results[name] = (time.perf_counter() - start) / frames
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Host-rendered Razer lighting effects")
+    parser.add_argument('effect', nargs='?', choices=sorted(EFFECTS), default='spectrum')
+    parser.add_argument('--fps', type=float, default=60.0)
+    parser.add_argument('--duration', type=float, default=None)
+    parser.add_argument('--bench', action='store_true', help="Time each effect on a 22x6 frame")
+    args = parser.parse_args()
+
+    if args.bench:
+        for name, seconds in benchmark().items():
+            print(f"{name:10s} {seconds * 1e6:8.1f} us/frame")
+        return
+
+    from razer_common import scan_razer_devices
+    from razer_stream import FrameStreamer, run_stream
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    streamer = FrameStreamer(devices[0])
+    try:
+        run_stream(streamer, make_renderer(args.effect, streamer.rows, streamer.cols),
+                   args.fps, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        streamer.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from razer_common import RAZER_DEVICES, get_battery, get_transaction_id
+from razer_stream import FrameStreamer
+
+WIRELESS_TRANSACTION_ID = 0x9F
+WIRELESS_NAME_HINTS = ('Wireless', 'HyperSpeed', 'Receiver')
+# dual-mode devices enumerate a separate "(Wired)" PID for the cable
+WIRED_NAME_HINT = '(Wired)'
+MAX_FPS = {'wired': 60.0, 'laptop': 60.0, 'wireless': 30.0}
+BATTERY_MAX_FPS = {'wired': 30.0, 'laptop': 20.0, 'wireless': 15.0}
+MIN_FPS = 5.0
+FPS_STEP = 5.0
+DECREASE_FACTOR = 0.75
+# fraction of each frame period the link may spend writing
+LOAD_HIGH = 0.6
+LOAD_LOW = 0.3
+ADJUST_INTERVAL = 1.0
+POWER_POLL_INTERVAL = 10.0
+# a wireless device below this charge and not charging is governed as if the host were on battery
+LOW_BATTERY_PERCENT = 25
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+def connection_type(pid: int) -> str:
+    name = RAZER_DEVICES.get(pid, '')
+    if WIRED_NAME_HINT in name:
+        return 'laptop' if 'Blade' in name else 'wired'
+    if get_transaction_id(pid) == WIRELESS_TRANSACTION_ID or any(h in name for h in WIRELESS_NAME_HINTS):
+        return 'wireless'
+    if 'Blade' in name:
+        return 'laptop'
+    return 'wired'
+
+def _read(path: str) -> str:
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+def host_on_battery():
+    if sys.platform == 'darwin':
+        try:
+            out = subprocess.run(['pmset', '-g', 'batt'], capture_output=True, text=True, timeout=2).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return "'Battery Power'" in out
+    supplies = glob.glob(os.path.join(POWER_SUPPLY_DIR, '*'))
+    mains = [s for s in supplies if _read(os.path.join(s, 'type')) == 'Mains']
+    batteries = [s for s in supplies if _read(os.path.join(s, 'type')) == 'Battery']
+    if not mains or not batteries:
+        return None
+    return not any(_read(os.path.join(s, 'online')) == '1' for s in mains)
+
+class GovernorMetrics:
+    def __init__(self):
+        self.changes = []
+        self.frames = 0
+        self.window_frames = 0
+        self.window_start = time.monotonic()
+        self.achieved_fps = 0.0
+        self.load = 0.0
+        self._awaiting = []
+
+    def frame(self):
+        self.frames += 1
+        self.window_frames += 1
+
+    def change(self, entry: dict):
+        # the achieved rate is filled in once a full window has run at the new rate
+        entry['achieved_fps'] = None
+        self.changes.append(entry)
+        self._awaiting.append(entry)
+
+    def close_window(self, now: float):
+        elapsed = now - self.window_start
+        if elapsed > 0:
+            self.achieved_fps = self.window_frames / elapsed
+            for entry in self._awaiting:
+                entry['achieved_fps'] = self.achieved_fps
+            self._awaiting = []
+        self.window_frames = 0
+        self.window_start = now
+
+    def summary(self) -> dict:
+        return {
+            'frames': self.frames,
+            'achieved_fps': self.achieved_fps,
+            'load': self.load,
+            'changes': len(self.changes),
+        }
+
+class FrameRateGovernor:
+    def __init__(self, device: dict, session=None, on_battery=host_on_battery, battery=get_battery):
+        self.device = device
+        self.session = session
+        self.connection = connection_type(device['pid'])
+        self._power_probe = on_battery
+        self._battery_probe = battery if self.connection == 'wireless' else None
+        self.on_battery = None
+        self.battery = None
+        self._power_result = None
+        self._power_thread = None
+        self.metrics = GovernorMetrics()
+        self.fps = self.ceiling()
+        self._last_adjust = time.monotonic()
+        # the first check runs before streaming starts; later ones never block a frame
+        self._power_checked = self._last_adjust
+        self._apply_power(self._read_power(), self._last_adjust)
+
+    def ceiling(self) -> float:
+        table = BATTERY_MAX_FPS if self.on_battery else MAX_FPS
+        return table[self.connection]
+
+    def _set_fps(self, fps: float, reason: str, now: float):
+        fps = max(MIN_FPS, min(self.ceiling(), fps))
+        if fps != self.fps:
+            self.metrics.change({'time': now, 'from': self.fps, 'to': fps, 'reason': reason})
+            self.fps = fps
+
+    def _read_power(self) -> tuple:
+        host = self._power_probe() if self._power_probe else None
+        battery = self._battery_probe(self.device) if self._battery_probe else None
+        return host, battery
+
+    def _check_power(self):
+        self._power_result = self._read_power()
+
+    def _apply_power(self, power: tuple, now: float):
+        host, battery = power
+        self.battery = battery
+        low = battery is not None and not battery[1] and battery[0] < LOW_BATTERY_PERCENT
+        on_battery = bool(host or low)
+        if on_battery != self.on_battery:
+            self.on_battery = on_battery
+            target = min(self.fps, self.ceiling()) if on_battery else self.ceiling()
+            reason = f"device battery {battery[0]}%" if low else 'on battery' if host else 'external power'
+            self._set_fps(target, reason, now)
+
+    def _poll_power(self, now: float):
+        result, self._power_result = self._power_result, None
+        if result is not None:
+            self._apply_power(result, now)
+        if self._power_thread is not None and self._power_thread.is_alive():
+            return
+        if now - self._power_checked < POWER_POLL_INTERVAL:
+            return
+        self._power_checked = now
+        # pmset and the device battery query can take a while, so they run beside the stream
+        self._power_thread = threading.Thread(target=self._check_power, name="razer-power-check", daemon=True)
+        self._power_thread.start()
+
+    def update(self, now: float = None) -> float:
+        now = time.monotonic() if now is None else now
+        self.metrics.frame()
+        if now - self._last_adjust < ADJUST_INTERVAL:
+            return self.fps
+        self._last_adjust = now
+        self.metrics.close_window(now)
+        self._poll_power(now)
+        latency = getattr(self.session, 'latency', None)
+        if not latency:
+            return self.fps
+        load = latency * self.fps
+        self.metrics.load = load
+        if load > LOAD_HIGH:
+            self._set_fps(self.fps * DECREASE_FACTOR, f"load {load:.2f}", now)
+        elif load < LOAD_LOW and self.fps < self.ceiling():
+            self._set_fps(self.fps + FPS_STEP, f"load {load:.2f}", now)
+        return self.fps
+
+def run_governed(streamer: FrameStreamer, render, governor: FrameRateGovernor = None, duration: float = None):
+    governor = governor or FrameRateGovernor(streamer.device, streamer.session)
+    start = time.monotonic()
+    next_tick = start
+    while True:
+        now = time.monotonic()
+        if duration is not None and now - start >= duration:
+            break
+        streamer.write_frame(render(now - start))
+        next_tick += 1.0 / governor.update(now)
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_tick = time.monotonic()
+    return governor
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an effect at a power- and latency-governed frame rate")
+    parser.add_argument('effect', nargs='?', default='spectrum')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--simulate', action='store_true', help="Use simulated HID devices")
+    parser.add_argument('--latency', type=float, default=0.001, help="Simulated write latency in seconds")
+    args = parser.parse_args()
+
+    from razer_common import scan_razer_devices, set_hid_backend
+    from razer_effects import make_renderer
+    if args.simulate:
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend(write_latency=args.latency))
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    streamer = FrameStreamer(devices[0])
+    governor = FrameRateGovernor(devices[0], streamer.session)
+    print(f"{devices[0]['name']}: {governor.connection}, starting at {governor.fps:.0f} FPS")
+    try:
+        run_governed(streamer, make_renderer(args.effect, *streamer.shape), governor, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        streamer.close()
+    for change in governor.metrics.changes:
+        achieved = 'n/a' if change['achieved_fps'] is None else f"{change['achieved_fps']:.1f}"
+        print(f"  {change['from']:.1f} -> {change['to']:.1f} FPS ({change['reason']}, achieved {achieved})")
+    summary = governor.metrics.summary()
+    print(f"Final {governor.fps:.1f} FPS, achieved {summary['achieved_fps']:.1f}, "
+          f"link load {summary['load']:.2f}, {summary['frames']} frames")
+
+if __name__ == "__main__":
+    main()
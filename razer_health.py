@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+STATE_GONE = 'gone'
+
+class InterfaceHealth:
+    def __init__(self, path: bytes):
+        self.path = path
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.total_failures = 0
+        self.retry_at = 0.0
+        self.last_error = None
+
+    def backoff(self) -> float:
+        return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** max(self.failures - FAILURE_THRESHOLD, 0))
+
+class HealthRegistry:
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD):
+        self.failure_threshold = failure_threshold
+        self.interfaces = {}
+        self._lock = threading.Lock()
+
+    def _get(self, path: bytes) -> InterfaceHealth:
+        health = self.interfaces.get(path)
+        if health is None:
+            health = self.interfaces[path] = InterfaceHealth(path)
+        return health
+
+    def allow(self, path: bytes) -> bool:
+        health = self.interfaces.get(path)
+        if health is None or health.state == STATE_CLOSED:
+            return True
+        with self._lock:
+            if health.state == STATE_OPEN and time.monotonic() >= health.retry_at:
+                # let exactly one caller probe the interface
+                health.state = STATE_HALF_OPEN
+                return True
+            return False
+
+    def record_success(self, path: bytes):
+        health = self.interfaces.get(path)
+        if health is None or (health.state == STATE_CLOSED and not health.failures):
+            return
+        with self._lock:
+            health.state = STATE_CLOSED
+            health.failures = 0
+
+    def record_failure(self, path: bytes, error: Exception = None):
+        with self._lock:
+            health = self._get(path)
+            health.failures += 1
+            health.total_failures += 1
+            health.last_error = str(error) if error else None
+            if health.state == STATE_GONE:
+                return
+            if health.state == STATE_HALF_OPEN or health.failures >= self.failure_threshold:
+                health.state = STATE_OPEN
+                health.retry_at = time.monotonic() + health.backoff()
+
+    def revalidate(self, present_paths):
+        present_paths = set(present_paths)
+        with self._lock:
+            for path, health in self.interfaces.items():
+                if path not in present_paths:
+                    if health.state != STATE_CLOSED or health.failures:
+                        health.state = STATE_GONE
+                elif health.state == STATE_GONE:
+                    # back on the bus: probe immediately instead of waiting out the backoff;
+                    # circuits that stayed present keep their backoff schedule
+                    health.state = STATE_OPEN
+                    health.retry_at = 0.0
+
+    def state(self, path: bytes) -> str:
+        health = self.interfaces.get(path)
+        return STATE_CLOSED if health is None else health.state
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {path: {'state': h.state, 'failures': h.failures, 'total_failures': h.total_failures,
+                           'last_error': h.last_error}
+                    for path, h in self.interfaces.items()}
+
+_registry = HealthRegistry()
+
+def get_health() -> HealthRegistry:
+    return _registry
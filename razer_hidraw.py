@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SYSFS_HIDRAW = "/sys/class/hidraw"
+DEV_ROOT = "/dev"
+BUS_USB = 0x0003
+
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+def _ioc(direction: int, type_char: str, number: int, size: int) -> int:
+    return (direction << 30) | (size << 16) | (ord(type_char) << 8) | number
+
+def HIDIOCSFEATURE(length: int) -> int:
+    return _ioc(_IOC_WRITE | _IOC_READ, 'H', 0x06, length)
+
+def HIDIOCGFEATURE(length: int) -> int:
+    return _ioc(_IOC_WRITE | _IOC_READ, 'H', 0x07, length)
+
+def _ioctl(fd: int, request: int, buf: bytearray) -> int:
+    return fcntl.ioctl(fd, request, buf, True)
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+def parse_uevent(text: str) -> dict:
+    fields = dict(line.split('=', 1) for line in text.splitlines() if '=' in line)
+    bus, vendor, product = (int(x, 16) for x in fields.get('HID_ID', '0:0:0').split(':'))
+    return {
+        'bus': bus,
+        'vendor_id': vendor,
+        'product_id': product,
+        'product_string': fields.get('HID_NAME', ''),
+        'serial_number': fields.get('HID_UNIQ', ''),
+    }
+
+class HidrawBackend:
+    def __init__(self, sysfs_root: str = SYSFS_HIDRAW, dev_root: str = DEV_ROOT):
+        self.sysfs_root = sysfs_root
+        self.dev_root = dev_root
+        self._fds = {}
+        self._lock = threading.Lock()
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0) -> list:
+        try:
+            nodes = sorted(os.listdir(self.sysfs_root))
+        except OSError:
+            return []
+        entries = []
+        for node in nodes:
+            device_dir = os.path.join(self.sysfs_root, node, 'device')
+            info = parse_uevent(_read_text(os.path.join(device_dir, 'uevent')))
+            if vendor_id and info['vendor_id'] != vendor_id:
+                continue
+            if product_id and info['product_id'] != product_id:
+                continue
+            interface = _read_text(os.path.join(os.path.realpath(device_dir), '..', 'bInterfaceNumber'))
+            info.update({
+                'path': os.path.join(self.dev_root, node).encode(),
+                'interface_number': int(interface, 16) if interface and info['bus'] == BUS_USB else -1,
+            })
+            del info['bus']
+            entries.append(info)
+        return entries
+
+    def device(self):
+        return HidrawDevice(self)
+
+    def acquire(self, path: bytes) -> int:
+        with self._lock:
+            fd = self._fds.get(path)
+            if fd is None:
+                fd = os.open(path, os.O_RDWR | getattr(os, 'O_CLOEXEC', 0))
+                self._fds[path] = fd
+            return fd
+
+    def discard(self, path: bytes):
+        with self._lock:
+            fd = self._fds.pop(path, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def close(self):
+        for path in list(self._fds):
+            self.discard(path)
+
+class HidrawDevice:
+    def __init__(self, backend: HidrawBackend):
+        self.backend = backend
+        self.path = None
+        self.fd = None
+
+    def open_path(self, path: bytes):
+        self.fd = self.backend.acquire(path)
+        self.path = path
+
+    def _call(self, request: int, buf: bytearray) -> int:
+        if self.fd is None:
+            raise IOError("device not open")
+        try:
+            return _ioctl(self.fd, request, buf)
+        except OSError:
+            # stale descriptor after an unplug; reopen on the next open_path
+            self.backend.discard(self.path)
+            self.fd = None
+            raise
+
+    def send_feature_report(self, data) -> int:
+        buf = bytearray(data)
+        return self._call(HIDIOCSFEATURE(len(buf)), buf)
+
+    def get_feature_report(self, report_id: int, length: int) -> list:
+        buf = bytearray(length)
+        buf[0] = report_id
+        count = self._call(HIDIOCGFEATURE(length), buf)
+        return list(buf[:count])
+
+    def close(self):
+        # descriptors stay cached in the backend so reopening is free
+        self.fd = None
+        self.path = None
+
+def benchmark(backend, path: bytes, report: bytes, iterations: int = 1000) -> dict:
+    report = b'\x00' + report
+    dev = backend.device()
+    start = time.perf_counter()
+    dev.open_path(path)
+    opened = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dev.send_feature_report(report)
+    sent = time.perf_counter() - start
+    dev.close()
+    return {'open_ms': opened * 1000, 'send_us': sent / iterations * 1e6}
+
+def main():
+    parser = argparse.ArgumentParser(description="Linux hidraw backend for Razer devices")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list')
+    bench = sub.add_parser('bench')
+    bench.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    backend = HidrawBackend()
+    entries = backend.enumerate(0x1532)
+    if args.command == 'list':
+        for e in entries:
+            print(f"{e['path'].decode()}: PID 0x{e['product_id']:04X} interface {e['interface_number']} "
+                  f"{e['product_string']} ({e['serial_number'] or 'no serial'})")
+        return
+    if not entries:
+        print("No Razer hidraw devices found.")
+        return
+    from razer_common import construct_brightness_query, default_led, get_transaction_id
+    target = entries[0]
+    pid = target['product_id']
+    report = construct_brightness_query(get_transaction_id(pid), default_led(pid))
+    try:
+        result = benchmark(backend, target['path'], report, args.iterations)
+    finally:
+        backend.close()
+    print(f"hidraw: open {result['open_ms']:.3f} ms, send {result['send_us']:.1f} us")
+    try:
+        import hid
+    except ImportError:
+        print("hidapi not installed, skipping comparison")
+        return
+    matches = [e for e in hid.enumerate(0x1532, pid)
+               if e.get('interface_number', -1) == target['interface_number']]
+    if not matches:
+        print("Device not visible through hidapi, skipping comparison")
+        return
+    result = benchmark(hid, matches[0]['path'], report, args.iterations)
+    print(f"hidapi: open {result['open_ms']:.3f} ms, send {result['send_us']:.1f} us")
+
+if __name__ == "__main__":
+    main()
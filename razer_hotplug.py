@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import threading
+
+from razer_common import scan_razer_devices, device_key
+from razer_health import get_health
+
+HOTPLUG_INTERVAL = 2.0
+
+class HotplugMonitor:
+    def __init__(self, on_added=None, on_removed=None, interval: float = HOTPLUG_INTERVAL,
+                 known_devices: list = None):
+        self.on_added = on_added
+        self.on_removed = on_removed
+        self.interval = interval
+        self.devices = {device_key(d): d for d in (known_devices or [])}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="razer-hotplug", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def poll(self):
+        current = {device_key(d): d for d in scan_razer_devices(probe=True)}
+        get_health().revalidate(iface['path'] for d in current.values() for iface in d['interfaces'])
+        added = [d for k, d in current.items() if k not in self.devices]
+        removed = [d for k, d in self.devices.items() if k not in current]
+        self.devices = current
+        for device in removed:
+            if self.on_removed:
+                self.on_removed(device)
+        for device in added:
+            if self.on_added:
+                self.on_added(device)
+        return added, removed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling devices: {e}")
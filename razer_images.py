@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+import argparse
+import functools
+import os
+import queue
+import sys
+import threading
+import time
+import numpy as np
+
+from PyQt5.QtGui import QImage, QImageReader
+
+DEFAULT_PREFETCH = 8
+DEFAULT_FPS = 30.0
+
+def _qimage_to_array(image: QImage) -> np.ndarray:
+    image = image.convertToFormat(QImage.Format_RGB888)
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    bits = image.constBits()
+    bits.setsize(height * stride)
+    data = np.frombuffer(bits, dtype=np.uint8).reshape(height, stride)
+    return data[:, :width * 3].reshape(height, width, 3).copy()
+
+def png_directory_frames(path: str):
+    names = sorted(n for n in os.listdir(path) if n.lower().endswith('.png'))
+    for name in names:
+        image = QImage(os.path.join(path, name))
+        if image.isNull():
+            print(f"Skipping unreadable image: {name}")
+            continue
+        yield _qimage_to_array(image), None
+
+def gif_frames(path: str):
+    reader = QImageReader(path)
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+        delay = reader.nextImageDelay()
+        yield _qimage_to_array(image), (delay / 1000.0 if delay > 0 else None)
+
+def raw_rgb_frames(stream, width: int, height: int):
+    size = width * height * 3
+    while True:
+        data = stream.read(size)
+        if len(data) < size:
+            break
+        yield np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3), None
+
+def _raw_file_frames(stream, width: int, height: int):
+    # the file is closed when the frames run out or the generator is closed
+    with stream:
+        yield from raw_rgb_frames(stream, width, height)
+
+def is_image_file(path: str) -> bool:
+    # Qt sniffs the header bytes, so a GIF is recognised whatever its name
+    return bool(QImageReader.imageFormat(path).size())
+
+def open_frame_source(source: str, width: int = None, height: int = None):
+    if source != '-':
+        if os.path.isdir(source):
+            return png_directory_frames(source)
+        if is_image_file(source) or not (width and height):
+            return gif_frames(source)
+    if not (width and height):
+        raise ValueError("Raw RGB streams need --size WIDTHxHEIGHT")
+    if source == '-':
+        return raw_rgb_frames(sys.stdin.buffer, width, height)
+    return _raw_file_frames(open(source, 'rb'), width, height)
+
+def _area_weights(src: int, dst: int) -> np.ndarray:
+    scale = src / dst
+    starts = np.arange(dst, dtype=np.float64)[:, None] * scale
+    pixels = np.arange(src, dtype=np.float64)[None, :]
+    overlap = np.clip(np.minimum(starts + scale, pixels + 1.0) - np.maximum(starts, pixels), 0.0, None)
+    return (overlap / scale).astype(np.float32)
+
+@functools.lru_cache(maxsize=16)
+def _resample_weights(src_h: int, src_w: int, rows: int, cols: int) -> tuple:
+    return _area_weights(src_h, rows), _area_weights(src_w, cols)
+
+@functools.lru_cache(maxsize=8)
+def gamma_table(gamma: float) -> np.ndarray:
+    table = np.round(255.0 * (np.arange(256) / 255.0) ** gamma).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+def resample_frame(image: np.ndarray, rows: int, cols: int, gamma: float = None) -> np.ndarray:
+    height, width = image.shape[:2]
+    wy, wx = _resample_weights(height, width, rows, cols)
+    vertical = (wy @ image.reshape(height, width * 3).astype(np.float32)).reshape(rows, width, 3)
+    area = np.einsum('rwc,kw->rkc', vertical, wx)
+    frame = (area + 0.5).astype(np.uint8)
+    if gamma:
+        frame = gamma_table(gamma)[frame]
+    return frame
+
+class FramePipeline:
+    def __init__(self, source, rows: int, cols: int, gamma: float = None,
+                 prefetch: int = DEFAULT_PREFETCH):
+        self.source = source
+        self.rows = rows
+        self.cols = cols
+        self.gamma = gamma
+        self.frames = queue.Queue(maxsize=prefetch)
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="razer-image-decoder", daemon=True)
+        self.underruns = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _produce(self):
+        try:
+            for image, delay in self.source:
+                frame = resample_frame(image, self.rows, self.cols, self.gamma)
+                while not self._stop.is_set():
+                    try:
+                        self.frames.put((frame, delay), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    break
+        except Exception as e:
+            print(f"Error decoding frames: {e}")
+        finally:
+            close = getattr(self.source, 'close', None)
+            if close is not None:
+                close()
+            self.finished.set()
+
+    def next_frame(self):
+        try:
+            return self.frames.get_nowait()
+        except queue.Empty:
+            if not self.finished.is_set():
+                self.underruns += 1
+            return None
+
+    def wait_ready(self, timeout: float = 2.0):
+        deadline = time.monotonic() + timeout
+        while self.frames.empty() and not self.finished.is_set() and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def exhausted(self) -> bool:
+        return self.finished.is_set() and self.frames.empty()
+
+def play(streamer, pipeline: FramePipeline, fps: float = DEFAULT_FPS):
+    streamer.session.open()
+    pipeline.wait_ready()
+    next_tick = time.monotonic()
+    while not pipeline.exhausted():
+        item = pipeline.next_frame()
+        period = 1.0 / fps
+        if item is not None:
+            frame, delay = item
+            np.copyto(streamer.frame, frame)
+            if delay:
+                period = delay
+        streamer.present()
+        next_tick += period
+        wait = next_tick - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        else:
+            next_tick = time.monotonic()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play images, GIFs or raw RGB frames on a Razer LED matrix")
+    parser.add_argument('source', help="Directory of PNGs, a GIF, a raw RGB file, or '-' for raw RGB on stdin")
+    parser.add_argument('--size', help="Raw RGB frame size as WIDTHxHEIGHT")
+    parser.add_argument('--fps', type=float, default=DEFAULT_FPS)
+    parser.add_argument('--gamma', type=float, default=None)
+    parser.add_argument('--prefetch', type=int, default=DEFAULT_PREFETCH)
+    args = parser.parse_args()
+
+    width = height = None
+    if args.size:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+
+    from razer_common import scan_razer_devices
+    from razer_stream import FrameStreamer
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    streamer = FrameStreamer(devices[0])
+    pipeline = FramePipeline(open_frame_source(args.source, width, height),
+                             streamer.rows, streamer.cols, args.gamma, args.prefetch).start()
+    try:
+        play(streamer, pipeline, args.fps)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipeline.stop()
+        streamer.close()
+        if pipeline.underruns:
+            print(f"Decoder underruns: {pipeline.underruns}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from razer_images import resample_frame
+from razer_stream import FrameStreamer, run_at_fps
+
+SCENE_SHAPE = (6, 22)
+SKEW_WINDOW = 256
+
+class SkewStats:
+    def __init__(self, window: int = SKEW_WINDOW):
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, skew: float):
+        self.samples[self.count % len(self.samples)] = skew
+        self.count += 1
+        self.max = max(self.max, skew)
+
+    def summary(self) -> dict:
+        recent = self.samples[:min(self.count, len(self.samples))]
+        if not len(recent):
+            return {'ticks': 0}
+        return {
+            'ticks': self.count,
+            'mean_ms': float(recent.mean() * 1000),
+            'p95_ms': float(np.percentile(recent, 95) * 1000),
+            'max_ms': self.max * 1000,
+        }
+
+class MultiDevicePresenter:
+    def __init__(self, devices: list, scene_shape: tuple = SCENE_SHAPE):
+        self.streamers = [FrameStreamer(device) for device in devices]
+        self.scene = np.zeros(scene_shape + (3,), dtype=np.uint8)
+        self.skew = SkewStats()
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self.streamers), 1),
+                                        thread_name_prefix="razer-present")
+
+    def open(self):
+        for streamer in self.streamers:
+            streamer.session.open()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        for streamer in self.streamers:
+            streamer.close()
+
+    def map_scene(self, scene: np.ndarray):
+        for streamer in self.streamers:
+            if streamer.shape == scene.shape[:2]:
+                np.copyto(streamer.frame, scene)
+            else:
+                np.copyto(streamer.frame, resample_frame(scene, streamer.rows, streamer.cols))
+
+    def _present_at(self, streamer: FrameStreamer, start_at: float) -> float:
+        delay = start_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        streamer.present()
+        return time.perf_counter()
+
+    def present(self, scene: np.ndarray = None) -> float:
+        self.map_scene(self.scene if scene is None else scene)
+        latencies = [s.session.latency or 0.0 for s in self.streamers]
+        slowest = max(latencies, default=0.0)
+        start = time.perf_counter()
+        futures = [self._pool.submit(self._present_at, s, start + slowest - latency)
+                   for s, latency in zip(self.streamers, latencies)]
+        finished = [f.result() for f in futures]
+        skew = max(finished) - min(finished) if finished else 0.0
+        self.skew.add(skew)
+        return skew
+
+    def run(self, render, fps: float = 30.0, duration: float = None):
+        self.open()
+        def tick(t):
+            np.copyto(self.scene, render(t, *self.scene.shape[:2]))
+            self.present()
+        run_at_fps(tick, fps, duration)
+
+def main():
+    from razer_effects import EFFECTS
+    parser = argparse.ArgumentParser(description="Drive several devices from one shared scene")
+    parser.add_argument('effect', nargs='?', choices=sorted(EFFECTS), default='spectrum')
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--duration', type=float, default=None)
+    parser.add_argument('--simulate', action='store_true', help="Use simulated HID devices")
+    args = parser.parse_args()
+
+    from razer_common import scan_razer_devices, set_hid_backend
+    if args.simulate:
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend())
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    presenter = MultiDevicePresenter(devices)
+    try:
+        presenter.run(EFFECTS[args.effect], args.fps, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        presenter.close()
+        stats = presenter.skew.summary()
+        if stats['ticks']:
+            print(f"Ticks: {stats['ticks']}, skew mean {stats['mean_ms']:.2f} ms, "
+                  f"p95 {stats['p95_ms']:.2f} ms, max {stats['max_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
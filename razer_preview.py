@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import argparse
+import threading
+import time
+import numpy as np
+
+from PyQt5.QtCore import QTimer, QRectF
+from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+VIRTUAL_SHAPE = (6, 22)
+REPAINT_INTERVAL_MS = 16
+KEY_GAP = 0.12
+
+class StreamWorker:
+    def __init__(self, render, streamer=None, fps: float = 30.0, shape: tuple = VIRTUAL_SHAPE):
+        self.render = render
+        self.streamer = streamer
+        self.fps = fps
+        shape = streamer.shape if streamer is not None else shape
+        self._frame = np.zeros(shape + (3,), dtype=np.uint8)
+        self._lock = threading.Lock()
+        self.frames = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def shape(self) -> tuple:
+        return self._frame.shape
+
+    def snapshot(self, out: np.ndarray) -> np.ndarray:
+        with self._lock:
+            np.copyto(out, self._frame)
+        return out
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="razer-preview", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.streamer is not None:
+            self.streamer.close()
+
+    def _run(self):
+        period = 1.0 / self.fps
+        start = time.monotonic()
+        next_tick = start
+        while not self._stop.is_set():
+            frame = self.render(time.monotonic() - start)
+            if self.streamer is not None:
+                self.streamer.write_frame(frame)
+                # publish the calibrated frame the device was sent, once per tick
+                frame = self.streamer.sent_frame
+            with self._lock:
+                np.copyto(self._frame, frame, casting='unsafe')
+            self.frames += 1
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.monotonic()
+
+class FramePreview(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = None
+        self._seen = -1
+        self._buffer = np.zeros(VIRTUAL_SHAPE + (3,), dtype=np.uint8)
+        self.setMinimumSize(220, 60)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._timer = QTimer(self)
+        self._timer.setInterval(REPAINT_INTERVAL_MS)
+        self._timer.timeout.connect(self._poll)
+        self._timer.start()
+
+    def set_source(self, source):
+        self.source = source
+        self._seen = -1
+        self.update()
+
+    def _poll(self):
+        if self.source is not None and self.source.frames != self._seen:
+            self._seen = self.source.frames
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(20, 20, 20))
+        if self.source is None:
+            return
+        if self._buffer.shape != self.source.shape:
+            self._buffer = np.zeros(self.source.shape, dtype=np.uint8)
+        self.source.snapshot(self._buffer)
+        rows, cols = self._buffer.shape[:2]
+        image = QImage(self._buffer.data, cols, rows, cols * 3, QImage.Format_RGB888)
+        cell = min(self.width() / cols, self.height() / rows)
+        left = (self.width() - cell * cols) / 2
+        top = (self.height() - cell * rows) / 2
+        painter.drawImage(QRectF(left, top, cell * cols, cell * rows), image)
+        # key gaps drawn over the scaled image so each LED reads as a separate key
+        painter.setPen(QPen(QColor(20, 20, 20), max(1.0, cell * KEY_GAP)))
+        for col in range(cols + 1):
+            x = left + col * cell
+            painter.drawLine(int(x), int(top), int(x), int(top + rows * cell))
+        for row in range(rows + 1):
+            y = top + row * cell
+            painter.drawLine(int(left), int(y), int(left + cols * cell), int(y))
+
+    def stop(self):
+        self._timer.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview an effect, optionally while streaming it")
+    parser.add_argument('effect', nargs='?', default='spectrum')
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--virtual', action='store_true', help="Preview only, do not send to a device")
+    parser.add_argument('--simulate', action='store_true', help="Use simulated HID devices")
+    args = parser.parse_args()
+
+    import sys
+    from PyQt5.QtWidgets import QApplication
+    from razer_common import scan_razer_devices, set_hid_backend
+    from razer_effects import make_renderer
+    from razer_stream import FrameStreamer
+    if args.simulate:
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend())
+    app = QApplication(sys.argv)
+    devices = [] if args.virtual else scan_razer_devices()
+    streamer = FrameStreamer(devices[0]) if devices else None
+    shape = streamer.shape if streamer is not None else VIRTUAL_SHAPE
+    worker = StreamWorker(make_renderer(args.effect, *shape), streamer, args.fps, shape).start()
+    preview = FramePreview()
+    preview.setWindowTitle(f"Preview: {devices[0]['name'] if devices else 'virtual keyboard'}")
+    preview.set_source(worker)
+    preview.resize(660, 180)
+    preview.show()
+    try:
+        app.exec_()
+    finally:
+        worker.stop()
+
+if __name__ == "__main__":
+    main()
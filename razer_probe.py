@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from razer_common import (
+    REPORT_LEN,
+    RESPONSE_DELAY,
+    STATUS_SUCCESS,
+    FIRMWARE_CMD_ID,
+    FIRMWARE_DATA_SIZE,
+    SERIAL_CMD_ID,
+    SERIAL_DATA_SIZE,
+    construct_info_query,
+    get_hid_backend,
+    settle_after_open,
+)
+from razer_health import get_health
+
+PROBE_TIMEOUT = 0.5
+PROBE_WORKERS = 16
+MISSING_SERIALS = ('', 'N/A')
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def _query(dev, report: bytes):
+    if dev.send_feature_report(b'\x00' + report) != REPORT_LEN + 1:
+        return None
+    time.sleep(RESPONSE_DELAY)
+    response = bytes(dev.get_feature_report(0x00, REPORT_LEN + 1))[1:]
+    if len(response) == REPORT_LEN and response[0] == STATUS_SUCCESS and response[6:8] == report[6:8]:
+        return response
+    return None
+
+def probe_interface(path: bytes, transaction_id: int) -> dict:
+    health = get_health()
+    if not health.allow(path):
+        return None
+    info = {}
+    try:
+        dev = get_hid_backend().device()
+        dev.open_path(path)
+        try:
+            settle_after_open()
+            response = _query(dev, construct_info_query(transaction_id, SERIAL_CMD_ID, SERIAL_DATA_SIZE))
+            if response is not None:
+                info['serial'] = response[8:8 + SERIAL_DATA_SIZE].split(b'\x00')[0].decode('ascii', 'replace').strip()
+            response = _query(dev, construct_info_query(transaction_id, FIRMWARE_CMD_ID, FIRMWARE_DATA_SIZE))
+            if response is not None:
+                info['firmware'] = f"v{response[8]}.{response[9]}"
+        finally:
+            dev.close()
+    except Exception as e:
+        health.record_failure(path, e)
+        print(f"Error probing interface {path}: {e}")
+        return None
+    # settles a half-open trial either way so the send path is not locked out afterwards
+    if not info:
+        health.record_failure(path)
+        return None
+    health.record_success(path)
+    return info
+
+def _regroup(device: dict, results: dict) -> list:
+    serials = {}
+    for iface in device['interfaces']:
+        serial = results.get(iface['path'], {}).get('serial')
+        serials.setdefault(serial or None, []).append(iface)
+    known = [s for s in serials if s]
+    if device['serial'] not in MISSING_SERIALS or len(known) <= 1:
+        # interfaces that did not answer stay with the device they were enumerated with
+        merged = dict(device)
+        if device['serial'] in MISSING_SERIALS and known:
+            merged['serial'] = known[0]
+        return [merged]
+    groups = []
+    for serial in known:
+        group = dict(device, serial=serial, interfaces=list(serials[serial]))
+        groups.append(group)
+    groups[0]['interfaces'].extend(serials.get(None, []))
+    return groups
+
+def _cache_result(path: bytes, future):
+    # late probes still land in the cache so the next scan does not wait for them again
+    if future.cancelled() or future.exception() is not None:
+        return
+    info = future.result()
+    if info is not None:
+        with _cache_lock:
+            _cache[path] = info
+
+def probe_devices(devices: list, timeout: float = PROBE_TIMEOUT, use_cache: bool = True) -> list:
+    paths = {iface['path']: device['transaction_id'] for device in devices for iface in device['interfaces']}
+    with _cache_lock:
+        for path in [p for p in _cache if p not in paths]:
+            del _cache[path]
+        results = {p: _cache[p] for p in paths if use_cache and p in _cache}
+    pending = {p: t for p, t in paths.items() if p not in results}
+    if pending:
+        pool = ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(pending)), thread_name_prefix="razer-probe")
+        futures = {pool.submit(probe_interface, p, t): p for p, t in pending.items()}
+        for future, path in futures.items():
+            future.add_done_callback(functools.partial(_cache_result, path))
+        done, _ = wait(futures, timeout=timeout)
+        # stragglers finish in the background and are simply not waited for
+        pool.shutdown(wait=False)
+        for future in done:
+            info = future.result()
+            if info is not None:
+                results[futures[future]] = info
+    probed = []
+    for device in devices:
+        for group in _regroup(device, results):
+            firmware = [results[i['path']]['firmware'] for i in group['interfaces']
+                        if 'firmware' in results.get(i['path'], {})]
+            group['firmware'] = firmware[0] if firmware else None
+            group['probed'] = any(i['path'] in results for i in group['interfaces'])
+            probed.append(group)
+    return probed
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
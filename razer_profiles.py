@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import mmap
+import os
+import struct
+
+from razer_common import (
+    REPORT_LEN,
+    EFFECT_CODES,
+    construct_effect_report,
+    construct_brightness_report,
+    construct_dpi_report,
+    construct_dpi_stages_report,
+    construct_polling_rate_reports,
+    construct_frame_row_report,
+    construct_custom_effect_report,
+    construct_zone_reports,
+    default_led,
+    send_reports_to_device,
+    validate_dpi,
+)
+
+PROFILE_MAGIC = b'RZPR'
+PROFILE_VERSION = 1
+# magic, version, reserved, entry count
+PROFILE_HEADER = struct.Struct('<4sHHI')
+# pid, serial length, report count, reserved, params length
+ENTRY_HEADER = struct.Struct('<HHHHI')
+PROFILE_SUFFIX = '.rzp'
+PROFILE_DIR = os.path.expanduser("~/Library/Application Support/Open Razer macOS Control/profiles")
+
+def profile_path(name: str) -> str:
+    return os.path.join(PROFILE_DIR, name + PROFILE_SUFFIX)
+
+def list_profiles() -> list:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted(n[:-len(PROFILE_SUFFIX)] for n in os.listdir(PROFILE_DIR) if n.endswith(PROFILE_SUFFIX))
+
+def compile_settings(device: dict, settings: dict) -> list:
+    transaction_id = device['transaction_id']
+    led_id = default_led(device['pid'])
+    reports = []
+    if 'brightness' in settings:
+        reports.append(construct_brightness_report(transaction_id, led_id, int(settings['brightness'])))
+    if 'effect' in settings:
+        effect = settings['effect']
+        if effect['name'] not in EFFECT_CODES:
+            raise ValueError(f"Unknown effect: {effect['name']}")
+        for zone in effect.get('zones') or [led_id]:
+            reports.append(construct_effect_report(device, EFFECT_CODES[effect['name']],
+                                                   effect.get('params', []), zone))
+    if 'zones' in settings:
+        reports.extend(construct_zone_reports(device, settings['zones']))
+    if 'dpi' in settings:
+        dpi_x, dpi_y = settings['dpi']
+        reports.append(construct_dpi_report(transaction_id, validate_dpi(dpi_x), validate_dpi(dpi_y)))
+    if 'dpi_stages' in settings:
+        stages = settings['dpi_stages']
+        reports.append(construct_dpi_stages_report(transaction_id, [(int(x), int(y)) for x, y in stages['stages']],
+                                                   int(stages.get('active', 1))))
+    if 'polling_rate' in settings:
+        reports.extend(construct_polling_rate_reports(device, int(settings['polling_rate'])))
+    if 'frame' in settings:
+        calibration = device.get('calibration')
+        for row, rgb in enumerate(settings['frame']):
+            rgb = bytes.fromhex(rgb)
+            if calibration is not None:
+                rgb = bytes(calibration.apply_color(rgb))
+            reports.append(construct_frame_row_report(transaction_id, row, rgb))
+        reports.append(construct_custom_effect_report(transaction_id))
+    return reports
+
+def save_profile(path: str, devices_settings: list):
+    blobs = []
+    for device, settings in devices_settings:
+        reports = compile_settings(device, settings)
+        serial = (device.get('serial') or 'N/A').encode()
+        params = json.dumps({'name': device.get('name'), 'settings': settings},
+                            separators=(',', ':')).encode()
+        blobs.append(ENTRY_HEADER.pack(device['pid'], len(serial), len(reports), 0, len(params)))
+        blobs.extend([serial, params])
+        blobs.extend(reports)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PROFILE_HEADER.pack(PROFILE_MAGIC, PROFILE_VERSION, 0, len(devices_settings)))
+        f.write(b''.join(blobs))
+    os.replace(tmp_path, path)
+
+class ProfileEntry:
+    def __init__(self, pid: int, serial: str, params: memoryview, reports: list):
+        self.pid = pid
+        self.serial = serial
+        self._params = params
+        self.reports = reports
+
+    @property
+    def params(self) -> dict:
+        return json.loads(bytes(self._params))
+
+    @property
+    def settings(self) -> dict:
+        return self.params.get('settings', {})
+
+class Profile:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.entries = []
+        self._views = []
+        try:
+            self._parse()
+        except ValueError:
+            self.close()
+            raise
+
+    def _parse(self):
+        view = memoryview(self.map)
+        self._views.append(view)
+        try:
+            magic, version, _, count = PROFILE_HEADER.unpack_from(view, 0)
+        except struct.error:
+            raise ValueError(f"Truncated profile header: {self.path}")
+        if magic != PROFILE_MAGIC:
+            raise ValueError(f"Not a profile file: {self.path}")
+        if version != PROFILE_VERSION:
+            raise ValueError(f"Unsupported profile version {version}: {self.path}")
+        offset = PROFILE_HEADER.size
+        for _ in range(count):
+            if offset + ENTRY_HEADER.size > len(view):
+                raise ValueError(f"Truncated profile: {self.path}")
+            pid, serial_len, report_count, _, params_len = ENTRY_HEADER.unpack_from(view, offset)
+            offset += ENTRY_HEADER.size
+            end = offset + serial_len + params_len + report_count * REPORT_LEN
+            if end > len(view):
+                raise ValueError(f"Truncated profile: {self.path}")
+            serial = bytes(view[offset:offset + serial_len]).decode(errors='replace')
+            offset += serial_len
+            params = view[offset:offset + params_len]
+            offset += params_len
+            reports = [view[o:o + REPORT_LEN] for o in range(offset, end, REPORT_LEN)]
+            self._views.append(params)
+            self._views.extend(reports)
+            offset = end
+            self.entries.append(ProfileEntry(pid, serial, params, reports))
+
+    def entry_for(self, device: dict):
+        fallback = None
+        for entry in self.entries:
+            if entry.pid != device['pid']:
+                continue
+            if entry.serial == device.get('serial'):
+                return entry
+            fallback = fallback or entry
+        return fallback
+
+    def close(self):
+        # the map cannot close while any view into it is alive, so entries stop working from here on
+        self.entries = []
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def apply_profile(profile: Profile, devices: list) -> dict:
+    results = {}
+    for device in devices:
+        entry = profile.entry_for(device)
+        if entry is not None and entry.reports:
+            results[device['name']] = send_reports_to_device(device, entry.reports, "Profile")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage and apply lighting profiles")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list')
+    show = sub.add_parser('show')
+    show.add_argument('name')
+    apply_cmd = sub.add_parser('apply')
+    apply_cmd.add_argument('name')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for name in list_profiles():
+            print(name)
+        return
+    with Profile(profile_path(args.name)) as profile:
+        if args.command == 'show':
+            for entry in profile.entries:
+                print(f"PID 0x{entry.pid:04X} serial {entry.serial}: {len(entry.reports)} reports, "
+                      f"{json.dumps(entry.settings)}")
+            return
+        from razer_common import scan_razer_devices
+        for name, ok in apply_profile(profile, scan_razer_devices()).items():
+            print(f"{name}: {'applied' if ok else 'failed'}")
+
+if __name__ == "__main__":
+    main()
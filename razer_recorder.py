@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import struct
+import threading
+import time
+import numpy as np
+
+TRACE_MAGIC = b'RZTR'
+TRACE_VERSION = 2
+# magic, version, reserved, wall clock start (ns)
+TRACE_HEADER = struct.Struct('<4sHHQ')
+# time since start (ns), call duration (ns), event, handle, payload length
+RECORD_HEADER = struct.Struct('<QIBIH')
+# version 1 stored the handle in one byte, which wrapped after 256 opens
+RECORD_HEADERS = {1: struct.Struct('<QIBBH'), TRACE_VERSION: RECORD_HEADER}
+# product id, followed by the path bytes
+OPEN_HEADER = struct.Struct('<H')
+EVENT_OPEN = 1
+EVENT_SEND = 2
+EVENT_RECV = 3
+EVENT_CLOSE = 4
+EVENT_NAMES = {EVENT_OPEN: 'open', EVENT_SEND: 'send', EVENT_RECV: 'recv', EVENT_CLOSE: 'close'}
+WRITE_BUFFER = 1 << 16
+
+class TraceWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'wb', buffering=WRITE_BUFFER)
+        self._file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, time.time_ns()))
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def now(self) -> int:
+        return time.perf_counter_ns()
+
+    def write(self, started: int, event: int, handle: int, payload: bytes = b''):
+        finished = time.perf_counter_ns()
+        header = RECORD_HEADER.pack(started - self._origin, min(finished - started, 0xFFFFFFFF),
+                                    event, handle & 0xFFFFFFFF, len(payload))
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(header)
+            self._file.write(payload)
+            self.records += 1
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+class RecordingHidBackend:
+    def __init__(self, backend, path: str):
+        self.backend = backend
+        self.writer = TraceWriter(path)
+        self._pids = {}
+        self._handles = 0
+        self._lock = threading.Lock()
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0) -> list:
+        entries = self.backend.enumerate(vendor_id, product_id)
+        for entry in entries:
+            self._pids[entry['path']] = entry['product_id']
+        return entries
+
+    def device(self):
+        with self._lock:
+            self._handles += 1
+            handle = self._handles
+        return RecordingDevice(self, self.backend.device(), handle)
+
+    def close(self):
+        self.writer.close()
+
+class RecordingDevice:
+    def __init__(self, recorder: RecordingHidBackend, device, handle: int):
+        self.recorder = recorder
+        self.device = device
+        self.handle = handle
+
+    def open_path(self, path: bytes):
+        writer = self.recorder.writer
+        started = writer.now()
+        self.device.open_path(path)
+        pid = self.recorder._pids.get(path, 0)
+        writer.write(started, EVENT_OPEN, self.handle, OPEN_HEADER.pack(pid) + bytes(path))
+
+    def send_feature_report(self, data) -> int:
+        writer = self.recorder.writer
+        started = writer.now()
+        written = self.device.send_feature_report(data)
+        writer.write(started, EVENT_SEND, self.handle, bytes(data))
+        return written
+
+    def get_feature_report(self, report_id: int, length: int) -> list:
+        writer = self.recorder.writer
+        started = writer.now()
+        response = self.device.get_feature_report(report_id, length)
+        writer.write(started, EVENT_RECV, self.handle, bytes(response))
+        return response
+
+    def close(self):
+        writer = self.recorder.writer
+        started = writer.now()
+        self.device.close()
+        writer.write(started, EVENT_CLOSE, self.handle)
+
+class TraceRecord:
+    __slots__ = ('time', 'duration', 'event', 'handle', 'payload')
+
+    def __init__(self, time_ns: int, duration_ns: int, event: int, handle: int, payload: memoryview):
+        self.time = time_ns / 1e9
+        self.duration = duration_ns / 1e9
+        self.event = event
+        self.handle = handle
+        self.payload = payload
+
+    @property
+    def path(self) -> bytes:
+        return bytes(self.payload[OPEN_HEADER.size:])
+
+    @property
+    def pid(self) -> int:
+        return OPEN_HEADER.unpack_from(self.payload)[0]
+
+def read_trace(path: str) -> list:
+    with open(path, 'rb') as f:
+        data = memoryview(f.read())
+    magic, version, _, _ = TRACE_HEADER.unpack_from(data, 0)
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"Not a HID trace: {path}")
+    if version not in RECORD_HEADERS:
+        raise ValueError(f"Unsupported trace version {version}: {path}")
+    record_header = RECORD_HEADERS[version]
+    records = []
+    offset = TRACE_HEADER.size
+    while offset + record_header.size <= len(data):
+        time_ns, duration_ns, event, handle, length = record_header.unpack_from(data, offset)
+        offset += record_header.size
+        if offset + length > len(data):
+            break
+        records.append(TraceRecord(time_ns, duration_ns, event, handle, data[offset:offset + length]))
+        offset += length
+    return records
+
+def latency_summary(durations) -> dict:
+    durations = np.asarray(durations, dtype=np.float64)
+    if not len(durations):
+        return {'count': 0}
+    return {
+        'count': len(durations),
+        'mean_ms': float(durations.mean() * 1000),
+        'p50_ms': float(np.percentile(durations, 50) * 1000),
+        'p95_ms': float(np.percentile(durations, 95) * 1000),
+        'p99_ms': float(np.percentile(durations, 99) * 1000),
+        'max_ms': float(durations.max() * 1000),
+    }
+
+def trace_stats(records: list) -> dict:
+    sends = [r for r in records if r.event == EVENT_SEND]
+    span = records[-1].time - records[0].time if records else 0.0
+    return {
+        'records': len(records),
+        'span_s': span,
+        'throughput': len(sends) / span if span > 0 else 0.0,
+        'send': latency_summary([r.duration for r in sends]),
+        'recv': latency_summary([r.duration for r in records if r.event == EVENT_RECV]),
+    }
+
+def map_paths(records: list, backend) -> dict:
+    available = {}
+    for entry in backend.enumerate():
+        available.setdefault(entry['product_id'], []).append(entry['path'])
+    known = {path for paths in available.values() for path in paths}
+    mapping = {}
+    for record in records:
+        if record.event != EVENT_OPEN or record.path in mapping:
+            continue
+        if record.path in known:
+            mapping[record.path] = record.path
+        elif available.get(record.pid):
+            mapping[record.path] = available[record.pid].pop(0)
+    return mapping
+
+def replay(records: list, backend, realtime: bool = True) -> dict:
+    mapping = map_paths(records, backend)
+    handles = {}
+    sends = []
+    recvs = []
+    failures = 0
+    start = time.perf_counter()
+    first = records[0].time if records else 0.0
+    for record in records:
+        if realtime:
+            delay = start + (record.time - first) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        dev = handles.get(record.handle)
+        try:
+            if record.event == EVENT_OPEN:
+                if record.path not in mapping:
+                    failures += 1
+                    continue
+                dev = backend.device()
+                dev.open_path(mapping[record.path])
+                handles[record.handle] = dev
+            elif dev is None:
+                continue
+            elif record.event == EVENT_SEND:
+                data = bytes(record.payload)
+                t0 = time.perf_counter()
+                if dev.send_feature_report(data) != len(data):
+                    failures += 1
+                sends.append(time.perf_counter() - t0)
+            elif record.event == EVENT_RECV:
+                t0 = time.perf_counter()
+                dev.get_feature_report(record.payload[0] if len(record.payload) else 0, len(record.payload))
+                recvs.append(time.perf_counter() - t0)
+            elif record.event == EVENT_CLOSE:
+                dev.close()
+                del handles[record.handle]
+        except Exception as e:
+            failures += 1
+            print(f"Replay error on handle {record.handle}: {e}")
+    for dev in handles.values():
+        dev.close()
+    elapsed = time.perf_counter() - start
+    return {
+        'elapsed_s': elapsed,
+        'throughput': len(sends) / elapsed if elapsed > 0 else 0.0,
+        'failures': failures,
+        'send': latency_summary(sends),
+        'recv': latency_summary(recvs),
+    }
+
+def enable_recording(path: str) -> RecordingHidBackend:
+    from razer_common import get_hid_backend, set_hid_backend
+    from razer_tracing import untraced
+    # record beneath the tracing layer; set_hid_backend adds it back on top
+    recorder = RecordingHidBackend(untraced(get_hid_backend()), path)
+    set_hid_backend(recorder)
+    return recorder
+
+def benchmark(iterations: int = 20000) -> tuple:
+    from razer_sim import SimulatedHidBackend
+    import tempfile
+    backend = SimulatedHidBackend(pids=(0x024E,), write_latency=0.0)
+    report = bytes(91)
+    def run(target):
+        dev = target.device()
+        dev.open_path(target.enumerate()[0]['path'])
+        start = time.perf_counter()
+        for _ in range(iterations):
+            dev.send_feature_report(report)
+        elapsed = time.perf_counter() - start
+        dev.close()
+        return elapsed / iterations
+    plain = run(backend)
+    fd, path = tempfile.mkstemp(suffix='.rztrace')
+    os.close(fd)
+    recorder = RecordingHidBackend(backend, path)
+    try:
+        recorded = run(recorder)
+    finally:
+        recorder.close()
+        os.remove(path)
+    return plain, recorded
+
+def _print_summary(title: str, stats: dict):
+    if not stats.get('count'):
+        return
+    print(f"{title}: {stats['count']} calls, mean {stats['mean_ms']:.3f} ms, p50 {stats['p50_ms']:.3f} ms, "
+          f"p95 {stats['p95_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms, max {stats['max_ms']:.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay recorded HID traffic")
+    sub = parser.add_subparsers(dest='command', required=True)
+    dump = sub.add_parser('dump')
+    dump.add_argument('trace')
+    stats = sub.add_parser('stats')
+    stats.add_argument('trace')
+    replay_cmd = sub.add_parser('replay')
+    replay_cmd.add_argument('trace')
+    replay_cmd.add_argument('--max-speed', action='store_true', help="Ignore original timing")
+    replay_cmd.add_argument('--simulate', action='store_true', help="Replay against simulated HID devices")
+    sub.add_parser('bench')
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        plain, recorded = benchmark()
+        print(f"send_feature_report: {plain * 1e6:.2f} us plain, {recorded * 1e6:.2f} us recorded "
+              f"(+{(recorded - plain) * 1e6:.2f} us)")
+        return
+    records = read_trace(args.trace)
+    if args.command == 'dump':
+        for r in records:
+            if r.event == EVENT_OPEN:
+                detail = f"pid 0x{r.pid:04X} {r.path.decode(errors='replace')}"
+            else:
+                detail = bytes(r.payload[:16]).hex()
+            print(f"{r.time:12.6f} {r.duration * 1000:8.3f} ms #{r.handle:<3} {EVENT_NAMES.get(r.event, '?'):5} {detail}")
+        return
+    if args.command == 'stats':
+        result = trace_stats(records)
+        print(f"{result['records']} records over {result['span_s']:.3f}s, {result['throughput']:.1f} reports/s")
+    else:
+        if args.simulate:
+            from razer_sim import SimulatedHidBackend
+            pids = sorted({r.pid for r in records if r.event == EVENT_OPEN})
+            backend = SimulatedHidBackend(pids=pids or (0x024E,))
+        else:
+            from razer_common import get_hid_backend
+            backend = get_hid_backend()
+        result = replay(records, backend, realtime=not args.max_speed)
+        print(f"Replayed in {result['elapsed_s']:.3f}s, {result['throughput']:.1f} reports/s, "
+              f"{result['failures']} failures")
+    _print_summary("send", result['send'])
+    _print_summary("recv", result['recv'])
+
+if __name__ == "__main__":
+    main()
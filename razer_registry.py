@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+from razer_common import (
+    EFFECT_CODES,
+    construct_effect_report,
+    get_device_type,
+    get_led_zones,
+)
+
+class Param:
+    def __init__(self, name: str, label: str, default: int = 0, minimum: int = 0, maximum: int = 255,
+                 choices: list = None):
+        self.name = name
+        self.label = label
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+
+def color_params(prefix: str, label: str, default: tuple) -> list:
+    return [Param(f"{prefix}_{c}", f"{label}{name}:", value)
+            for c, name, value in zip('rgb', ('Red', 'Green', 'Blue'), default)]
+
+class EffectSpec:
+    def __init__(self, name: str, title: str, params: list, build, device_types: tuple,
+                 button: str = None, fade: bool = False):
+        self.name = name
+        self.title = title
+        self.code = EFFECT_CODES[name]
+        self.params = params
+        self.build = build
+        self.device_types = device_types
+        self.button = button or f"Send {title} Effect"
+        self.fade = fade
+
+    def defaults(self) -> dict:
+        return {p.name: p.default for p in self.params}
+
+    def supports(self, device: dict) -> bool:
+        device_type = get_device_type(device['pid'])
+        if device_type in self.device_types:
+            return True
+        return 'accessory' in self.device_types and bool(get_led_zones(device['pid']))
+
+    def reports(self, device: dict, values: dict, led_ids: list) -> list:
+        extra = self.build(values)
+        return [construct_effect_report(device, self.code, extra, led_id) for led_id in led_ids]
+
+def _rgb(values: dict, prefix: str) -> list:
+    return [values[f"{prefix}_r"], values[f"{prefix}_g"], values[f"{prefix}_b"]]
+
+EFFECT_REGISTRY = [
+    EffectSpec('static', "Static", color_params('color', "", (255, 255, 255)),
+               lambda v: _rgb(v, 'color'),
+               ('mouse', 'keyboard', 'accessory'), fade=True),
+    EffectSpec('breathing', "Breathing",
+               color_params('base', "Base ", (255, 255, 255)) + color_params('extra', "Breathing ", (0, 0, 0))
+               + [Param('speed', "Speed:", 128)],
+               lambda v: _rgb(v, 'base') + _rgb(v, 'extra') + [v['speed']],
+               ('mouse', 'keyboard', 'accessory')),
+    EffectSpec('wave', "Wave",
+               [Param('speed', "Speed:", 128), Param('direction', "Direction:", 0, choices=["Left -> Right", "Right -> Left"])],
+               lambda v: [v['speed'], v['direction']],
+               ('mouse', 'keyboard')),
+    EffectSpec('reactive', "Reactive",
+               color_params('color', "Reaction ", (255, 255, 255)) + [Param('duration', "Duration:", 50)],
+               lambda v: _rgb(v, 'color') + [v['duration']],
+               ('mouse', 'keyboard')),
+    EffectSpec('none', "Reset", [], lambda v: [],
+               ('mouse', 'keyboard', 'accessory'), button="Reset Effect"),
+]
+EFFECTS_BY_NAME = {spec.name: spec for spec in EFFECT_REGISTRY}
+
+def register_effect(spec: EffectSpec):
+    EFFECT_REGISTRY.append(spec)
+    EFFECTS_BY_NAME[spec.name] = spec
+
+def effects_for_device(device: dict) -> list:
+    return [spec for spec in EFFECT_REGISTRY if spec.supports(device)]
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import struct
+import threading
+import time
+
+from razer_common import (
+    MATRIX_CMD_CLASS,
+    MATRIX_EFFECT_CMD_ID,
+    MATRIX_FRAME_CMD_ID,
+    KBD_EFFECT_CUSTOM,
+    calculate_crc,
+    device_key,
+    send_reports_to_device,
+)
+from razer_profiles import PROFILE_SUFFIX, Profile, compile_settings, profile_path
+from razer_state import StateJournal, report_slot
+
+RELOAD_INTERVAL = 0.5
+SOURCE_SUFFIX = '.json'
+LATENCY_HISTORY = 100
+
+def _signature(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _match(entries: list, device: dict):
+    fallback = None
+    for pid, serial, value in entries:
+        if pid != device['pid']:
+            continue
+        if serial == device.get('serial'):
+            return value
+        fallback = fallback or value
+    return fallback
+
+def load_profile_reports(path: str, devices: list) -> dict:
+    # raises ValueError for anything that should not reach the devices
+    if path.endswith(SOURCE_SUFFIX):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        entries = [(int(e['pid'], 16) if isinstance(e['pid'], str) else int(e['pid']), e.get('serial'),
+                    e.get('settings', {}))
+                   for e in data.get('devices', [])]
+        targets = {}
+        for device in devices:
+            settings = _match(entries, device)
+            if settings is not None:
+                targets[device_key(device)] = compile_settings(device, settings)
+        return targets
+    with Profile(path) as profile:
+        targets = {}
+        for device in devices:
+            entry = profile.entry_for(device)
+            if entry is None:
+                continue
+            reports = [bytes(r) for r in entry.reports]
+            for report in reports:
+                if calculate_crc(report) != report[88]:
+                    raise ValueError(f"Bad report checksum in {path}")
+            targets[device_key(device)] = reports
+        return targets
+
+def _is_frame_row(report) -> bool:
+    return report[6] == MATRIX_CMD_CLASS and report[7] == MATRIX_FRAME_CMD_ID
+
+def _is_effect(report) -> bool:
+    return report[6] == MATRIX_CMD_CLASS and report[7] == MATRIX_EFFECT_CMD_ID
+
+def _is_custom_apply(report) -> bool:
+    return _is_effect(report) and report[10] == KBD_EFFECT_CUSTOM
+
+def diff_reports(current: dict, reports: list) -> list:
+    changes = [r for r in reports if current.get(report_slot(r)) != r]
+    effects = [r for r in reports if _is_effect(r)]
+    if not effects:
+        return changes
+    # effects on different LEDs still replace each other on the device, so the slot diff alone
+    # misses switching back to an effect that was sent before; compare with the last one sent
+    active = [r for r in current.values() if _is_effect(r)]
+    switched = not active or active[-1] != effects[-1]
+    if switched and _is_custom_apply(effects[-1]):
+        # the frame buffer is not guaranteed to survive another effect
+        changes = [r for r in reports if _is_frame_row(r) or r in changes]
+    if switched or any(_is_frame_row(r) for r in changes):
+        # rows only fill the frame buffer; the effect has to be applied again to show them
+        changes = [r for r in changes if not _is_effect(r)] + effects
+    return changes
+
+class ProfileWatcher:
+    def __init__(self, devices, journal: StateJournal, interval: float = RELOAD_INTERVAL, on_reload=None):
+        self.devices = devices if callable(devices) else (lambda: devices)
+        self.journal = journal
+        self.interval = interval
+        self.on_reload = on_reload
+        self.watched = {}
+        self.latencies = []
+        self.metrics = {'polls': 0, 'reloads': 0, 'rejected': 0, 'reports_sent': 0, 'reports_skipped': 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, path: str, apply_now: bool = False):
+        with self._lock:
+            self.watched[path] = None if apply_now else _signature(path)
+
+    def unwatch(self, path: str):
+        with self._lock:
+            self.watched.pop(path, None)
+
+    def poll(self) -> list:
+        self.metrics['polls'] += 1
+        with self._lock:
+            changed = [(p, s) for p, s in ((p, _signature(p)) for p in self.watched)
+                       if s is not None and s != self.watched[p]]
+        results = []
+        for path, signature in changed:
+            try:
+                results.append(self.reload(path, signature))
+            finally:
+                # a path whose reload never ran keeps its old signature and is retried next poll
+                with self._lock:
+                    if path in self.watched:
+                        self.watched[path] = signature
+        return results
+
+    def reload(self, path: str, signature=None) -> dict:
+        detected = time.perf_counter()
+        devices = self.devices()
+        try:
+            targets = load_profile_reports(path, devices)
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            self.metrics['rejected'] += 1
+            print(f"Rejected edit to {path}, keeping current lighting: {e}")
+            return {'path': path, 'ok': False, 'error': str(e)}
+        parsed = time.perf_counter()
+        sent = skipped = 0
+        ok = True
+        for device in devices:
+            key = device_key(device)
+            if key not in targets:
+                continue
+            current = {report_slot(r): r for r in self.journal.reports_for(device)}
+            changes = diff_reports(current, targets[key])
+            skipped += len(targets[key]) - len(changes)
+            if changes:
+                ok = send_reports_to_device(device, changes, "Profile Reload") and ok
+                sent += len(changes)
+        done = time.perf_counter()
+        result = {
+            'path': path,
+            'ok': ok,
+            'sent': sent,
+            'skipped': skipped,
+            'parse_ms': (parsed - detected) * 1000,
+            'apply_ms': (done - parsed) * 1000,
+            'latency_ms': (done - detected) * 1000,
+        }
+        if signature is not None:
+            # includes the polling delay: time from the file being written to the lights changing
+            result['edit_to_lights_ms'] = (time.time() - signature[0] / 1e9) * 1000
+        self.metrics['reloads'] += 1
+        self.metrics['reports_sent'] += sent
+        self.metrics['reports_skipped'] += skipped
+        self.latencies = (self.latencies + [result['latency_ms']])[-LATENCY_HISTORY:]
+        if self.on_reload:
+            self.on_reload(result)
+        return result
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="razer-profile-reload", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error reloading profiles: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch profiles and apply only what changed when they are edited")
+    parser.add_argument('profiles', nargs='+', help="Profile names or paths (.rzp or .json)")
+    parser.add_argument('--interval', type=float, default=RELOAD_INTERVAL)
+    parser.add_argument('--simulate', action='store_true', help="Use simulated HID devices")
+    args = parser.parse_args()
+
+    from razer_common import scan_razer_devices, set_hid_backend
+    if args.simulate:
+        from razer_sim import SimulatedHidBackend
+        set_hid_backend(SimulatedHidBackend())
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    journal = StateJournal().start()
+
+    def report(result):
+        if result['ok']:
+            print(f"{result['path']}: sent {result['sent']}, unchanged {result['skipped']}, "
+                  f"{result['latency_ms']:.1f} ms (parse {result['parse_ms']:.1f} ms)")
+        else:
+            print(f"{result['path']}: update failed")
+
+    watcher = ProfileWatcher(devices, journal, args.interval, on_reload=report)
+    for name in args.profiles:
+        path = name if os.path.sep in name or name.endswith((PROFILE_SUFFIX, SOURCE_SUFFIX)) else profile_path(name)
+        watcher.watch(path, apply_now=True)
+    watcher.start()
+    print(f"Watching {len(watcher.watched)} profile(s) on {len(devices)} device(s)")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        journal.stop()
+
+if __name__ == "__main__":
+    main()
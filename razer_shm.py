@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import argparse
+import mmap
+import os
+import struct
+import time
+import numpy as np
+
+SHM_MAGIC = b'RZFB'
+SHM_VERSION = 1
+# magic, version, header size, device pid, rows, cols, reserved, sequence
+SHM_HEADER = struct.Struct('<4sHHHHHH Q')
+SHM_SEQUENCE_OFFSET = SHM_HEADER.size - 8
+SHM_POLL_INTERVAL = 0.001
+
+def default_frame_path(pid: int) -> str:
+    return os.path.join(os.environ.get('TMPDIR', '/tmp'), f"razer_frame_{pid:04x}.bin")
+
+def create_frame_file(path: str, pid: int, rows: int, cols: int) -> str:
+    size = SHM_HEADER.size + rows * cols * 3
+    with open(path, 'wb') as f:
+        f.write(SHM_HEADER.pack(SHM_MAGIC, SHM_VERSION, SHM_HEADER.size, pid, rows, cols, 0, 0))
+        f.write(bytes(size - SHM_HEADER.size))
+    return path
+
+class SharedFrame:
+    def __init__(self, path: str, writable: bool = False):
+        self._file = open(path, 'r+b' if writable else 'rb')
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self.map = mmap.mmap(self._file.fileno(), 0, access=access)
+        magic, version, header_size, self.pid, self.rows, self.cols, _, _ = SHM_HEADER.unpack_from(self.map, 0)
+        if magic != SHM_MAGIC or version != SHM_VERSION:
+            self.close()
+            raise ValueError(f"Not a Razer frame file: {path}")
+        self._sequence = np.frombuffer(self.map, dtype='<u8', count=1, offset=SHM_SEQUENCE_OFFSET)
+        self.frame = np.frombuffer(self.map, dtype=np.uint8, count=self.rows * self.cols * 3,
+                                   offset=header_size).reshape(self.rows, self.cols, 3)
+
+    @property
+    def sequence(self) -> int:
+        return int(self._sequence[0])
+
+    def write(self, frame: np.ndarray):
+        seq = self.sequence
+        self._sequence[0] = seq + 1
+        np.copyto(self.frame, frame)
+        self._sequence[0] = seq + 2
+
+    def close(self):
+        self.frame = None
+        self._sequence = None
+        if getattr(self, 'map', None) is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+def ingest(streamer, shared: SharedFrame, duration: float = None, poll_interval: float = SHM_POLL_INTERVAL) -> int:
+    if (shared.rows, shared.cols) != streamer.shape:
+        raise ValueError(f"Frame file is {shared.rows}x{shared.cols}, device matrix is "
+                         f"{streamer.rows}x{streamer.cols}")
+    streamer.session.open()
+    last_seq = None
+    presented = 0
+    deadline = None if duration is None else time.monotonic() + duration
+    while deadline is None or time.monotonic() < deadline:
+        seq = shared.sequence
+        if seq == last_seq or seq & 1:
+            time.sleep(poll_interval)
+            continue
+        # prepare() copies the frame into the reports; only send them if no writer touched it meanwhile
+        reports = streamer.prepare(shared.frame)
+        if shared.sequence != seq:
+            continue
+        if streamer.send_prepared(reports):
+            presented += 1
+        last_seq = seq
+    return presented
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream frames written by external processes into a memory-mapped file")
+    parser.add_argument('--path', help="Frame file (default: $TMPDIR/razer_frame_<pid>.bin)")
+    parser.add_argument('--duration', type=float, default=None)
+    args = parser.parse_args()
+
+    from razer_common import scan_razer_devices
+    from razer_stream import FrameStreamer
+    devices = scan_razer_devices()
+    if not devices:
+        print("No Razer devices found.")
+        return
+    streamer = FrameStreamer(devices[0])
+    path = args.path or default_frame_path(devices[0]['pid'])
+    if not os.path.exists(path):
+        create_frame_file(path, devices[0]['pid'], streamer.rows, streamer.cols)
+    print(f"Waiting for frames in {path} ({streamer.rows}x{streamer.cols} RGB, header {SHM_HEADER.size} bytes)")
+    shared = SharedFrame(path)
+    try:
+        ingest(streamer, shared, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shared.close()
+        streamer.close()
+
+if __name__ == "__main__":
+    main()
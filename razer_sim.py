@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import numpy as np
+
+from razer_common import (
+    RAZER_VID,
+    RAZER_DEVICES,
+    REPORT_LEN,
+    MATRIX_CMD_CLASS,
+    MATRIX_FRAME_CMD_ID,
+    MATRIX_FRAME_OFFSET,
+    STATUS_SUCCESS,
+    INFO_CMD_CLASS,
+    FIRMWARE_CMD_ID,
+    SERIAL_CMD_ID,
+    POWER_CMD_CLASS,
+    BATTERY_LEVEL_CMD_ID,
+    CHARGING_CMD_ID,
+    calculate_crc,
+    get_matrix_dims,
+)
+
+DEFAULT_SIMULATED_PIDS = (0x024E, 0x0099)
+SIMULATED_FIRMWARE = (1, 2)
+SIMULATED_BATTERY = (255, False)
+QUERY_FLAG = 0x80
+
+class SimulatedHidBackend:
+    def __init__(self, pids=DEFAULT_SIMULATED_PIDS, write_latency=0.001,
+                 interfaces_per_device: int = 1):
+        self.write_latency = write_latency
+        self.lock = threading.Lock()
+        self.entries = []
+        self.last_report = {}
+        self.settings = {}
+        self.frames = {}
+        self.serials = {}
+        self.battery = {}
+        self.writes = 0
+        for index, pid in enumerate(pids):
+            for iface in range(interfaces_per_device):
+                path = f"sim:{pid:04x}:{index}:{iface}".encode()
+                self.entries.append({
+                    'path': path,
+                    'vendor_id': RAZER_VID,
+                    'product_id': pid,
+                    'serial_number': f"SIM{index:04d}",
+                    'product_string': RAZER_DEVICES.get(pid, 'Simulated Razer Device'),
+                    'interface_number': iface,
+                })
+                self.serials[path] = f"SIM{index:04d}"
+                rows, cols = get_matrix_dims(pid)
+                self.frames[path] = np.zeros((rows, cols, 3), dtype=np.uint8)
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0) -> list:
+        return [dict(e) for e in self.entries
+                if (not vendor_id or e['vendor_id'] == vendor_id)
+                and (not product_id or e['product_id'] == product_id)]
+
+    def device(self):
+        return SimulatedDevice(self)
+
+    def _latency(self, path: bytes) -> float:
+        if isinstance(self.write_latency, dict):
+            return self.write_latency.get(int(path.split(b':')[1], 16), 0.0)
+        return self.write_latency
+
+    def _write(self, path: bytes, data: bytes) -> int:
+        latency = self._latency(path)
+        if latency:
+            time.sleep(latency)
+        report = bytes(data[1:1 + REPORT_LEN])
+        with self.lock:
+            self.writes += 1
+            self.last_report[path] = report
+            key = self._setting_key(path, report)
+            if report[6] == INFO_CMD_CLASS and report[7] in (SERIAL_CMD_ID, FIRMWARE_CMD_ID):
+                response = bytearray(report)
+                if report[7] == SERIAL_CMD_ID:
+                    serial = self.serials[path].encode()
+                    response[8:8 + len(serial)] = serial
+                else:
+                    response[8:10] = bytes(SIMULATED_FIRMWARE)
+                response[88] = calculate_crc(response)
+                self.last_report[path] = bytes(response)
+            elif report[6] == POWER_CMD_CLASS and report[7] in (BATTERY_LEVEL_CMD_ID, CHARGING_CMD_ID):
+                level, charging = self.battery.get(path, SIMULATED_BATTERY)
+                response = bytearray(report)
+                response[9] = level if report[7] == BATTERY_LEVEL_CMD_ID else int(charging)
+                response[88] = calculate_crc(response)
+                self.last_report[path] = bytes(response)
+            elif report[7] & QUERY_FLAG:
+                stored = self.settings.get(key)
+                if stored is not None:
+                    response = bytearray(stored)
+                    response[1] = report[1]
+                    response[7] = report[7]
+                    response[88] = calculate_crc(response)
+                    self.last_report[path] = bytes(response)
+            else:
+                self.settings[key] = report
+            if report[6] == MATRIX_CMD_CLASS and report[7] == MATRIX_FRAME_CMD_ID:
+                frame = self.frames[path]
+                row, start, stop = report[10], report[11], report[12]
+                if row < frame.shape[0] and start <= stop < frame.shape[1]:
+                    count = (stop - start + 1) * 3
+                    rgb = np.frombuffer(report, dtype=np.uint8, count=count, offset=MATRIX_FRAME_OFFSET)
+                    frame[row, start:stop + 1] = rgb.reshape(-1, 3)
+        return len(data)
+
+    def _setting_key(self, path: bytes, report: bytes) -> tuple:
+        led = report[9] if report[6] == MATRIX_CMD_CLASS else None
+        return path, report[6], report[7] & ~QUERY_FLAG & 0xFF, led
+
+    def _read(self, path: bytes, length: int) -> list:
+        with self.lock:
+            report = bytearray(self.last_report.get(path, bytes(REPORT_LEN)))
+        report[0] = STATUS_SUCCESS
+        return [0x00] + list(report[:length - 1])
+
+class SimulatedDevice:
+    def __init__(self, backend: SimulatedHidBackend):
+        self.backend = backend
+        self.path = None
+
+    def open_path(self, path: bytes):
+        if path not in self.backend.frames:
+            raise IOError(f"open failed: {path!r}")
+        self.path = path
+
+    def send_feature_report(self, data) -> int:
+        if self.path is None:
+            raise IOError("device not open")
+        return self.backend._write(self.path, bytes(data))
+
+    def get_feature_report(self, report_id: int, length: int) -> list:
+        if self.path is None:
+            raise IOError("device not open")
+        return self.backend._read(self.path, length)
+
+    def close(self):
+        self.path = None
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import threading
+
+from razer_common import (
+    MATRIX_CMD_CLASS,
+    MATRIX_FRAME_CMD_ID,
+    DPI_CMD_CLASS,
+    DPI_CMD_ID,
+    DPI_STAGES_CMD_ID,
+    INFO_CMD_CLASS,
+    POLLING_RATE_CMD_ID,
+    HYPERPOLLING_CMD_ID,
+    add_send_listener,
+    remove_send_listener,
+    device_key,
+    send_reports_to_device,
+)
+
+STATE_DIR = os.path.expanduser("~/Library/Application Support/Open Razer macOS Control")
+JOURNAL_PATH = os.path.join(STATE_DIR, "state.journal")
+COALESCE_DELAY = 0.25
+COMPACT_THRESHOLD = 2000
+# commands that carry a value instead of an LED id, with the argument bytes that select their slot
+VALUE_COMMANDS = {
+    (DPI_CMD_CLASS, DPI_CMD_ID): (),
+    (DPI_CMD_CLASS, DPI_STAGES_CMD_ID): (),
+    (INFO_CMD_CLASS, POLLING_RATE_CMD_ID): (),
+    (INFO_CMD_CLASS, HYPERPOLLING_CMD_ID): (8,),
+}
+
+def report_slot(report) -> str:
+    cmd_class, cmd_id = report[6], report[7]
+    if cmd_class == MATRIX_CMD_CLASS and cmd_id == MATRIX_FRAME_CMD_ID:
+        return f"{cmd_class:02x}{cmd_id:02x}:row{report[10]}"
+    if (cmd_class, cmd_id) in VALUE_COMMANDS:
+        return f"{cmd_class:02x}{cmd_id:02x}:" + ''.join(f"{report[i]:02x}" for i in VALUE_COMMANDS[cmd_class, cmd_id])
+    return f"{cmd_class:02x}{cmd_id:02x}:{report[9]:02x}"
+
+class StateJournal:
+    def __init__(self, path: str = JOURNAL_PATH, coalesce_delay: float = COALESCE_DELAY):
+        self.path = path
+        self.coalesce_delay = coalesce_delay
+        self.state = {}
+        self._pending = {}
+        self._records = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.load()
+
+    def load(self):
+        self.state = {}
+        self._records = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    slots = self.state.setdefault(record['device'], {})
+                    slots.pop(record['slot'], None)
+                    slots[record['slot']] = bytes.fromhex(record['report'])
+                    self._records += 1
+                except (ValueError, KeyError):
+                    continue
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="razer-state-journal", daemon=True)
+            self._thread.start()
+            add_send_listener(self.record)
+        return self
+
+    def stop(self):
+        remove_send_listener(self.record)
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.flush()
+
+    def record(self, device: dict, reports: list):
+        key = device_key(device)
+        with self._lock:
+            slots = self.state.setdefault(key, {})
+            order = list(slots)
+            sent = []
+            first_change = None
+            for report in reports:
+                report = bytes(report)
+                slot = report_slot(report)
+                if first_change is None and slots.get(slot) != report:
+                    first_change = len(sent)
+                # every send moves its slot to the end so restores replay in the order last sent
+                slots.pop(slot, None)
+                slots[slot] = report
+                sent.append((slot, report))
+            if list(slots) != order:
+                # a re-send that only reorders slots is written too, or a reload would replay the old order
+                first_change = 0
+            if first_change is None:
+                return
+            # the file has to keep the order in memory, so everything sent after a change is written again
+            for slot, report in sent[first_change:]:
+                self._pending.pop((key, slot), None)
+                self._pending[(key, slot)] = report
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.wait(self.coalesce_delay):
+                break
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            snapshot = None
+            if self._records + len(pending) > COMPACT_THRESHOLD:
+                snapshot = {key: dict(slots) for key, slots in self.state.items()}
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            if snapshot is not None:
+                self._compact(snapshot)
+                return
+            with open(self.path, 'a') as f:
+                for (key, slot), report in pending.items():
+                    f.write(json.dumps({'device': key, 'slot': slot, 'report': report.hex()}) + '\n')
+            self._records += len(pending)
+        except OSError as e:
+            print(f"Error writing state journal: {e}")
+
+    def _compact(self, snapshot: dict):
+        tmp_path = self.path + '.tmp'
+        count = 0
+        with open(tmp_path, 'w') as f:
+            for key, slots in snapshot.items():
+                for slot, report in slots.items():
+                    f.write(json.dumps({'device': key, 'slot': slot, 'report': report.hex()}) + '\n')
+                    count += 1
+        os.replace(tmp_path, self.path)
+        self._records = count
+
+    def reports_for(self, device: dict) -> list:
+        with self._lock:
+            return list(self.state.get(device_key(device), {}).values())
+
+    def restore(self, device: dict) -> bool:
+        reports = self.reports_for(device)
+        if not reports:
+            return False
+        return send_reports_to_device(device, reports, "Restore State")
+
+    def restore_all(self, devices: list) -> dict:
+        return {device_key(d): self.restore(d) for d in devices if self.reports_for(d)}
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+
+from razer_common import (
+    calculate_crc,
+    construct_frame_row_report,
+    construct_custom_effect_report,
+    get_hid_backend,
+    get_matrix_dims,
+    MATRIX_FRAME_OFFSET,
+)
+from razer_calibration import calibration_for
+from razer_health import get_health
+
+SETTLE_DELAY = 0.05
+LATENCY_SMOOTHING = 0.2
+
+class DeviceSession:
+    def __init__(self, device: dict):
+        self.device = device
+        self._open = {}
+        self.latency = None
+
+    @property
+    def handles(self) -> list:
+        return list(self._open.values())
+
+    def open(self):
+        if self.open_handles():
+            time.sleep(SETTLE_DELAY)
+
+    def open_handles(self) -> bool:
+        health = get_health()
+        opened = False
+        for iface in self.device.get('interfaces', []):
+            path = iface['path']
+            if path in self._open or not health.allow(path):
+                continue
+            try:
+                dev = get_hid_backend().device()
+                dev.open_path(path)
+                self._open[path] = dev
+                opened = True
+            except Exception as e:
+                health.record_failure(path, e)
+                print(f"Error opening interface {path}: {e}")
+        return opened
+
+    def _drop(self, path):
+        dev = self._open.pop(path, None)
+        if dev is not None:
+            try:
+                dev.close()
+            except Exception:
+                pass
+
+    def close(self):
+        for path in list(self._open):
+            self._drop(path)
+
+    def send_many(self, reports) -> bool:
+        self.open()
+        health = get_health()
+        start = time.perf_counter()
+        success = False
+        for path, dev in list(self._open.items()):
+            try:
+                sent = 0
+                for report in reports:
+                    report_with_id = b'\x00' + bytes(report)
+                    if dev.send_feature_report(report_with_id) == len(report_with_id):
+                        sent += 1
+                if sent == len(reports):
+                    success = True
+                    health.record_success(path)
+                else:
+                    health.record_failure(path)
+            except Exception as e:
+                print(f"Error streaming to {self.device.get('name')}: {e}")
+                # reopened by open_handles once the interface's backoff expires
+                health.record_failure(path, e)
+                self._drop(path)
+        self._record_latency(time.perf_counter() - start)
+        return success
+
+    def send(self, report: bytes) -> bool:
+        return self.send_many([report])
+
+    def _record_latency(self, elapsed: float):
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class FrameStreamer:
+    def __init__(self, device: dict, session: DeviceSession = None):
+        self.device = device
+        self.session = session or DeviceSession(device)
+        self.rows, self.cols = get_matrix_dims(device['pid'])
+        self.frame = np.zeros((self.rows, self.cols, 3), dtype=np.uint8)
+        self.calibration = device['calibration'] if 'calibration' in device else calibration_for(device)
+        self._calibrated = np.zeros_like(self.frame)
+        transaction_id = device['transaction_id']
+        self._reports = []
+        self._payloads = []
+        for row in range(self.rows):
+            report = bytearray(construct_frame_row_report(transaction_id, row, bytes(self.cols * 3)))
+            payload = np.frombuffer(report, dtype=np.uint8, count=self.cols * 3,
+                                    offset=MATRIX_FRAME_OFFSET).reshape(self.cols, 3)
+            self._reports.append(report)
+            self._payloads.append(payload)
+        self._apply_report = construct_custom_effect_report(transaction_id)
+        self.frames_sent = 0
+
+    @property
+    def shape(self) -> tuple:
+        return self.rows, self.cols
+
+    @property
+    def sent_frame(self) -> np.ndarray:
+        # the frame as it goes into the row reports, after calibration
+        return self.frame if self.calibration is None else self._calibrated
+
+    def write_frame(self, frame) -> bool:
+        np.copyto(self.frame, frame, casting='unsafe')
+        return self.present()
+
+    def present(self) -> bool:
+        return self.present_from(self.frame)
+
+    def prepare(self, source) -> list:
+        if self.calibration is not None:
+            source = self.calibration.apply(source, self._calibrated)
+        for row, report in enumerate(self._reports):
+            np.copyto(self._payloads[row], source[row])
+            report[88] = calculate_crc(report)
+        return self._reports + [self._apply_report]
+
+    def send_prepared(self, reports: list) -> bool:
+        ok = self.session.send_many(reports)
+        if ok:
+            self.frames_sent += 1
+        return ok
+
+    def present_from(self, source) -> bool:
+        return self.send_prepared(self.prepare(source))
+
+    def close(self):
+        self.session.close()
+
+def run_at_fps(tick, fps: float = 60.0, duration: float = None):
+    period = 1.0 / fps
+    start = time.monotonic()
+    next_tick = start
+    while True:
+        t = time.monotonic() - start
+        if duration is not None and t >= duration:
+            break
+        tick(t)
+        next_tick += period
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_tick = time.monotonic()
+
+def run_stream(streamer: FrameStreamer, render, fps: float = 60.0, duration: float = None):
+    run_at_fps(lambda t: streamer.write_frame(render(t)), fps, duration)
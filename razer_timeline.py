@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+import argparse
+import bisect
+import json
+import threading
+import time
+
+from razer_common import (
+    MOUSE_CMD_CLASS, MOUSE_CMD_ID, MOUSE_DATA_SIZE, MOUSE_SCROLL_WHEEL_LED,
+    KBD_CMD_CLASS, KBD_CMD_ID, KBD_DATA_SIZE, KBD_BACKLIGHT_LED,
+    MOUSE_EFFECT_STATIC,
+    EFFECT_CODES,
+    RAZER_LED_ZONES,
+    LED_ZONES_BY_TYPE,
+    LAPTOP_LED_ZONES,
+    ACCESSORY_LED_ZONES,
+    build_arguments,
+    calibrate_params,
+    construct_razer_report,
+    construct_brightness_report,
+    is_mouse_device,
+    resolve_led,
+)
+from razer_stream import DeviceSession
+
+DEFAULT_FPS = 30.0
+SPIN_THRESHOLD = 0.002
+EASINGS = {
+    'linear': lambda x: x,
+    'smooth': lambda x: x * x * (3.0 - 2.0 * x),
+    'step': lambda x: 0.0,
+}
+KNOWN_ZONES = ({'default'} | set(LAPTOP_LED_ZONES) | set(ACCESSORY_LED_ZONES)
+               | {name for zones in LED_ZONES_BY_TYPE.values() for name in zones}
+               | {name for zones in RAZER_LED_ZONES.values() for name in zones})
+
+class Timeline:
+    def __init__(self, keyframes: list, duration: float = None):
+        self.tracks = {}
+        for keyframe in sorted(keyframes, key=lambda k: k['time']):
+            easing = keyframe.get('easing', 'linear')
+            if easing not in EASINGS:
+                raise ValueError(f"Unknown easing: {easing}")
+            for zone, values in keyframe['zones'].items():
+                if isinstance(zone, str) and zone[:1].isdigit():
+                    zone = int(zone, 0)
+                elif zone not in KNOWN_ZONES:
+                    raise ValueError(f"Unknown LED zone at {keyframe['time']}s: {zone}")
+                effect = values.get('effect')
+                if effect is not None and effect not in EFFECT_CODES:
+                    raise ValueError(f"Unknown effect at {keyframe['time']}s: {effect}")
+                track = self.tracks.setdefault(zone, ([], []))
+                track[0].append(float(keyframe['time']))
+                track[1].append((values, easing))
+        last = max((times[-1] for times, _ in self.tracks.values()), default=0.0)
+        self.duration = float(duration) if duration is not None else last
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data['keyframes'], data.get('duration'))
+
+    def validate(self, device: dict):
+        for zone in self.tracks:
+            if zone != 'default':
+                resolve_led(device['pid'], zone)
+
+    def sample(self, t: float) -> dict:
+        state = {}
+        for zone, (times, frames) in self.tracks.items():
+            i = bisect.bisect_right(times, t) - 1
+            if i < 0:
+                state[zone] = frames[0][0]
+                continue
+            values, _ = frames[i]
+            if i + 1 >= len(times):
+                state[zone] = values
+                continue
+            next_values, easing = frames[i + 1]
+            x = EASINGS[easing]((t - times[i]) / (times[i + 1] - times[i]))
+            state[zone] = _interpolate(values, next_values, x)
+        return state
+
+def _interpolate(a: dict, b: dict, x: float) -> dict:
+    result = dict(a)
+    if 'color' in a and 'color' in b:
+        result['color'] = [round(ca + (cb - ca) * x) for ca, cb in zip(a['color'], b['color'])]
+    if 'brightness' in a and 'brightness' in b:
+        result['brightness'] = round(a['brightness'] + (b['brightness'] - a['brightness']) * x)
+    return result
+
+class TimelinePlayer:
+    def __init__(self, timeline: Timeline, device: dict, fps: float = DEFAULT_FPS,
+                 loop: bool = False, session: DeviceSession = None):
+        timeline.validate(device)
+        self.timeline = timeline
+        self.device = device
+        self.period = 1.0 / fps
+        self.loop = loop
+        self.session = session or DeviceSession(device)
+        if is_mouse_device(device['pid']):
+            self._command = (MOUSE_CMD_CLASS, MOUSE_CMD_ID, MOUSE_DATA_SIZE, MOUSE_SCROLL_WHEEL_LED)
+        else:
+            self._command = (KBD_CMD_CLASS, KBD_CMD_ID, KBD_DATA_SIZE, KBD_BACKLIGHT_LED)
+        self._sent = {}
+        self._lock = threading.Condition()
+        self._origin = None
+        self._paused_at = 0.0
+        self._stopped = False
+        self._thread = None
+        self.finished_at = None
+
+    @property
+    def position(self) -> float:
+        with self._lock:
+            return self._position(time.monotonic())
+
+    def _position(self, now: float) -> float:
+        return self._paused_at if self._origin is None else now - self._origin
+
+    def pause(self):
+        with self._lock:
+            if self._origin is not None:
+                self._paused_at = time.monotonic() - self._origin
+                self._origin = None
+            self._lock.notify_all()
+
+    def resume(self):
+        with self._lock:
+            if self._origin is None:
+                self._origin = time.monotonic() - self._paused_at
+            self._lock.notify_all()
+
+    def seek(self, t: float):
+        with self._lock:
+            t = min(max(t, 0.0), self.timeline.duration)
+            if self._origin is None:
+                self._paused_at = t
+            else:
+                self._origin = time.monotonic() - t
+            self._lock.notify_all()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.play, name="razer-timeline", daemon=True)
+        self._thread.start()
+        return self
+
+    def reports_for(self, state: dict) -> list:
+        cmd_class, cmd_id, data_size, default_led = self._command
+        transaction_id = self.device['transaction_id']
+        reports = []
+        for zone, values in state.items():
+            led_id = default_led if zone == 'default' else resolve_led(self.device['pid'], zone)
+            if 'brightness' in values:
+                report = construct_brightness_report(transaction_id, led_id, values['brightness'])
+                if self._sent.get((led_id, 'brightness')) != report:
+                    reports.append(report)
+                    self._sent[(led_id, 'brightness')] = report
+            effect = values.get('effect', 'static' if 'color' in values else None)
+            if effect is None:
+                continue
+            if effect == 'static':
+                code, params = MOUSE_EFFECT_STATIC, values['color']
+            else:
+                code, params = EFFECT_CODES[effect], values.get('params', [])
+            args = build_arguments(code, led_id, calibrate_params(self.device, code, params))
+            report = construct_razer_report(transaction_id, cmd_class, cmd_id, data_size, args)
+            if self._sent.get((led_id, 'effect')) != report:
+                reports.append(report)
+                self._sent[(led_id, 'effect')] = report
+        return reports
+
+    def _present(self, t: float):
+        reports = self.reports_for(self.timeline.sample(t))
+        if reports:
+            self.session.send_many(reports)
+
+    def _wait_until(self, target: float):
+        while True:
+            remaining = target - time.monotonic()
+            if remaining <= 0:
+                return
+            if remaining > SPIN_THRESHOLD:
+                with self._lock:
+                    self._lock.wait(remaining - SPIN_THRESHOLD)
+                    if self._stopped or self._origin is None:
+                        return
+
+    def play(self):
+        self.session.open()
+        duration = self.timeline.duration
+        with self._lock:
+            if self._origin is None:
+                self._origin = time.monotonic() - self._paused_at
+        tick = 0
+        tick_origin = None
+        while True:
+            with self._lock:
+                while self._origin is None and not self._stopped:
+                    self._lock.wait()
+                    tick_origin = None
+                if self._stopped:
+                    break
+                origin = self._origin
+            if tick_origin != origin:
+                tick_origin = origin
+                tick = int(max(time.monotonic() - origin, 0.0) / self.period) + 1
+            latency = self.session.latency or 0.0
+            target = origin + tick * self.period
+            end = origin + duration
+            if not self.loop and target >= end:
+                self._wait_until(end - latency)
+                with self._lock:
+                    if self._stopped or self._origin != origin:
+                        continue
+                self._present(duration)
+                self.finished_at = time.monotonic() - origin
+                break
+            self._wait_until(target - latency)
+            with self._lock:
+                if self._stopped or self._origin != origin:
+                    continue
+            t = target - origin
+            self._present(t % duration if self.loop and duration > 0 else t)
+            tick += 1
+        self.session.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a keyframe lighting timeline")
+    parser.add_argument('timeline', help="Timeline JSON file")
+    parser.add_argument('--loop', action='store_true')
+    parser.add_argument('--fps', type=float, default=DEFAULT_FPS)
+    parser.add_argument('--seek', type=float, default=0.0, help="Start position in seconds")
+    args = parser.parse_args()
+
+    from razer_calibration import attach_calibrations
+    from razer_common import scan_razer_devices
+    devices = attach_calibrations(scan_razer_devices())
+    if not devices:
+        print("No Razer devices found.")
+        return
+    player = TimelinePlayer(Timeline.load(args.timeline), devices[0], args.fps, args.loop)
+    player.seek(args.seek)
+    try:
+        player.play()
+    except KeyboardInterrupt:
+        player.stop()
+    if player.finished_at is not None:
+        error = (player.finished_at - player.timeline.duration) * 1000
+        print(f"Finished at {player.finished_at:.4f}s (drift {error:+.2f} ms)")
+
+if __name__ == "__main__":
+    main()
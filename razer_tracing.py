@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+TRACE_ENV = "RAZER_TRACE"
+TRACE_FLAG = "--trace"
+DEFAULT_TRACE_PATH = "razer_trace.json"
+
+_events = []
+_lock = threading.Lock()
+_origin = time.perf_counter_ns()
+_path = None
+
+def enable(path: str = DEFAULT_TRACE_PATH):
+    global _path
+    if _path is None:
+        atexit.register(write_trace)
+    _path = path
+    os.environ[TRACE_ENV] = path
+
+def is_enabled() -> bool:
+    return _path is not None
+
+def configure_from_argv(argv: list):
+    for i, arg in enumerate(list(argv)):
+        if arg == TRACE_FLAG:
+            has_path = i + 1 < len(argv) and not argv[i + 1].startswith('-')
+            enable(argv[i + 1] if has_path else DEFAULT_TRACE_PATH)
+            del argv[i:i + 1 + has_path]
+            return
+        if arg.startswith(TRACE_FLAG + '='):
+            del argv[i]
+            enable(arg.split('=', 1)[1])
+            return
+
+def add_event(name: str, category: str, start_ns: int, end_ns: int, args: dict = None):
+    event = {
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': (start_ns - _origin) / 1000.0,
+        'dur': (end_ns - start_ns) / 1000.0,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+    }
+    if args:
+        event['args'] = args
+    with _lock:
+        _events.append(event)
+
+class span:
+    def __init__(self, name: str, category: str = 'razer', **args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        add_event(self.name, self.category, self.start, time.perf_counter_ns(), self.args)
+
+def traced(name: str, category: str = 'razer'):
+    def decorate(func):
+        if _path is None:
+            return func
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add_event(name, category, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+class TracingHidBackend:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0) -> list:
+        with span('hid.enumerate', 'hid'):
+            return self.backend.enumerate(vendor_id, product_id)
+
+    def device(self):
+        return TracingDevice(self.backend.device())
+
+class TracingDevice:
+    def __init__(self, device):
+        self.device = device
+
+    def open_path(self, path: bytes):
+        with span('hid.open_path', 'hid', path=bytes(path).decode(errors='replace')):
+            self.device.open_path(path)
+
+    def send_feature_report(self, data) -> int:
+        with span('hid.send_feature_report', 'hid', length=len(data)):
+            return self.device.send_feature_report(data)
+
+    def get_feature_report(self, report_id: int, length: int) -> list:
+        with span('hid.get_feature_report', 'hid', length=length):
+            return self.device.get_feature_report(report_id, length)
+
+    def close(self):
+        with span('hid.close', 'hid'):
+            self.device.close()
+
+def trace_backend(backend):
+    if _path is None or isinstance(backend, TracingHidBackend):
+        return backend
+    return TracingHidBackend(backend)
+
+def untraced(backend):
+    return backend.backend if isinstance(backend, TracingHidBackend) else backend
+
+def write_trace(path: str = None):
+    path = path or _path
+    if path is None:
+        return
+    with _lock:
+        events = list(_events)
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import argparse
+import threading
+import time
+
+from razer_common import (
+    MOUSE_EFFECT_STATIC,
+    construct_effect_report,
+    construct_brightness_report,
+    default_led,
+    notify_sent,
+)
+from razer_stream import DeviceSession
+
+MIN_STEP_INTERVAL = 1.0 / 60.0
+MAX_STEPS = 120
+LATENCY_HEADROOM = 1.5
+
+class TransitionEngine:
+    def __init__(self, device: dict, session: DeviceSession = None,
+                 min_step_interval: float = MIN_STEP_INTERVAL, max_steps: int = MAX_STEPS):
+        self.device = device
+        self.session = session or DeviceSession(device)
+        self.min_step_interval = min_step_interval
+        self.max_steps = max_steps
+        self.steps_used = 0
+        self.cancelled = False
+        self._cancel = threading.Event()
+
+    def plan_steps(self, duration: float) -> int:
+        latency = self.session.latency or self.min_step_interval
+        interval = max(latency * LATENCY_HEADROOM, self.min_step_interval)
+        return max(1, min(self.max_steps, int(duration / interval)))
+
+    def _run(self, duration: float, make_report) -> bool:
+        self.session.open()
+        ok = self.session.send_many(make_report(0.0))
+        steps = self.plan_steps(duration) if duration > 0 else 1
+        self.steps_used = steps
+        start = time.monotonic()
+        last = None
+        for step in range(1, steps + 1):
+            target = start + duration * step / steps
+            delay = target - time.monotonic()
+            if delay > 0:
+                self._cancel.wait(delay)
+            if self._cancel.is_set():
+                self.cancelled = True
+                break
+            reports = make_report(step / steps)
+            if reports != last:
+                ok = self.session.send_many(reports) and ok
+                last = reports
+        if ok and last is not None:
+            notify_sent(self.device, last)
+        return ok
+
+    def crossfade_color(self, from_color, to_color, duration: float, led_ids: list = None) -> bool:
+        led_ids = led_ids or [None]
+        def make_report(x):
+            color = [round(a + (b - a) * x) for a, b in zip(from_color, to_color)]
+            return [construct_effect_report(self.device, MOUSE_EFFECT_STATIC, color, led_id)
+                    for led_id in led_ids]
+        return self._run(duration, make_report)
+
+    def fade_brightness(self, from_level: int, to_level: int, duration: float, led_ids: list = None) -> bool:
+        led_ids = led_ids or [default_led(self.device['pid'])]
+        transaction_id = self.device['transaction_id']
+        def make_report(x):
+            level = round(from_level + (to_level - from_level) * x)
+            return [construct_brightness_report(transaction_id, led_id, level) for led_id in led_ids]
+        return self._run(duration, make_report)
+
+    def cancel(self):
+        # stops a fade running on another thread at its next step
+        self._cancel.set()
+
+    def close(self):
+        self.session.close()
+
+def parse_color(value: str) -> tuple:
+    return tuple(bytes.fromhex(value.lstrip('#')))
+
+def main():
+    parser = argparse.ArgumentParser(description="Fade brightness or crossfade static colors")
+    sub = parser.add_subparsers(dest='command', required=True)
+    fade = sub.add_parser('brightness')
+    fade.add_argument('to_level', type=int)
+    fade.add_argument('--from-level', type=int, default=None, help="Default: read from the device")
+    color = sub.add_parser('color')
+    color.add_argument('from_color', type=parse_color)
+    color.add_argument('to_color', type=parse_color)
+    parser.add_argument('--duration', type=float, default=1.0)
+    args = parser.parse_args()
+
+    from razer_calibration import attach_calibrations
+    from razer_common import scan_razer_devices, get_brightness
+    devices = attach_calibrations(scan_razer_devices())
+    if not devices:
+        print("No Razer devices found.")
+        return
+    engine = TransitionEngine(devices[0])
+    try:
+        if args.command == 'brightness':
+            start = args.from_level
+            if start is None:
+                start = get_brightness(devices[0])
+                start = 255 if start is None else start
+            ok = engine.fade_brightness(start, args.to_level, args.duration)
+        else:
+            ok = engine.crossfade_color(args.from_color, args.to_color, args.duration)
+    finally:
+        engine.close()
+    print(f"{'Done' if ok else 'Failed'} in {engine.steps_used} steps")
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,73 @@
 #!/usr/bin/env python3
 
+import logging
+import threading
+import time
+
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QTabWidget, QLabel, QSpinBox, QPushButton, QComboBox, QRadioButton,
-    QMessageBox
+    QButtonGroup, QMessageBox, QLineEdit, QCheckBox
 )
+from PyQt5.QtCore import pyqtSignal, pyqtSlot
 from razer_common import (
     scan_razer_devices,
-    construct_razer_report,
-    build_arguments,
-    send_report_to_device,
+    send_reports_to_device,
+    get_led_zones,
+    default_led,
     is_mouse_device,
     is_keyboard_device,
-    MOUSE_EFFECT_STATIC, KBD_EFFECT_STATIC,
-    MOUSE_EFFECT_BREATHING, KBD_EFFECT_BREATHING,
-    MOUSE_EFFECT_WAVE, KBD_EFFECT_WAVE,
-    MOUSE_EFFECT_REACTIVE, KBD_EFFECT_REACTIVE,
-    MOUSE_CMD_CLASS, MOUSE_CMD_ID, MOUSE_DATA_SIZE,
-    KBD_CMD_CLASS, KBD_CMD_ID, KBD_DATA_SIZE,
-    MOUSE_SCROLL_WHEEL_LED, KBD_BACKLIGHT_LED
+    get_brightness,
+    get_dpi,
+    get_dpi_stages,
+    get_polling_rate,
+    set_dpi,
+    set_dpi_stages,
+    set_polling_rate,
+    supported_polling_rates,
+    DPI_MIN,
+    DPI_MAX,
+    MAX_DPI_STAGES,
 )
+from razer_profiles import Profile, apply_profile, list_profiles, profile_path, save_profile
+from razer_state import StateJournal
+from razer_reload import ProfileWatcher
+from razer_hotplug import HotplugMonitor
+from razer_transitions import TransitionEngine
+from razer_calibration import attach_calibrations
+from razer_registry import EFFECT_REGISTRY, EFFECTS_BY_NAME, effects_for_device
+from razer_tracing import traced
+from razer_preview import FramePreview, StreamWorker, VIRTUAL_SHAPE
+
+logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
+    # engine, setting name, device, value, outcome ('ok', 'failed' or 'cancelled'), success message
+    fade_finished = pyqtSignal(object, str, object, object, str, str)
+
     def __init__(self):
         super().__init__()
+        self.fades = {}
+        self.fade_finished.connect(self.on_fade_finished)
         self.setWindowTitle("Razer Control")
         self.setMinimumSize(500, 400)
+        self.devices = []
+        self.applied_settings = {}
+        self.journal = StateJournal().start()
         self.init_ui()
         self.refresh_devices()
+        self.journal.restore_all(self.devices)
+        self.hotplug = HotplugMonitor(on_added=self.journal.restore, known_devices=self.devices).start()
+        self.profile_watcher = ProfileWatcher(lambda: self.devices, self.journal, on_reload=self.log_reload).start()
+
+    def closeEvent(self, event):
+        self.stop_preview()
+        for key in list(self.fades):
+            self.cancel_fade(key)
+        self.hotplug.stop()
+        self.profile_watcher.stop()
+        self.journal.stop()
+        super().closeEvent(event)
 
     def init_ui(self):
         central = QWidget()
@@ -40,27 +80,34 @@ class MainWindow(QMainWindow):
         self.btn_refresh.clicked.connect(self.refresh_devices)
         top_layout.addWidget(QLabel("Select Device:"))
         top_layout.addWidget(self.device_combo)
+        self.zone_combo = QComboBox()
+        top_layout.addWidget(QLabel("Zone:"))
+        top_layout.addWidget(self.zone_combo)
         top_layout.addWidget(self.btn_refresh)
+        self.device_combo.currentIndexChanged.connect(self.update_zones)
+        self.device_combo.currentIndexChanged.connect(self.update_tabs)
         layout.addLayout(top_layout)
 
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
-
-        self.tab_static = self.create_tab_static()
-        self.tab_breathing = self.create_tab_breathing()
-        self.tab_wave = self.create_tab_wave()
-        self.tab_reactive = self.create_tab_reactive()
-        self.tab_reset = self.create_tab_reset()
-
-        self.tabs.addTab(self.tab_static, "Static")
-        self.tabs.addTab(self.tab_breathing, "Breathing")
-        self.tabs.addTab(self.tab_wave, "Wave")
-        self.tabs.addTab(self.tab_reactive, "Reactive")
-        self.tabs.addTab(self.tab_reset, "Reset")
+        self.effect_inputs = {}
+        self.pages = {}
+        self.page_builders = {spec.name: lambda page, spec=spec: self.build_effect_tab(page, spec)
+                              for spec in EFFECT_REGISTRY}
+        self.page_builders['brightness'] = self.build_tab_brightness
+        self.page_builders['profiles'] = self.build_tab_profiles
+        self.page_builders['preview'] = self.build_tab_preview
+        self.page_builders['performance'] = self.build_tab_performance
+        self.page_titles = {spec.name: spec.title for spec in EFFECT_REGISTRY}
+        self.page_titles.update(brightness="Brightness", profiles="Profiles", preview="Preview",
+                                performance="Performance")
+        self.preview_worker = None
+        self.tabs.currentChanged.connect(self.ensure_tab_built)
+        self.update_tabs()
 
     def refresh_devices(self):
         self.device_combo.clear()
-        devices = scan_razer_devices()
+        devices = attach_calibrations(scan_razer_devices(probe=True))
         if not devices:
             QMessageBox.warning(self, "Error", "No Razer devices found.")
             return
@@ -75,243 +122,440 @@ class MainWindow(QMainWindow):
             return None
         return self.device_combo.itemData(idx)
 
-    def create_tab_static(self):
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        self.static_spin_r = QSpinBox(); self.static_spin_r.setRange(0, 255); self.static_spin_r.setValue(255)
-        self.static_spin_g = QSpinBox(); self.static_spin_g.setRange(0, 255); self.static_spin_g.setValue(255)
-        self.static_spin_b = QSpinBox(); self.static_spin_b.setRange(0, 255); self.static_spin_b.setValue(255)
-        layout.addRow("Red:", self.static_spin_r)
-        layout.addRow("Green:", self.static_spin_g)
-        layout.addRow("Blue:", self.static_spin_b)
-        btn = QPushButton("Send Static Effect")
-        btn.clicked.connect(self.send_static)
+    def update_zones(self):
+        self.zone_combo.clear()
+        device = self.get_selected_device()
+        if not device:
+            return
+        zones = get_led_zones(device['pid'])
+        self.zone_combo.addItem("Default", None)
+        for name, led_id in zones.items():
+            self.zone_combo.addItem(name.replace('_', ' ').title(), [led_id])
+        if len(zones) > 1:
+            self.zone_combo.addItem("All Zones", list(zones.values()))
+
+    def selected_leds(self, default_led_id):
+        leds = self.zone_combo.currentData()
+        return leds if leds else [default_led_id]
+
+    def remember_setting(self, device, key, value):
+        device_key = (device.get('serial'), device['pid'])
+        entry = self.applied_settings.setdefault(device_key, (device, {}))
+        entry[1][key] = value
+
+    def update_tabs(self):
+        device = self.get_selected_device()
+        specs = effects_for_device(device) if device else EFFECT_REGISTRY
+        names = [spec.name for spec in specs] + ['brightness', 'profiles', 'preview']
+        if device and is_mouse_device(device['pid']):
+            names.insert(len(specs) + 1, 'performance')
+        current = self.tabs.currentWidget()
+        self.tabs.blockSignals(True)
+        self.tabs.clear()
+        for name in names:
+            if name not in self.pages:
+                self.pages[name] = QWidget()
+            self.tabs.addTab(self.pages[name], self.page_titles[name])
+        if current is not None and self.tabs.indexOf(current) >= 0:
+            self.tabs.setCurrentWidget(current)
+        self.tabs.blockSignals(False)
+        self.ensure_tab_built(self.tabs.currentIndex())
+        if 'performance' in names and self.pages['performance'].layout() is not None:
+            self.update_polling_rates(device)
+
+    def ensure_tab_built(self, index):
+        page = self.tabs.widget(index)
+        if page is None or page.layout() is not None:
+            return
+        name = next(n for n, p in self.pages.items() if p is page)
+        start = time.perf_counter()
+        self.page_builders[name](page)
+        logger.debug(f"Built {name} tab in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    def build_effect_tab(self, page, spec):
+        layout = QFormLayout(page)
+        inputs = {}
+        for param in spec.params:
+            if param.choices:
+                group = QButtonGroup(page)
+                radio_layout = QHBoxLayout()
+                for value, label in enumerate(param.choices):
+                    radio = QRadioButton(label)
+                    radio.setChecked(value == param.default)
+                    group.addButton(radio, value)
+                    radio_layout.addWidget(radio)
+                layout.addRow(param.label, radio_layout)
+                inputs[param.name] = group
+            else:
+                spin = QSpinBox(); spin.setRange(param.minimum, param.maximum); spin.setValue(param.default)
+                layout.addRow(param.label, spin)
+                inputs[param.name] = spin
+        if spec.fade:
+            fade = QSpinBox(); fade.setRange(0, 10000); fade.setValue(0)
+            fade.setSuffix(" ms")
+            layout.addRow("Fade:", fade)
+            inputs['fade'] = fade
+        btn = QPushButton(spec.button)
+        btn.clicked.connect(lambda: self.send_effect(spec.name))
         layout.addRow(btn)
-        return tab
+        self.effect_inputs[spec.name] = inputs
+
+    def effect_values(self, spec) -> dict:
+        inputs = self.effect_inputs.get(spec.name)
+        if inputs is None:
+            return spec.defaults()
+        return {p.name: inputs[p.name].checkedId() if p.choices else inputs[p.name].value()
+                for p in spec.params}
 
-    def send_static(self):
+    @traced('ui.send_effect', 'ui')
+    def send_effect(self, name):
+        spec = EFFECTS_BY_NAME[name]
         device = self.get_selected_device()
         if not device:
             QMessageBox.warning(self, "Error", "No device selected.")
             return
-        r = self.static_spin_r.value()
-        g = self.static_spin_g.value()
-        b = self.static_spin_b.value()
-        extra = [r, g, b]
-        pid = device['pid']
-        transaction_id = device['transaction_id']
-
-        if is_mouse_device(pid):
-            led_id = MOUSE_SCROLL_WHEEL_LED
-            effect_code = MOUSE_EFFECT_STATIC
-            data_size = MOUSE_DATA_SIZE
-            cmd_class = MOUSE_CMD_CLASS
-            cmd_id = MOUSE_CMD_ID
-        elif is_keyboard_device(pid):
-            led_id = KBD_BACKLIGHT_LED
-            effect_code = KBD_EFFECT_STATIC
-            data_size = KBD_DATA_SIZE
-            cmd_class = KBD_CMD_CLASS
-            cmd_id = KBD_CMD_ID
-        else:
+        if not spec.supports(device):
             QMessageBox.warning(self, "Error", "Device type not fully supported yet.")
             return
-        args = build_arguments(effect_code, led_id, extra)
-        report = construct_razer_report(transaction_id, cmd_class, cmd_id, data_size, args)
-        if send_report_to_device(device, report, "Static Effect"):
-            QMessageBox.information(self, "Success", f"Color set to ({r}, {g}, {b}).")
+        values = self.effect_values(spec)
+        extra = spec.build(values)
+        fade = self.effect_inputs[name]['fade'].value() if spec.fade else 0
+        previous = self.applied_settings.get((device.get('serial'), device['pid']), (None, {}))[1].get('effect')
+        if fade > 0 and previous and previous['name'] == name:
+            leds = self.zone_combo.currentData() or []
+            self.start_fade(device, 'effect', {'name': name, 'params': extra, 'zones': leds},
+                            f"{spec.title} effect sent.",
+                            lambda engine: engine.crossfade_color(previous['params'], extra, fade / 1000.0, leds))
+            return
+        self.cancel_fade((device.get('serial'), device['pid']))
+        leds = self.selected_leds(default_led(device['pid']))
+        ok = send_reports_to_device(device, spec.reports(device, values, leds), f"{spec.title} Effect")
+        if ok:
+            self.remember_setting(device, 'effect', {'name': name, 'params': extra, 'zones': leds})
+            QMessageBox.information(self, "Success", f"{spec.title} effect sent.")
         else:
             QMessageBox.warning(self, "Error", "Failed to send effect.")
 
-    def create_tab_breathing(self):
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        self.breathing_base_r = QSpinBox(); self.breathing_base_r.setRange(0, 255); self.breathing_base_r.setValue(255)
-        self.breathing_base_g = QSpinBox(); self.breathing_base_g.setRange(0, 255); self.breathing_base_g.setValue(255)
-        self.breathing_base_b = QSpinBox(); self.breathing_base_b.setRange(0, 255); self.breathing_base_b.setValue(255)
-        layout.addRow("Base Red:", self.breathing_base_r)
-        layout.addRow("Base Green:", self.breathing_base_g)
-        layout.addRow("Base Blue:", self.breathing_base_b)
-        self.breathing_extra_r = QSpinBox(); self.breathing_extra_r.setRange(0, 255); self.breathing_extra_r.setValue(0)
-        self.breathing_extra_g = QSpinBox(); self.breathing_extra_g.setRange(0, 255); self.breathing_extra_g.setValue(0)
-        self.breathing_extra_b = QSpinBox(); self.breathing_extra_b.setRange(0, 255); self.breathing_extra_b.setValue(0)
-        layout.addRow("Breathing Red:", self.breathing_extra_r)
-        layout.addRow("Breathing Green:", self.breathing_extra_g)
-        layout.addRow("Breathing Blue:", self.breathing_extra_b)
-        self.breathing_speed = QSpinBox(); self.breathing_speed.setRange(0, 255); self.breathing_speed.setValue(128)
-        layout.addRow("Speed:", self.breathing_speed)
-        btn = QPushButton("Send Breathing Effect")
-        btn.clicked.connect(self.send_breathing)
+
+    def build_tab_brightness(self, page):
+        layout = QFormLayout(page)
+        self.brightness_level = QSpinBox(); self.brightness_level.setRange(0, 255); self.brightness_level.setValue(255)
+        layout.addRow("Brightness:", self.brightness_level)
+        self.brightness_fade = QSpinBox(); self.brightness_fade.setRange(0, 10000); self.brightness_fade.setValue(500)
+        self.brightness_fade.setSuffix(" ms")
+        layout.addRow("Fade:", self.brightness_fade)
+        btn_read = QPushButton("Read Current Brightness")
+        btn_read.clicked.connect(self.read_brightness)
+        layout.addRow(btn_read)
+        btn = QPushButton("Set Brightness")
+        btn.clicked.connect(self.send_brightness)
         layout.addRow(btn)
-        return tab
 
-    def send_breathing(self):
+    @pyqtSlot()
+    @traced('ui.read_brightness', 'ui')
+    def read_brightness(self):
         device = self.get_selected_device()
         if not device:
             QMessageBox.warning(self, "Error", "No device selected.")
             return
-        base = [self.breathing_base_r.value(), self.breathing_base_g.value(), self.breathing_base_b.value()]
-        extra_color = [self.breathing_extra_r.value(), self.breathing_extra_g.value(), self.breathing_extra_b.value()]
-        speed = self.breathing_speed.value()
-        extra = base + extra_color + [speed]
-        pid = device['pid']
-        transaction_id = device['transaction_id']
-
-        if is_mouse_device(pid):
-            led_id = MOUSE_SCROLL_WHEEL_LED
-            effect_code = MOUSE_EFFECT_BREATHING
-            data_size = MOUSE_DATA_SIZE
-            cmd_class = MOUSE_CMD_CLASS
-            cmd_id = MOUSE_CMD_ID
-        elif is_keyboard_device(pid):
-            led_id = KBD_BACKLIGHT_LED
-            effect_code = KBD_EFFECT_BREATHING
-            data_size = KBD_DATA_SIZE
-            cmd_class = KBD_CMD_CLASS
-            cmd_id = KBD_CMD_ID
-        else:
-            QMessageBox.warning(self, "Error", "Unsupported device.")
+        level = get_brightness(device)
+        if level is None:
+            QMessageBox.warning(self, "Error", "Failed to read brightness.")
             return
-        args = build_arguments(effect_code, led_id, extra)
-        report = construct_razer_report(transaction_id, cmd_class, cmd_id, data_size, args)
-        if send_report_to_device(device, report, "Breathing Effect"):
-            QMessageBox.information(self, "Success", "Breathing effect sent.")
-        else:
-            QMessageBox.warning(self, "Error", "Failed to send effect.")
-
-    def create_tab_wave(self):
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        self.wave_speed = QSpinBox(); self.wave_speed.setRange(0, 255); self.wave_speed.setValue(128)
-        layout.addRow("Speed:", self.wave_speed)
-        self.radio_left = QRadioButton("Left -> Right")
-        self.radio_right = QRadioButton("Right -> Left")
-        self.radio_left.setChecked(True)
-        radio_layout = QHBoxLayout()
-        radio_layout.addWidget(self.radio_left)
-        radio_layout.addWidget(self.radio_right)
-        layout.addRow("Direction:", radio_layout)
-        btn = QPushButton("Send Wave Effect")
-        btn.clicked.connect(self.send_wave)
-        layout.addRow(btn)
-        return tab
+        self.brightness_level.setValue(level)
 
-    def send_wave(self):
+    @pyqtSlot()
+    @traced('ui.send_brightness', 'ui')
+    def send_brightness(self):
         device = self.get_selected_device()
         if not device:
             QMessageBox.warning(self, "Error", "No device selected.")
             return
-        speed = self.wave_speed.value()
-        direction = 0 if self.radio_left.isChecked() else 1
-        extra = [speed, direction]
-        pid = device['pid']
-        transaction_id = device['transaction_id']
-
-        if is_mouse_device(pid):
-            led_id = MOUSE_SCROLL_WHEEL_LED
-            effect_code = MOUSE_EFFECT_WAVE
-            data_size = MOUSE_DATA_SIZE
-            cmd_class = MOUSE_CMD_CLASS
-            cmd_id = MOUSE_CMD_ID
-        elif is_keyboard_device(pid):
-            led_id = KBD_BACKLIGHT_LED
-            effect_code = KBD_EFFECT_WAVE
-            data_size = KBD_DATA_SIZE
-            cmd_class = KBD_CMD_CLASS
-            cmd_id = KBD_CMD_ID
-        else:
-            QMessageBox.warning(self, "Error", "Unsupported device.")
+        if not (is_mouse_device(device['pid']) or is_keyboard_device(device['pid'])):
+            QMessageBox.warning(self, "Error", "Device type not fully supported yet.")
+            return
+        level = self.brightness_level.value()
+        previous = self.applied_settings.get((device.get('serial'), device['pid']), (None, {}))[1].get('brightness')
+        if previous is None:
+            previous = get_brightness(device)
+        start = level if previous is None else previous
+        duration = self.brightness_fade.value() / 1000.0
+        leds = self.zone_combo.currentData()
+        self.start_fade(device, 'brightness', level, f"Brightness set to {level}.",
+                        lambda engine: engine.fade_brightness(start, level, duration, leds))
+
+    def start_fade(self, device, setting, value, message, run):
+        key = (device.get('serial'), device['pid'])
+        self.cancel_fade(key)
+        engine = TransitionEngine(device)
+
+        def worker():
+            try:
+                ok = run(engine)
+            except Exception as e:
+                logger.error(f"Fade on {device.get('name')} failed: {e}")
+                ok = False
+            finally:
+                engine.close()
+            outcome = 'cancelled' if engine.cancelled else 'ok' if ok else 'failed'
+            self.fade_finished.emit(engine, setting, device, value, outcome, message)
+
+        self.fades[key] = engine
+        threading.Thread(target=worker, name="razer-fade", daemon=True).start()
+
+    def cancel_fade(self, key):
+        # the worker stops after its current step; waiting for it here would block the UI
+        engine = self.fades.pop(key, None)
+        if engine is not None:
+            engine.cancel()
+
+    @pyqtSlot(object, str, object, object, str, str)
+    def on_fade_finished(self, engine, setting, device, value, outcome, message):
+        key = (device.get('serial'), device['pid'])
+        if self.fades.get(key) is engine:
+            del self.fades[key]
+        if outcome == 'cancelled':
             return
-        args = build_arguments(effect_code, led_id, extra)
-        report = construct_razer_report(transaction_id, cmd_class, cmd_id, data_size, args)
-        if send_report_to_device(device, report, "Wave Effect"):
-            QMessageBox.information(self, "Success", "Wave effect sent.")
+        if outcome == 'ok':
+            self.remember_setting(device, setting, value)
+            QMessageBox.information(self, "Success", message)
         else:
-            QMessageBox.warning(self, "Error", "Failed to send effect.")
+            QMessageBox.warning(self, "Error", f"Failed to set {setting}.")
 
-    def create_tab_reactive(self):
-        tab = QWidget()
-        layout = QFormLayout(tab)
-        self.reactive_spin_r = QSpinBox(); self.reactive_spin_r.setRange(0, 255); self.reactive_spin_r.setValue(255)
-        self.reactive_spin_g = QSpinBox(); self.reactive_spin_g.setRange(0, 255); self.reactive_spin_g.setValue(255)
-        self.reactive_spin_b = QSpinBox(); self.reactive_spin_b.setRange(0, 255); self.reactive_spin_b.setValue(255)
-        layout.addRow("Reaction Red:", self.reactive_spin_r)
-        layout.addRow("Reaction Green:", self.reactive_spin_g)
-        layout.addRow("Reaction Blue:", self.reactive_spin_b)
-        self.reactive_duration = QSpinBox(); self.reactive_duration.setRange(0, 255); self.reactive_duration.setValue(50)
-        layout.addRow("Duration:", self.reactive_duration)
-        btn = QPushButton("Send Reactive Effect")
-        btn.clicked.connect(self.send_reactive)
-        layout.addRow(btn)
-        return tab
+    def build_tab_profiles(self, page):
+        layout = QFormLayout(page)
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(list_profiles())
+        btn_apply = QPushButton("Apply Profile")
+        btn_apply.clicked.connect(self.apply_selected_profile)
+        layout.addRow("Profile:", self.profile_combo)
+        layout.addRow(btn_apply)
+        self.profile_name = QLineEdit()
+        btn_save = QPushButton("Save Current Settings")
+        btn_save.clicked.connect(self.save_current_profile)
+        layout.addRow("New Profile Name:", self.profile_name)
+        layout.addRow(btn_save)
 
-    def send_reactive(self):
-        device = self.get_selected_device()
-        if not device:
-            QMessageBox.warning(self, "Error", "No device selected.")
+    @pyqtSlot()
+    @traced('ui.apply_selected_profile', 'ui')
+    def apply_selected_profile(self):
+        name = self.profile_combo.currentText()
+        if not name:
+            QMessageBox.warning(self, "Error", "No profile selected.")
+            return
+        try:
+            with Profile(profile_path(name)) as profile:
+                results = apply_profile(profile, self.devices)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Failed to load profile: {e}")
             return
-        color = [self.reactive_spin_r.value(), self.reactive_spin_g.value(), self.reactive_spin_b.value()]
-        duration = self.reactive_duration.value()
-        extra = color + [duration]
-        pid = device['pid']
-        transaction_id = device['transaction_id']
-
-        if is_mouse_device(pid):
-            led_id = MOUSE_SCROLL_WHEEL_LED
-            effect_code = MOUSE_EFFECT_REACTIVE
-            data_size = MOUSE_DATA_SIZE
-            cmd_class = MOUSE_CMD_CLASS
-            cmd_id = MOUSE_CMD_ID
-        elif is_keyboard_device(pid):
-            led_id = KBD_BACKLIGHT_LED
-            effect_code = KBD_EFFECT_REACTIVE
-            data_size = KBD_DATA_SIZE
-            cmd_class = KBD_CMD_CLASS
-            cmd_id = KBD_CMD_ID
+        # edits to the active profile are picked up and applied incrementally from now on
+        for path in list(self.profile_watcher.watched):
+            self.profile_watcher.unwatch(path)
+        self.profile_watcher.watch(profile_path(name))
+        if results and all(results.values()):
+            QMessageBox.information(self, "Success", f"Profile '{name}' applied.")
         else:
-            QMessageBox.warning(self, "Error", "Unsupported device.")
+            QMessageBox.warning(self, "Error", "Profile could not be applied to all devices.")
+
+    @pyqtSlot()
+    @traced('ui.save_current_profile', 'ui')
+    def save_current_profile(self):
+        name = self.profile_name.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Error", "Enter a profile name.")
+            return
+        if not self.applied_settings:
+            QMessageBox.warning(self, "Error", "No settings have been sent yet.")
             return
-        args = build_arguments(effect_code, led_id, extra)
-        report = construct_razer_report(transaction_id, cmd_class, cmd_id, data_size, args)
-        if send_report_to_device(device, report, "Reactive Effect"):
-            QMessageBox.information(self, "Success", "Reactive effect sent.")
+        try:
+            save_profile(profile_path(name), list(self.applied_settings.values()))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Failed to save profile: {e}")
+            return
+        if self.profile_combo.findText(name) < 0:
+            self.profile_combo.addItem(name)
+        QMessageBox.information(self, "Success", f"Profile '{name}' saved.")
+
+    def log_reload(self, result):
+        if result['ok']:
+            logger.info(f"Reloaded {result['path']}: {result['sent']} reports sent, {result['skipped']} unchanged, "
+                        f"{result['latency_ms']:.1f} ms")
         else:
-            QMessageBox.warning(self, "Error", "Failed to send effect.")
+            logger.warning(f"Profile reload of {result['path']} did not reach every device")
+
+    def build_tab_preview(self, page):
+        from razer_effects import EFFECTS
+        layout = QFormLayout(page)
+        self.preview_effect = QComboBox()
+        self.preview_effect.addItems(list(EFFECTS))
+        layout.addRow("Effect:", self.preview_effect)
+        self.preview_fps = QSpinBox(); self.preview_fps.setRange(1, 60); self.preview_fps.setValue(30)
+        layout.addRow("FPS:", self.preview_fps)
+        self.preview_send = QCheckBox("Send to selected device")
+        layout.addRow(self.preview_send)
+        btn_start = QPushButton("Start Preview")
+        btn_start.clicked.connect(self.start_preview)
+        btn_stop = QPushButton("Stop")
+        btn_stop.clicked.connect(self.stop_preview)
+        buttons = QHBoxLayout()
+        buttons.addWidget(btn_start)
+        buttons.addWidget(btn_stop)
+        layout.addRow(buttons)
+        self.preview = FramePreview()
+        layout.addRow(self.preview)
+
+    @pyqtSlot()
+    @traced('ui.start_preview', 'ui')
+    def start_preview(self):
+        from razer_effects import make_renderer
+        from razer_stream import FrameStreamer
+        self.stop_preview()
+        device = self.get_selected_device()
+        streamer = None
+        if self.preview_send.isChecked():
+            if not device:
+                QMessageBox.warning(self, "Error", "No device selected.")
+                return
+            streamer = FrameStreamer(device)
+        shape = streamer.shape if streamer is not None else VIRTUAL_SHAPE
+        render = make_renderer(self.preview_effect.currentText(), *shape)
+        self.preview_worker = StreamWorker(render, streamer, self.preview_fps.value(), shape).start()
+        self.preview.set_source(self.preview_worker)
 
-    def create_tab_reset(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        btn = QPushButton("Reset Effect")
-        btn.clicked.connect(self.send_reset)
-        layout.addWidget(btn)
-        layout.addStretch()
-        return tab
+    @pyqtSlot()
+    def stop_preview(self):
+        if self.preview_worker is not None:
+            self.preview_worker.stop()
+            self.preview_worker = None
+
+    def build_tab_performance(self, page):
+        layout = QFormLayout(page)
+        self.polling_rate = QComboBox()
+        layout.addRow("Polling Rate:", self.polling_rate)
+        self.update_polling_rates(self.get_selected_device())
+        btn_polling = QPushButton("Set Polling Rate")
+        btn_polling.clicked.connect(self.send_polling_rate)
+        layout.addRow(btn_polling)
+        self.dpi_x = QSpinBox(); self.dpi_x.setRange(DPI_MIN, DPI_MAX); self.dpi_x.setValue(800)
+        self.dpi_x.setSingleStep(50)
+        self.dpi_y = QSpinBox(); self.dpi_y.setRange(DPI_MIN, DPI_MAX); self.dpi_y.setValue(800)
+        self.dpi_y.setSingleStep(50)
+        layout.addRow("DPI X:", self.dpi_x)
+        layout.addRow("DPI Y:", self.dpi_y)
+        dpi_buttons = QHBoxLayout()
+        btn_read = QPushButton("Read Current")
+        btn_read.clicked.connect(self.read_performance)
+        btn_dpi = QPushButton("Set DPI")
+        btn_dpi.clicked.connect(self.send_dpi)
+        dpi_buttons.addWidget(btn_read)
+        dpi_buttons.addWidget(btn_dpi)
+        layout.addRow(dpi_buttons)
+        self.stage_inputs = []
+        self.stage_active = QButtonGroup(page)
+        for number in range(1, MAX_DPI_STAGES + 1):
+            row = QHBoxLayout()
+            enabled = QCheckBox(); enabled.setChecked(True)
+            stage_x = QSpinBox(); stage_x.setRange(DPI_MIN, DPI_MAX); stage_x.setValue(400 * number)
+            stage_y = QSpinBox(); stage_y.setRange(DPI_MIN, DPI_MAX); stage_y.setValue(400 * number)
+            active = QRadioButton("Active")
+            active.setChecked(number == 1)
+            self.stage_active.addButton(active, number)
+            for widget in (enabled, stage_x, stage_y, active):
+                row.addWidget(widget)
+            layout.addRow(f"Stage {number}:", row)
+            self.stage_inputs.append((enabled, stage_x, stage_y))
+        btn_stages = QPushButton("Upload DPI Stages")
+        btn_stages.clicked.connect(self.send_dpi_stages)
+        layout.addRow(btn_stages)
+
+    def update_polling_rates(self, device):
+        self.polling_rate.clear()
+        if not device:
+            return
+        for rate in supported_polling_rates(device['pid']):
+            self.polling_rate.addItem(f"{rate} Hz", rate)
+        self.polling_rate.setCurrentIndex(self.polling_rate.findData(1000))
 
-    def send_reset(self):
+    def selected_mouse(self):
         device = self.get_selected_device()
         if not device:
             QMessageBox.warning(self, "Error", "No device selected.")
+            return None
+        if not is_mouse_device(device['pid']):
+            QMessageBox.warning(self, "Error", "Polling rate and DPI are only available on mice.")
+            return None
+        return device
+
+    @pyqtSlot()
+    @traced('ui.read_performance', 'ui')
+    def read_performance(self):
+        device = self.selected_mouse()
+        if not device:
+            return
+        rate, dpi, table = get_polling_rate(device), get_dpi(device), get_dpi_stages(device)
+        if rate is None and dpi is None and table is None:
+            QMessageBox.warning(self, "Error", "Failed to read mouse settings.")
+            return
+        if rate is not None:
+            self.polling_rate.setCurrentIndex(self.polling_rate.findData(rate))
+        if dpi is not None:
+            self.dpi_x.setValue(dpi[0])
+            self.dpi_y.setValue(dpi[1])
+        if table is not None:
+            stages, active = table
+            for i, (enabled, stage_x, stage_y) in enumerate(self.stage_inputs):
+                enabled.setChecked(i < len(stages))
+                if i < len(stages):
+                    stage_x.setValue(stages[i][0])
+                    stage_y.setValue(stages[i][1])
+            button = self.stage_active.button(active)
+            if button is not None:
+                button.setChecked(True)
+
+    @pyqtSlot()
+    @traced('ui.send_polling_rate', 'ui')
+    def send_polling_rate(self):
+        device = self.selected_mouse()
+        if not device:
             return
-        pid = device['pid']
-        effect_code = 0x00
-        transaction_id = device['transaction_id']
-
-        if is_mouse_device(pid):
-            led_id = MOUSE_SCROLL_WHEEL_LED
-            data_size = MOUSE_DATA_SIZE
-            cmd_class = MOUSE_CMD_CLASS
-            cmd_id = MOUSE_CMD_ID
-        elif is_keyboard_device(pid):
-            led_id = KBD_BACKLIGHT_LED
-            data_size = KBD_DATA_SIZE
-            cmd_class = KBD_CMD_CLASS
-            cmd_id = KBD_CMD_ID
+        rate = self.polling_rate.currentData()
+        if set_polling_rate(device, rate):
+            self.remember_setting(device, 'polling_rate', rate)
+            QMessageBox.information(self, "Success", f"Polling rate set to {rate} Hz.")
         else:
-            QMessageBox.warning(self, "Error", "Device type not fully supported yet.")
+            QMessageBox.warning(self, "Error", "Failed to set polling rate.")
+
+    @pyqtSlot()
+    @traced('ui.send_dpi', 'ui')
+    def send_dpi(self):
+        device = self.selected_mouse()
+        if not device:
+            return
+        dpi = (self.dpi_x.value(), self.dpi_y.value())
+        if set_dpi(device, *dpi):
+            self.remember_setting(device, 'dpi', list(dpi))
+            QMessageBox.information(self, "Success", f"DPI set to {dpi[0]} x {dpi[1]}.")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to set DPI.")
+
+    @pyqtSlot()
+    @traced('ui.send_dpi_stages', 'ui')
+    def send_dpi_stages(self):
+        device = self.selected_mouse()
+        if not device:
+            return
+        stages, active = [], 1
+        for number, (enabled, stage_x, stage_y) in enumerate(self.stage_inputs, 1):
+            if enabled.isChecked():
+                stages.append((stage_x.value(), stage_y.value()))
+                if self.stage_active.checkedId() == number:
+                    active = len(stages)
+        if not stages:
+            QMessageBox.warning(self, "Error", "Enable at least one DPI stage.")
             return
-        args = build_arguments(effect_code, led_id, [])
-        report = construct_razer_report(transaction_id, cmd_class, cmd_id, data_size, args)
-        if send_report_to_device(device, report, "Reset Effect"):
-            QMessageBox.information(self, "Success", "Reset effect sent.")
+        if set_dpi_stages(device, stages, active):
+            self.remember_setting(device, 'dpi_stages', {'stages': [list(s) for s in stages], 'active': active})
+            QMessageBox.information(self, "Success", f"{len(stages)} DPI stages uploaded and verified.")
         else:
-            QMessageBox.warning(self, "Error", "Failed to send reset effect.")
\ No newline at end of file
+            QMessageBox.warning(self, "Error", "DPI stages were not confirmed by the device.")
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def simulated():
+    import razer_common
+    from razer_sim import SimulatedHidBackend
+    previous = razer_common.get_hid_backend()
+    backend = SimulatedHidBackend()
+    razer_common.set_hid_backend(backend)
+    yield backend
+    razer_common.set_hid_backend(previous)
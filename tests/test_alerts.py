@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from razer_alerts import AlertCoordinator, AlertEvent, load_rules
+from razer_common import construct_brightness_report, scan_razer_devices
+from razer_state import StateJournal
+
+def test_invalid_rule_pattern_is_a_value_error(tmp_path):
+    path = tmp_path / 'alerts.json'
+    path.write_text(json.dumps({'rules': [{'match': 'disk (full'}]}))
+    with pytest.raises(ValueError, match='disk \\(full'):
+        load_rules(str(path))
+
+def test_alerts_coalesce_escalate_and_restore_within_write_bound(simulated, tmp_path):
+    device = scan_razer_devices()[0]
+    path = device['interfaces'][0]['path']
+    journal = StateJournal(str(tmp_path / 'state.journal'))
+    saved = construct_brightness_report(device['transaction_id'], 0x05, 200)
+    journal.record(device, [saved])
+    coordinator = AlertCoordinator([device], journal, min_interval=0.1, reload_journal=False)
+    t = 100.0
+
+    assert coordinator.post(AlertEvent('disk low', 'warning'), now=t) == 'started'
+    assert coordinator.post(AlertEvent('disk lower', 'warning'), now=t) == 'coalesced'
+    assert coordinator.post(AlertEvent('fyi', 'info'), now=t) == 'suppressed'
+    coordinator.step(now=t)
+    assert coordinator.metrics['writes'] == 1
+    warning = simulated.last_report[path]
+
+    assert coordinator.post(AlertEvent('disk gone', 'error'), now=t + 0.01) == 'escalated'
+    assert coordinator.alert.count == 3
+    assert coordinator.step(now=t + 0.01) == pytest.approx(0.09)
+    assert coordinator.metrics['writes'] == 1
+    coordinator.step(now=t + 0.1)
+    assert coordinator.metrics['writes'] == 2
+    assert simulated.last_report[path] != warning
+
+    coordinator.step(now=coordinator.alert.expires)
+    assert coordinator.alert is None
+    assert coordinator.metrics['restores'] == 1
+    assert simulated.last_report[path] == saved
+    coordinator.stop()
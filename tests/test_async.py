@@ -0,0 +1,25 @@
+import asyncio
+
+import numpy as np
+
+import razer_common
+from razer_async import AsyncRazer
+
+def test_streamed_frames_are_not_journaled(simulated):
+    sent = []
+    listener = lambda device, reports: sent.append(reports)
+    razer_common.add_send_listener(listener)
+    try:
+        async def run():
+            async with AsyncRazer() as razer:
+                device = next(d for d in await razer.scan() if d['pid'] == 0x024E)
+                frames = await razer.stream(device, lambda t: np.zeros((6, 22, 3), dtype=np.uint8),
+                                            fps=50.0, duration=0.1)
+                await razer.send(device, [razer_common.construct_brightness_report(device['transaction_id'],
+                                                                                    0x05, 10)])
+                return frames
+        frames = asyncio.run(run())
+    finally:
+        razer_common.remove_send_listener(listener)
+    assert frames > 0
+    assert len(sent) == 1
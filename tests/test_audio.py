@@ -0,0 +1,45 @@
+import wave
+
+import numpy as np
+
+from razer_audio import wav_blocks
+
+def test_24_bit_wav_is_decoded(tmp_path):
+    path = str(tmp_path / 'tone.wav')
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(3)
+        wav.setframerate(8000)
+        wav.writeframes(bytes([0, 0, 0x40, 0, 0, 0xC0, 0xFF, 0xFF, 0x7F]))
+    rate, samples = next(wav_blocks(path))
+    assert rate == 8000
+    assert np.allclose(samples, [0.5, -0.5, 1.0], atol=1e-6)
+
+def test_bands_cover_distinct_bins_up_to_the_last_edge():
+    from razer_audio import SpectrumAnalyzer
+    analyzer = SpectrumAnalyzer(22, 44100)
+    starts = analyzer._band_starts
+    assert (np.diff(starts) > 0).all()
+    assert analyzer._band_end == starts[-1] + analyzer._band_counts[-1]
+    assert analyzer._band_end < 1024 // 2 + 1
+
+def test_tone_lights_its_band(simulated):
+    from razer_audio import LATENCY_TARGET, SpectrumAnalyzer, run_visualizer, tone_blocks
+    from razer_common import scan_razer_devices
+    from razer_stream import FrameStreamer
+    keyboard = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    streamer = FrameStreamer(keyboard)
+    try:
+        stats = run_visualizer(streamer, tone_blocks([1000.0], duration=0.5), fps=1000.0)
+    finally:
+        streamer.close()
+
+    analyzer = SpectrumAnalyzer(streamer.cols, 44100)
+    freqs = np.fft.rfftfreq(analyzer.fft_size, 1.0 / 44100)
+    band = int(np.searchsorted(analyzer._band_starts, np.searchsorted(freqs, 1000.0), side='right')) - 1
+    lit = streamer.frame.astype(int).sum(axis=(0, 2))
+    assert int(lit.argmax()) == band
+    assert stats.count > 0
+    assert 0.0174 < stats.mean < LATENCY_TARGET
+    path = keyboard['interfaces'][0]['path']
+    assert np.array_equal(simulated.frames[path], streamer.sent_frame)
@@ -0,0 +1,17 @@
+import numpy as np
+
+from razer_calibration import Calibration, load_calibrations, save_calibration
+
+def test_malformed_file_loads_as_uncalibrated(tmp_path, capsys):
+    path = tmp_path / 'calibration.json'
+    path.write_text('{"024e": {"gamma": [2.2, ')
+    assert load_calibrations(str(path)) == {}
+    assert 'Error loading calibration' in capsys.readouterr().out
+
+def test_custom_lut_survives_save_and_load(tmp_path):
+    path = str(tmp_path / 'calibration.json')
+    lut = np.tile(np.arange(255, -1, -1, dtype=np.uint8), (3, 1))
+    save_calibration('024e', Calibration(lut=lut), path)
+    loaded = load_calibrations(path)['024e']
+    assert np.array_equal(loaded.table, lut)
+    assert loaded.apply_color([0, 10, 255]) == [255, 245, 0]
@@ -0,0 +1,16 @@
+from razer_compositor import Compositor
+
+def test_solid_layers_are_rendered_once():
+    compositor = Compositor(2, 3)
+    calls = []
+    base = compositor.add_layer((255, 0, 0))
+    compositor.add_layer((0, 0, 255), opacity=0.5)
+    original = base.source
+    base.source = lambda t, rows, cols: calls.append(t) or original(t, rows, cols)
+
+    first = compositor.render(0.0)
+    second = compositor.render(1.0)
+
+    assert calls == [0.0]
+    assert (first == second).all()
+    assert first[0, 0].tolist() == [128, 0, 128]
@@ -0,0 +1,64 @@
+import pytest
+
+from razer_governor import connection_type
+
+@pytest.mark.parametrize('pid', [0x0070, 0x0073, 0x00C4, 0x0258, 0x02B9])
+def test_wired_mode_of_wireless_family_is_wired(pid):
+    assert connection_type(pid) == 'wired'
+
+def test_wireless_pid_is_wireless():
+    assert connection_type(0x00C5) == 'wireless'
+
+def test_slow_power_check_does_not_stall_frames(monkeypatch):
+    import threading
+    import time
+    import razer_governor
+    from razer_governor import FrameRateGovernor
+    release = threading.Event()
+    calls = []
+
+    def slow_probe():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(2.0)
+        return True
+
+    governor = FrameRateGovernor({'pid': 0x024E}, on_battery=slow_probe)
+    assert governor.on_battery is True
+    start = time.monotonic()
+    governor.update(start + razer_governor.POWER_POLL_INTERVAL + 1.0)
+    assert time.monotonic() - start < 0.5
+    release.set()
+    governor._power_thread.join(1.0)
+    assert len(calls) == 2
+
+def test_low_wireless_battery_lowers_the_ceiling(simulated):
+    from razer_common import scan_razer_devices, set_hid_backend
+    from razer_governor import BATTERY_MAX_FPS, FrameRateGovernor
+    from razer_sim import SimulatedHidBackend
+    backend = SimulatedHidBackend(pids=(0x00C5,))
+    set_hid_backend(backend)
+    device = scan_razer_devices()[0]
+    backend.battery[device['interfaces'][0]['path']] = (40, False)
+
+    governor = FrameRateGovernor(device, on_battery=lambda: False)
+
+    assert governor.battery == (16, False)
+    assert governor.on_battery is True
+    assert governor.fps == BATTERY_MAX_FPS['wireless']
+
+def test_change_records_the_rate_achieved_after_it():
+    from razer_governor import FrameRateGovernor
+
+    class Session:
+        latency = 0.05
+
+    governor = FrameRateGovernor({'pid': 0x024E}, Session(), on_battery=lambda: False)
+    start = governor._last_adjust
+    governor.update(start + 1.0)
+    change = governor.metrics.changes[-1]
+    assert change['achieved_fps'] is None
+    for i in range(20):
+        governor.update(start + 1.0 + i * 0.1)
+    governor.update(start + 3.0)
+    assert change['achieved_fps'] == 11.0
@@ -0,0 +1,19 @@
+from razer_health import STATE_GONE, STATE_OPEN, HealthRegistry
+
+def _tripped(path=b'p'):
+    registry = HealthRegistry(failure_threshold=1)
+    registry.record_failure(path, IOError("gone"))
+    return registry
+
+def test_present_open_circuit_keeps_backoff():
+    registry = _tripped()
+    registry.revalidate([b'p'])
+    assert registry.state(b'p') == STATE_OPEN
+    assert not registry.allow(b'p')
+
+def test_replugged_interface_is_retried_immediately():
+    registry = _tripped()
+    registry.revalidate([])
+    assert registry.state(b'p') == STATE_GONE
+    registry.revalidate([b'p'])
+    assert registry.allow(b'p')
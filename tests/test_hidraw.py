@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import razer_hidraw
+from razer_hidraw import HIDIOCGFEATURE, HIDIOCSFEATURE, HidrawBackend
+
+def _sysfs(tmp_path, node, hid_id, name, interface=None):
+    usb_interface = tmp_path / 'devices' / node
+    hid_dir = usb_interface / f"{hid_id}.0001"
+    hid_dir.mkdir(parents=True)
+    (hid_dir / 'uevent').write_text(f"DRIVER=hid-generic\nHID_ID={hid_id}\nHID_NAME={name}\nHID_UNIQ=\n")
+    if interface is not None:
+        (usb_interface / 'bInterfaceNumber').write_text(f"{interface:02x}\n")
+    node_dir = tmp_path / 'class' / node
+    node_dir.mkdir(parents=True)
+    os.symlink(hid_dir, node_dir / 'device')
+    (tmp_path / 'dev').mkdir(exist_ok=True)
+    (tmp_path / 'dev' / node).write_bytes(b'')
+
+def _backend(tmp_path):
+    return HidrawBackend(str(tmp_path / 'class'), str(tmp_path / 'dev'))
+
+def test_enumerate_parses_uevent_and_interface(tmp_path):
+    _sysfs(tmp_path, 'hidraw0', '0003:00001532:0000024E', 'Razer BlackWidow V3', interface=2)
+    _sysfs(tmp_path, 'hidraw1', '0005:0000046D:0000B023', 'Bluetooth Mouse')
+
+    entries = _backend(tmp_path).enumerate()
+    razer = _backend(tmp_path).enumerate(0x1532)
+
+    assert len(entries) == 2
+    assert razer == [{
+        'vendor_id': 0x1532,
+        'product_id': 0x024E,
+        'product_string': 'Razer BlackWidow V3',
+        'serial_number': '',
+        'path': str(tmp_path / 'dev' / 'hidraw0').encode(),
+        'interface_number': 2,
+    }]
+    assert entries[1]['interface_number'] == -1
+
+def test_feature_reports_use_sized_ioctls(tmp_path, monkeypatch):
+    _sysfs(tmp_path, 'hidraw0', '0003:00001532:0000024E', 'Razer BlackWidow V3', interface=0)
+    calls = []
+
+    def fake_ioctl(fd, request, buf):
+        calls.append((request, len(buf)))
+        if request == HIDIOCGFEATURE(len(buf)):
+            buf[1:4] = b'\x02\x1f\x00'
+        return len(buf)
+
+    monkeypatch.setattr(razer_hidraw, '_ioctl', fake_ioctl)
+    backend = _backend(tmp_path)
+    dev = backend.device()
+    dev.open_path(backend.enumerate()[0]['path'])
+    try:
+        assert dev.send_feature_report(b'\x00' + bytes(90)) == 91
+        response = dev.get_feature_report(0x00, 91)
+    finally:
+        dev.close()
+        backend.close()
+
+    assert calls == [(HIDIOCSFEATURE(91), 91), (HIDIOCGFEATURE(91), 91)]
+    assert HIDIOCSFEATURE(91) == 0xC05B4806
+    assert HIDIOCGFEATURE(91) == 0xC05B4807
+    assert len(response) == 91 and response[:4] == [0, 2, 0x1f, 0]
+
+def test_failed_ioctl_drops_the_cached_descriptor(tmp_path, monkeypatch):
+    _sysfs(tmp_path, 'hidraw0', '0003:00001532:0000024E', 'Razer BlackWidow V3', interface=0)
+
+    def broken_ioctl(fd, request, buf):
+        raise OSError(19, "No such device")
+
+    monkeypatch.setattr(razer_hidraw, '_ioctl', broken_ioctl)
+    backend = _backend(tmp_path)
+    dev = backend.device()
+    dev.open_path(backend.enumerate()[0]['path'])
+    with pytest.raises(OSError):
+        dev.send_feature_report(bytes(91))
+    assert backend._fds == {}
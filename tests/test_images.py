@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('PyQt5')
+from razer_images import open_frame_source
+
+# 1x1 red GIF
+TINY_GIF = (b'GIF89a\x01\x00\x01\x00\x80\x00\x00\xff\x00\x00\x00\x00\x00!\xf9\x04\x00\x00\x00\x00\x00'
+            b',\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;')
+
+def test_gif_with_size_uses_image_reader(tmp_path):
+    path = str(tmp_path / 'anim.dat')
+    with open(path, 'wb') as f:
+        f.write(TINY_GIF)
+    frame, _ = next(open_frame_source(path, 22, 6))
+    assert frame.shape == (1, 1, 3)
+    assert frame[0, 0].tolist() == [255, 0, 0]
+
+def test_raw_file_uses_size(tmp_path):
+    path = str(tmp_path / 'frames.rgb')
+    with open(path, 'wb') as f:
+        f.write(bytes(range(6)) * 2)
+    frames = list(open_frame_source(path, 2, 1))
+    assert len(frames) == 2
+    assert np.array_equal(frames[0][0].ravel(), np.arange(6))
+
+def test_raw_file_is_closed_with_the_source(tmp_path, monkeypatch):
+    import builtins
+    opened = []
+    real_open = builtins.open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    path = str(tmp_path / 'frames.rgb')
+    with open(path, 'wb') as f:
+        f.write(bytes(12))
+    monkeypatch.setattr(builtins, 'open', tracking_open)
+    source = open_frame_source(path, 2, 1)
+    next(source)
+    source.close()
+    assert opened and opened[-1].closed
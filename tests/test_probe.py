@@ -0,0 +1,54 @@
+import time
+
+import razer_common
+import razer_probe
+from razer_sim import SimulatedHidBackend
+
+def test_late_probe_results_are_cached(monkeypatch):
+    previous = razer_common.get_hid_backend()
+    razer_common.set_hid_backend(SimulatedHidBackend(pids=(0x0084,), write_latency=0.05))
+    monkeypatch.setattr(razer_probe, 'settle_after_open', lambda: None)
+    razer_probe.clear_cache()
+    try:
+        devices = razer_common.scan_razer_devices()
+        first = razer_probe.probe_devices(devices, timeout=0.01)
+        assert first[0]['probed'] is False
+        time.sleep(0.5)
+        second = razer_probe.probe_devices(devices, timeout=0.0)
+        assert second[0]['probed'] is True
+        assert second[0]['firmware'] == 'v1.2'
+    finally:
+        razer_probe.clear_cache()
+        razer_common.set_hid_backend(previous)
+
+def test_probe_settles_half_open_trial(simulated, monkeypatch):
+    from razer_health import STATE_CLOSED, HealthRegistry
+    registry = HealthRegistry(failure_threshold=1)
+    monkeypatch.setattr(razer_probe, 'get_health', lambda: registry)
+    monkeypatch.setattr(razer_probe, 'settle_after_open', lambda: None)
+    razer_probe.clear_cache()
+    try:
+        devices = razer_common.scan_razer_devices()
+        path = devices[0]['interfaces'][0]['path']
+        registry.record_failure(path, IOError("unplugged"))
+        registry.revalidate([])
+        registry.revalidate([path])
+        probed = razer_probe.probe_devices(devices)
+        assert probed[0]['probed'] is True
+        assert registry.state(path) == STATE_CLOSED
+    finally:
+        razer_probe.clear_cache()
+
+def test_silent_interface_is_not_cached(simulated, monkeypatch):
+    from razer_health import HealthRegistry
+    monkeypatch.setattr(razer_probe, 'get_health', lambda: HealthRegistry())
+    monkeypatch.setattr(razer_probe, 'settle_after_open', lambda: None)
+    monkeypatch.setattr(razer_probe, '_query', lambda dev, report: None)
+    razer_probe.clear_cache()
+    try:
+        devices = razer_common.scan_razer_devices()
+        probed = razer_probe.probe_devices(devices)
+        assert not any(d['probed'] for d in probed)
+        assert not razer_probe._cache
+    finally:
+        razer_probe.clear_cache()
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from razer_common import scan_razer_devices
+from razer_profiles import Profile, save_profile
+
+def test_round_trip(simulated, tmp_path):
+    device = scan_razer_devices()[0]
+    path = str(tmp_path / 'p.rzp')
+    save_profile(path, [(device, {'brightness': 42})])
+    with Profile(path) as profile:
+        entry = profile.entry_for(device)
+        assert entry.settings == {'brightness': 42}
+        assert len(entry.reports) == 1
+
+@pytest.mark.parametrize('keep', [4, 20, 30, 60])
+def test_truncated_profile_raises_value_error(simulated, tmp_path, keep):
+    device = scan_razer_devices()[0]
+    path = str(tmp_path / 'p.rzp')
+    save_profile(path, [(device, {'brightness': 42})])
+    assert os.path.getsize(path) > keep
+    with open(path, 'r+b') as f:
+        f.truncate(keep)
+    with pytest.raises(ValueError):
+        Profile(path)
+
+def test_close_releases_the_map(simulated, tmp_path):
+    device = scan_razer_devices()[0]
+    path = str(tmp_path / 'p.rzp')
+    save_profile(path, [(device, {'brightness': 42})])
+    profile = Profile(path)
+    entry = profile.entry_for(device)
+    profile.close()
+    assert profile.map.closed
+    with pytest.raises(ValueError):
+        bytes(entry.reports[0])
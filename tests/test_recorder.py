@@ -0,0 +1,25 @@
+from razer_recorder import EVENT_SEND, RecordingHidBackend, read_trace, replay
+from razer_sim import SimulatedHidBackend
+
+def test_replay_keeps_handles_apart_past_256_opens(tmp_path):
+    path = str(tmp_path / 'hid.trace')
+    recorder = RecordingHidBackend(SimulatedHidBackend(pids=(0x024E,), write_latency=0.0), path)
+    target = recorder.enumerate()[0]['path']
+    # long-lived handle opened first, then hundreds of short-lived ones
+    keeper = recorder.device()
+    keeper.open_path(target)
+    for i in range(265):
+        dev = recorder.device()
+        dev.open_path(target)
+        dev.send_feature_report(bytes([0, i & 0xFF]) + bytes(89))
+        dev.close()
+    keeper.send_feature_report(bytes(91))
+    keeper.close()
+    recorder.close()
+
+    records = read_trace(path)
+    assert len({r.handle for r in records}) == 266
+    assert sum(r.event == EVENT_SEND for r in records) == 266
+    result = replay(records, SimulatedHidBackend(pids=(0x024E,), write_latency=0.0), realtime=False)
+    assert result['send']['count'] == 266
+    assert result['failures'] == 0
@@ -0,0 +1,60 @@
+from razer_common import MATRIX_FRAME_CMD_ID, scan_razer_devices
+from razer_profiles import compile_settings
+from razer_reload import diff_reports
+from razer_state import report_slot
+
+def test_frame_edit_reapplies_custom_effect(simulated):
+    keyboard = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    frame = ['00' * 3 * 22] * 6
+    before = compile_settings(keyboard, {'frame': frame})
+    edited = list(frame)
+    edited[0] = 'ff0000' + edited[0][6:]
+    after = compile_settings(keyboard, {'frame': edited})
+    current = {report_slot(r): r for r in before}
+
+    changes = diff_reports(current, after)
+
+    assert [report_slot(r) for r in changes] == ['0f03:row0', report_slot(after[-1])]
+    assert changes[-1] == after[-1]
+    assert changes[0][7] == MATRIX_FRAME_CMD_ID
+
+def test_unchanged_frame_sends_nothing(simulated):
+    keyboard = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    reports = compile_settings(keyboard, {'frame': ['00' * 3 * 22] * 6})
+    assert diff_reports({report_slot(r): r for r in reports}, reports) == []
+
+def test_bad_profile_does_not_block_other_reloads(simulated, tmp_path):
+    from razer_profiles import save_profile
+    from razer_reload import ProfileWatcher
+    from razer_state import StateJournal
+    devices = scan_razer_devices()
+    broken, good = str(tmp_path / 'broken.rzp'), str(tmp_path / 'good.rzp')
+    save_profile(broken, [(devices[0], {'brightness': 10})])
+    with open(broken, 'r+b') as f:
+        f.truncate(20)
+    save_profile(good, [(devices[0], {'brightness': 99})])
+    watcher = ProfileWatcher(devices, StateJournal(str(tmp_path / 'state.journal')))
+    watcher.watch(broken, apply_now=True)
+    watcher.watch(good, apply_now=True)
+
+    results = watcher.poll()
+
+    assert [r['ok'] for r in results] == [False, True]
+    assert watcher.metrics['rejected'] == 1
+    assert watcher.poll() == []
+
+def test_switching_back_to_frame_reapplies_it(simulated, tmp_path):
+    from razer_state import StateJournal
+    keyboard = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    frame = compile_settings(keyboard, {'frame': ['ff0000' * 22] * 6})
+    static = compile_settings(keyboard, {'effect': {'name': 'static', 'params': [0, 255, 0]}})
+    journal = StateJournal(str(tmp_path / 'state.journal'))
+    journal.record(keyboard, frame)
+    journal.record(keyboard, static)
+    current = {report_slot(r): r for r in journal.reports_for(keyboard)}
+
+    changes = diff_reports(current, frame)
+
+    assert changes[-1] == frame[-1]
+    assert sum(r[7] == MATRIX_FRAME_CMD_ID for r in changes) == 6
+    assert diff_reports(current, static) == []
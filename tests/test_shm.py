@@ -0,0 +1,25 @@
+import numpy as np
+
+import razer_shm
+from razer_common import scan_razer_devices
+from razer_stream import FrameStreamer
+
+class TornFrame:
+    # reports a writer starting a new frame while the reader is copying
+    def __init__(self, shape):
+        self.rows, self.cols = shape
+        self.frame = np.full(shape + (3,), 7, dtype=np.uint8)
+        self.reads = 0
+
+    @property
+    def sequence(self) -> int:
+        self.reads += 1
+        return 2 if self.reads % 2 else 3
+
+def test_torn_frame_is_not_sent(simulated):
+    streamer = FrameStreamer(next(d for d in scan_razer_devices() if d['pid'] == 0x024E))
+    before = simulated.writes
+    presented = razer_shm.ingest(streamer, TornFrame(streamer.shape), duration=0.05, poll_interval=0.001)
+    streamer.close()
+    assert presented == 0
+    assert simulated.writes == before
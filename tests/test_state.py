@@ -0,0 +1,40 @@
+from razer_common import construct_custom_effect_report, construct_frame_row_report, scan_razer_devices
+from razer_state import StateJournal, report_slot
+
+def _frame(device, first_color):
+    tid = device['transaction_id']
+    return [construct_frame_row_report(tid, 0, bytes(first_color) + bytes(63)),
+            construct_frame_row_report(tid, 1, bytes(66)),
+            construct_custom_effect_report(tid)]
+
+def test_apply_report_restored_after_changed_rows(simulated, tmp_path):
+    device = scan_razer_devices()[0]
+    path = str(tmp_path / 'state.journal')
+    journal = StateJournal(path)
+    journal.record(device, _frame(device, (0, 0, 0)))
+    journal.record(device, _frame(device, (255, 0, 0)))
+
+    slots = [report_slot(r) for r in journal.reports_for(device)]
+    assert slots[-1] == report_slot(_frame(device, (0, 0, 0))[-1])
+    assert slots.index('0f03:row0') < slots.index(slots[-1])
+
+    journal.flush()
+    reloaded = [report_slot(r) for r in StateJournal(path).reports_for(device)]
+    assert reloaded[-1] == slots[-1]
+
+def test_resent_effect_order_survives_reload(simulated, tmp_path):
+    from razer_profiles import compile_settings
+    device = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    path = str(tmp_path / 'state.journal')
+    frame = _frame(device, (255, 0, 0))
+    static = compile_settings(device, {'effect': {'name': 'static', 'params': [0, 255, 0]}})
+    journal = StateJournal(path)
+    journal.record(device, static)
+    journal.record(device, frame)
+    journal.flush()
+    journal.record(device, static)
+    journal.flush()
+
+    reloaded = StateJournal(path).reports_for(device)
+    assert reloaded[-1] == static[-1]
+    assert reloaded == journal.reports_for(device)
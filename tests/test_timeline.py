@@ -0,0 +1,22 @@
+import pytest
+
+from razer_common import scan_razer_devices
+from razer_timeline import Timeline, TimelinePlayer
+
+def _keyframes(zone):
+    return [{'time': 0.0, 'zones': {zone: {'color': [0, 0, 0]}}},
+            {'time': 1.0, 'zones': {zone: {'color': [255, 0, 0]}}}]
+
+def test_misspelled_zone_rejected_at_load():
+    with pytest.raises(ValueError, match='logoo'):
+        Timeline(_keyframes('logoo'))
+
+def test_zone_missing_on_device_rejected_before_playback(simulated):
+    keyboard = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    with pytest.raises(ValueError):
+        TimelinePlayer(Timeline(_keyframes('scroll_wheel')), keyboard)
+
+def test_known_zone_accepted(simulated):
+    keyboard = next(d for d in scan_razer_devices() if d['pid'] == 0x024E)
+    player = TimelinePlayer(Timeline(_keyframes('logo')), keyboard)
+    assert player.reports_for(player.timeline.sample(0.5))
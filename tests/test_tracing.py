@@ -0,0 +1,16 @@
+import razer_common
+import razer_tracing
+from razer_recorder import RecordingHidBackend, enable_recording
+from razer_tracing import TracingHidBackend
+
+def test_recording_under_tracing_is_traced_once(simulated, tmp_path, monkeypatch):
+    monkeypatch.setattr(razer_tracing, '_path', str(tmp_path / 'trace.json'))
+    razer_common.set_hid_backend(simulated)
+    recorder = enable_recording(str(tmp_path / 'hid.trace'))
+    try:
+        backend = razer_common.get_hid_backend()
+        assert isinstance(backend, TracingHidBackend)
+        assert isinstance(backend.backend, RecordingHidBackend)
+        assert backend.backend.backend is simulated
+    finally:
+        recorder.close()